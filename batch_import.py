@@ -6,13 +6,505 @@
 #This module handles importing multiple transactions at once from CSV files.
 
 import csv
+import io
 import os
+import re
+from itertools import chain, islice
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QPushButton, QFileDialog, QTableWidget, 
-                           QTableWidgetItem, QHeaderView, QMessageBox)
-from PyQt5.QtCore import Qt
+                           QPushButton, QFileDialog, QTableView, 
+                           QHeaderView, QMessageBox, QProgressBar)
+from PyQt5.QtCore import (Qt, QAbstractTableModel, QModelIndex, QObject, 
+                          QThread, pyqtSignal)
 from datetime import datetime
+from database import Database
+from finance_tracker import FinanceTracker
 
+#Column order of a transaction in the preview and in self.transactions
+TRANSACTION_FIELDS = ('date', 'amount', 'category', 'description', 'account_type', 'payment_method')
+
+#Number of rows shown in the preview at a time
+PREVIEW_LIMIT = 1000
+
+#Number of rows read at a time when importing rows that were never previewed
+CHUNK_SIZE = 5000
+
+#Read buffer used for CSV files, large enough to amortize read() calls
+READ_BUFFER_SIZE = 1 << 20
+
+#Files smaller than this are read and decoded in a single call instead of streamed
+SMALL_FILE_SIZE = 100 * 1024 * 1024
+
+#Cheap shape check run before strptime, so malformed dates skip the exception path
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+#Roles looked up on every call to TransactionPreviewModel.data()
+_VALUE_ROLES = (Qt.DisplayRole, Qt.EditRole)
+_ERROR_ROLES = (Qt.BackgroundRole, Qt.ToolTipRole)
+
+def date_error(date):
+    """
+    Checks a date string from the CSV file.
+    
+    Args:
+        date (str): Date string to check.
+        
+    Returns:
+        str: Error message if the date is invalid, None otherwise.
+    """
+    if _DATE_RE.match(date):
+        try:
+            datetime.strptime(date, "%Y-%m-%d")
+            return None
+        except ValueError:
+            pass
+    return "Invalid date format. Use YYYY-MM-DD."
+        
+def parse_amount(amount):
+    """
+    Parses and checks an amount string from the CSV file.
+    
+    Args:
+        amount (str): Amount string to parse.
+        
+    Returns:
+        tuple: (value, error) with the amount as a float and None, or None and
+            an error message if the amount is invalid.
+    """
+    try:
+        value = float(amount)
+    except ValueError:
+        return None, "Invalid amount. Must be a number."
+    if value <= 0:
+        return None, "Amount must be positive."
+    return value, None
+
+class TransactionPreviewModel(QAbstractTableModel):
+    """
+    Table model holding the transactions loaded from a CSV file for preview.
+    
+    The data is stored column-wise (one list per field) together with a
+    bytearray of check states, so the view only asks for the cells that are
+    actually visible instead of allocating an item object for every cell.
+    """
+    
+    HEADERS = ["Date", "Amount", "Category", "Description", 
+               "Account Type", "Payment Method", "Import"]
+    IMPORT_COLUMN = 6
+    CATEGORY_ERROR = "Category not found in database."
+    
+    def __init__(self, categories=(), parent=None):
+        """
+        Initialize an empty preview model.
+        
+        Args:
+            categories: Category names that exist in the database.
+            parent: Parent object.
+        """
+        super().__init__(parent)
+        
+        self.categories = set(categories)
+        self.columns = [[] for _ in TRANSACTION_FIELDS]
+        self.check_states = bytearray()
+        # One error list per validated column (date, amount, category)
+        self.errors = [[], [], []]
+        # Parsed amounts, None where the amount is invalid
+        self.amounts = []
+        
+    def set_transactions(self, transactions, categories=None):
+        """
+        Replace the model contents with newly loaded transactions.
+        
+        Args:
+            transactions (dict): Column lists keyed by the names in TRANSACTION_FIELDS.
+            categories: Optional updated collection of known category names.
+        """
+        self.beginResetModel()
+        
+        if categories is not None:
+            self.categories = set(categories)
+        self.columns = [transactions[field] for field in TRANSACTION_FIELDS]
+        self.check_states = bytearray([Qt.Checked]) * len(self.columns[0])
+        self.errors, self.amounts = self.validate_columns(self.columns)
+        
+        self.endResetModel()
+        
+    def append_transactions(self, columns):
+        """
+        Appends more transactions to the end of the model, keeping the check
+        states of the rows that are already loaded.
+        
+        Args:
+            columns (list): One list of values per field in TRANSACTION_FIELDS.
+        """
+        count = len(columns[0])
+        if count == 0:
+            return
+            
+        first = len(self.check_states)
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        
+        for column, values in zip(self.columns, columns):
+            column.extend(values)
+        self.check_states.extend(bytearray([Qt.Checked]) * count)
+        new_errors, new_amounts = self.validate_columns(columns)
+        for errors, column_errors in zip(self.errors, new_errors):
+            errors.extend(column_errors)
+        self.amounts.extend(new_amounts)
+            
+        self.endInsertRows()
+        
+    def validate_columns(self, columns):
+        """
+        Validates the date, amount and category columns.
+        
+        Args:
+            columns (list): One list of values per field in TRANSACTION_FIELDS.
+            
+        Returns:
+            tuple: (errors, amounts) with the error lists for the date, amount and
+                category columns, and the parsed amounts.
+        """
+        # Validate column by column rather than row by row
+        dates, amounts, categories = columns[:3]
+        known = self.categories
+        category_error = self.CATEGORY_ERROR
+        parsed = list(map(parse_amount, amounts))
+        errors = [
+            list(map(date_error, dates)),
+            [error for _, error in parsed],
+            [None if category in known else category_error for category in categories]
+        ]
+        return errors, [value for value, _ in parsed]
+        
+    def validate_cell(self, row, column):
+        """
+        Re-validates a single cell after it has been edited.
+        
+        Args:
+            row (int): Row of the edited cell.
+            column (int): Column of the edited cell.
+        """
+        value = self.columns[column][row]
+        if column == 0:
+            self.errors[0][row] = date_error(value)
+        elif column == 1:
+            self.amounts[row], self.errors[1][row] = parse_amount(value)
+        elif column == 2:
+            self.errors[2][row] = None if value in self.categories else self.CATEGORY_ERROR
+        
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Returns the number of loaded transactions.
+        """
+        return 0 if parent.isValid() else len(self.check_states)
+        
+    def columnCount(self, parent=QModelIndex()):
+        """
+        Returns the number of columns in the preview.
+        """
+        return 0 if parent.isValid() else len(self.HEADERS)
+        
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """
+        Returns the column titles for the horizontal header.
+        """
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+        
+    def flags(self, index):
+        """
+        Returns the item flags, making the import column checkable and the
+        remaining columns editable.
+        """
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == self.IMPORT_COLUMN:
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+        
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Returns the data for a cell, looked up from the column lists.
+        """
+        if not index.isValid():
+            return None
+            
+        row = index.row()
+        column = index.column()
+        
+        if column == self.IMPORT_COLUMN:
+            if role == Qt.CheckStateRole:
+                return self.check_states[row]
+            return None
+            
+        if role in _VALUE_ROLES:
+            return self.columns[column][row]
+            
+        # Highlight invalid dates and amounts in red, unknown categories in yellow
+        if column < 3 and role in _ERROR_ROLES:
+            error = self.errors[column][row]
+            if error is None:
+                return None
+            if role == Qt.ToolTipRole:
+                return error
+            return Qt.yellow if column == 2 else Qt.red
+            
+        return None
+        
+    def setData(self, index, value, role=Qt.EditRole):
+        """
+        Updates a cell value or the import check state of a row.
+        """
+        if not index.isValid():
+            return False
+            
+        row = index.row()
+        column = index.column()
+        
+        if column == self.IMPORT_COLUMN:
+            if role != Qt.CheckStateRole:
+                return False
+            self.check_states[row] = Qt.Checked if value == Qt.Checked else Qt.Unchecked
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            return True
+            
+        if role != Qt.EditRole:
+            return False
+            
+        self.columns[column][row] = str(value)
+        self.validate_cell(row, column)
+        self.dataChanged.emit(index, index)
+        return True
+        
+    def set_all_checked(self, checked):
+        """
+        Sets the import check state of every row at once.
+        
+        Args:
+            checked (bool): True to select all rows, False to deselect them.
+        """
+        if not self.check_states:
+            return
+            
+        state = Qt.Checked if checked else Qt.Unchecked
+        self.check_states[:] = bytearray([state]) * len(self.check_states)
+        
+        top = self.index(0, self.IMPORT_COLUMN)
+        bottom = self.index(len(self.check_states) - 1, self.IMPORT_COLUMN)
+        self.dataChanged.emit(top, bottom, [Qt.CheckStateRole])
+
+class CsvLoader(QObject):
+    """
+    Worker reading a page of rows from the open CSV file on a separate thread.
+    """
+    
+    chunk_ready = pyqtSignal(list)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+    
+    def __init__(self, read_rows, count):
+        """
+        Initialize the loader.
+        
+        Args:
+            read_rows: Function reading up to count rows, returning their columns.
+            count (int): Number of rows to read.
+        """
+        super().__init__()
+        
+        self.read_rows = read_rows
+        self.count = count
+        
+    def run(self):
+        """
+        Read the rows and emit them as one list of values per field.
+        """
+        try:
+            self.chunk_ready.emit(self.read_rows(self.count))
+        except Exception as e:
+            self.failed.emit(str(e))
+        self.finished.emit()
+        
+class ImportWorker(QObject):
+    """
+    Worker inserting the selected transactions on a separate thread.
+    
+    SQLite connections can only be used from the thread that created them, so
+    the worker opens its own connection to the database file. All the rows are
+    inserted inside a single SQL transaction.
+    """
+    
+    progress = pyqtSignal(int)
+    categories_needed = pyqtSignal(list)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal(int, int, list)
+    
+    def __init__(self, db_file, chunks, categories):
+        """
+        Initialize the import worker.
+        
+        Args:
+            db_file (str): Path to the database file.
+            chunks: Iterator over the chunks of transactions to import, as
+                yielded by BatchImportDialog.selected_transactions().
+            categories: Category names that exist in the database.
+        """
+        super().__init__()
+        
+        self.db_file = db_file
+        self.chunks = chunks
+        self.categories = set(categories)
+        
+        # Answer to the last categories_needed signal, set by the dialog
+        self.create_categories = False
+        
+    def run(self):
+        """
+        Import the transactions, emitting progress after every chunk.
+        
+        Emits finished with the number of imported and failed transactions and
+        the error messages, or failed if the import was rolled back.
+        """
+        # The worker only uses the database from its own thread, so it needs
+        # no reader pool
+        db = Database(self.db_file)
+        if not db.connect(readers=0):
+            self.failed.emit("Could not connect to the database.")
+            return
+            
+        finance_tracker = FinanceTracker(db)
+        
+        successful_imports = 0
+        failed_imports = 0
+        error_messages = []
+        declined = set()
+        categories = self.categories
+        processed = 0
+        
+        # Validated transactions waiting to be inserted
+        batch = []
+        batch_rows = []
+        
+        # Bind the names used for every row to locals
+        queue = batch.append
+        queue_row = batch_rows.append
+        
+        try:
+            for chunk in self.chunks:
+                # Ask about all the new categories of the chunk at once
+                try:
+                    self.create_missing_categories(db, chunk, declined)
+                except Exception as e:
+                    raise ValueError(f"Failed to create new categories: {str(e)}")
+                    
+                for row, transaction, amount, date_err, amount_err in chunk:
+                    # Get transaction data
+                    date, amount_str, category, description, account_type, payment_method = transaction
+                    
+                    # Date and amount were validated when the rows were read
+                    if date_err:
+                        error = f"Invalid date format in row {row+1}: {date}"
+                    elif amount_err:
+                        error = f"Invalid amount in row {row+1}: {amount_str} ({amount_err})"
+                    elif category not in categories:
+                        error = f"Category not found in row {row+1}: {category}"
+                    else:
+                        # Queue the transaction for a bulk insert
+                        queue((date, amount, category, description, account_type, payment_method))
+                        queue_row(row)
+                        continue
+                        
+                    failed_imports += 1
+                    error_messages.append(f"Error in row {row+1}: {error}")
+                    
+                if len(batch) >= CHUNK_SIZE:
+                    imported, failed = self.flush_batch(finance_tracker, batch, batch_rows, error_messages)
+                    successful_imports += imported
+                    failed_imports += failed
+                    
+                processed += len(chunk)
+                self.progress.emit(processed)
+                
+            imported, failed = self.flush_batch(finance_tracker, batch, batch_rows, error_messages)
+            successful_imports += imported
+            failed_imports += failed
+            
+            db.conn.commit()
+        except Exception as e:
+            db.conn.rollback()
+            self.failed.emit(str(e))
+            return
+        finally:
+            db.close()
+            
+        self.finished.emit(successful_imports, failed_imports, error_messages)
+        
+    def create_missing_categories(self, db, chunk, declined):
+        """
+        Offer to create the unknown categories used by a chunk of transactions.
+        
+        The categories are collected first so the user is asked a single
+        question per chunk instead of once per category. The question is asked
+        by the dialog on the GUI thread through the categories_needed signal.
+        
+        Args:
+            db: Database used by the worker.
+            chunk (list): Transactions as yielded by selected_transactions().
+            declined (set): Category names the user chose not to create, updated
+                with the newly declined ones.
+        """
+        # Only the valid rows are imported, so only their categories matter
+        unknown = {values[2] for _, values, _, date_err, amount_err in chunk if not (date_err or amount_err)}
+        unknown -= self.categories
+        unknown -= declined
+        if not unknown:
+            return
+            
+        names = sorted(unknown)
+        self.create_categories = False
+        self.categories_needed.emit(names)
+        
+        if not self.create_categories:
+            declined |= unknown
+            return
+            
+        # Use database directly since we don't have a method in finance_tracker for this.
+        # The insert is committed together with the imported transactions.
+        db.cursor.executemany('''
+        INSERT INTO categories
+        (category_name, monthly_budget, priority_level, icon)
+        VALUES (?, ?, ?, ?)
+        ''', [(name, 200.00, "Medium", "default") for name in names])
+        
+        self.categories |= unknown
+        
+    def flush_batch(self, finance_tracker, batch, batch_rows, error_messages):
+        """
+        Insert the queued transactions without committing and empty the batch.
+        
+        Args:
+            finance_tracker: FinanceTracker used by the worker.
+            batch (list): Queued transaction tuples.
+            batch_rows (list): Row number of each queued transaction.
+            error_messages (list): List to append an error message to on failure.
+            
+        Returns:
+            tuple: (imported, failed) transaction counts.
+        """
+        if not batch:
+            return 0, 0
+            
+        count = len(batch)
+        result = finance_tracker.add_transactions(batch, commit=False)
+        
+        if result < 0:
+            error_messages.append(f"Failed to add transactions in rows {batch_rows[0]+1}-{batch_rows[-1]+1}")
+            
+        batch.clear()
+        batch_rows.clear()
+        return (count, 0) if result >= 0 else (0, count)
+        
 class BatchImportDialog(QDialog):
     """
     Dialog for batch importing multiple transactions from a CSV file.
@@ -34,7 +526,19 @@ class BatchImportDialog(QDialog):
         super().__init__(parent)
         
         self.finance_tracker = finance_tracker
-        self.transactions = []
+        self.transactions = {field: [] for field in TRANSACTION_FIELDS}
+        
+        # Open CSV file and the iterator over its rows not loaded into the preview yet
+        self.csv_file = None
+        self.pending_rows = None
+        
+        # Background threads loading the CSV file and importing the transactions
+        self.loader = None
+        self.loader_thread = None
+        self.import_worker = None
+        self.import_thread = None
+        self.imported_count = 0
+        
         self.init_ui()
         
     def init_ui(self):
@@ -63,17 +567,20 @@ class BatchImportDialog(QDialog):
         layout.addLayout(file_layout)
         
         # Preview section
-        preview_label = QLabel("Transaction Preview:")
-        layout.addWidget(preview_label)
-        
-        self.preview_table = QTableWidget(0, 7)
-        self.preview_table.setHorizontalHeaderLabels([
-            "Date", "Amount", "Category", "Description", 
-            "Account Type", "Payment Method", "Import"
-        ])
+        self.preview_label = QLabel("Transaction Preview:")
+        layout.addWidget(self.preview_label)
+        
+        self.preview_model = TransactionPreviewModel(parent=self)
+        self.preview_table = QTableView()
+        self.preview_table.setModel(self.preview_model)
         self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.preview_table)
         
+        # Import progress, shown while the transactions are imported
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
         # Information label
         info_label = QLabel("CSV Format: transaction_id,date,amount,category,description,account_type,payment_method")
         info_label.setStyleSheet("color: gray;")
@@ -92,6 +599,11 @@ class BatchImportDialog(QDialog):
         self.import_button.clicked.connect(self.import_transactions)
         button_layout.addWidget(self.import_button)
         
+        self.load_more_button = QPushButton("Load More")
+        self.load_more_button.setEnabled(False)
+        self.load_more_button.clicked.connect(self.load_more)
+        button_layout.addWidget(self.load_more_button)
+        
         select_all_button = QPushButton("Select All")
         select_all_button.clicked.connect(self.select_all)
         button_layout.addWidget(select_all_button)
@@ -122,257 +634,412 @@ class BatchImportDialog(QDialog):
         """
         Load the CSV file and display a preview of the transactions.
         
+        Only the first PREVIEW_LIMIT rows are read up front, on a background
+        thread; the file is kept open so more rows can be loaded on demand or
+        streamed during import.
+        
         Args:
             file_path (str): Path to the CSV file.
         """
+        self.close_csv_file()
+        
         try:
-            self.transactions = []
+            self.csv_file = self.open_csv_file(file_path)
+            csv_reader = csv.reader(self.csv_file)
             
-            with open(file_path, 'r') as file:
-                csv_reader = csv.reader(file)
-                
-                # Skip header row
-                header = next(csv_reader, None)
-                
-                if not header:
-                    QMessageBox.warning(self, "Empty File", "The CSV file appears to be empty.")
-                    return
-                
-                # Determine CSV format based on header
-                has_transaction_id = len(header) > 6 and header[0].lower() == "transaction_id"
-                
-                # Process based on format
-                if has_transaction_id:
-                    # Format: transaction_id,date,amount,category,description,account_type,payment_method
-                    for row in csv_reader:
-                        if len(row) >= 7:
-                            transaction = {
-                                'date': row[1],
-                                'amount': row[2],
-                                'category': row[3],
-                                'description': row[4],
-                                'account_type': row[5],
-                                'payment_method': row[6]
-                            }
-                            self.transactions.append(transaction)
+            # Skip header row
+            header = next(csv_reader, None)
+            
+            if not header:
+                self.close_csv_file()
+                QMessageBox.warning(self, "Empty File", "The CSV file appears to be empty.")
+                return
+            
+            # Determine CSV format based on header
+            has_transaction_id = len(header) > 6 and header[0].lower() == "transaction_id"
+            
+            # Process based on format
+            if has_transaction_id:
+                # Format: transaction_id,date,amount,category,description,account_type,payment_method
+                self.pending_rows = (row[1:7] for row in csv_reader if len(row) >= 7)
+            else:
+                # Alternative format: date,amount,category,description,account_type,payment_method
+                if len(header) >= 6:
+                    self.pending_rows = (row[:6] for row in csv_reader if len(row) >= 6)
+                    
+                    # First row might be a header or data
+                    # Check if first cell looks like a date
+                    if date_error(header[0]) is None:
+                        # It's a data row, not a header
+                        self.pending_rows = chain([header[:6]], self.pending_rows)
                 else:
-                    # Alternative format: date,amount,category,description,account_type,payment_method
-                    if len(header) >= 6:
-                        # First row might be a header or data
-                        # Check if first cell looks like a date
-                        try:
-                            datetime.strptime(header[0], "%Y-%m-%d")
-                            # It's a data row, not a header
-                            transaction = {
-                                'date': header[0],
-                                'amount': header[1],
-                                'category': header[2],
-                                'description': header[3],
-                                'account_type': header[4],
-                                'payment_method': header[5]
-                            }
-                            self.transactions.append(transaction)
-                        except ValueError:
-                            # It was a header row, just continue
-                            pass
-                            
-                        # Process the rest of the file
-                        for row in csv_reader:
-                            if len(row) >= 6:
-                                transaction = {
-                                    'date': row[0],
-                                    'amount': row[1],
-                                    'category': row[2],
-                                    'description': row[3],
-                                    'account_type': row[4],
-                                    'payment_method': row[5]
-                                }
-                                self.transactions.append(transaction)
-                    else:
-                        QMessageBox.warning(
-                            self, 
-                            "Invalid CSV Format", 
-                            "The CSV file does not have the required columns. Please use one of these formats:\n\n"
-                            "transaction_id,date,amount,category,description,account_type,payment_method\n\n"
-                            "OR\n\n"
-                            "date,amount,category,description,account_type,payment_method"
-                        )
-                        return
-                            
-                # Update the preview table
-                self.update_preview_table()
-                
-                # Enable import button if transactions are loaded
-                self.import_button.setEnabled(len(self.transactions) > 0)
+                    self.close_csv_file()
+                    QMessageBox.warning(
+                        self, 
+                        "Invalid CSV Format", 
+                        "The CSV file does not have the required columns. Please use one of these formats:\n\n"
+                        "transaction_id,date,amount,category,description,account_type,payment_method\n\n"
+                        "OR\n\n"
+                        "date,amount,category,description,account_type,payment_method"
+                    )
+                    return
                     
+            # Read the first page of the preview in the background
+            self.start_loader(self.show_first_page)
+                
         except Exception as e:
+            self.close_csv_file()
             QMessageBox.critical(self, "Error", f"Failed to load CSV file: {str(e)}")
             
-    def update_preview_table(self):
+    def open_csv_file(self, file_path):
         """
-        Update the preview table with the loaded transactions.
+        Open a CSV file for reading as text.
+        
+        Small files are read and decoded in one go and parsed from memory, larger
+        ones are decoded while they are streamed. A UTF-8 BOM is dropped either way.
+        
+        Args:
+            file_path (str): Path to the CSV file.
+            
+        Returns:
+            A text file object positioned at the start of the CSV data.
         """
-        # Clear the table
-        self.preview_table.setRowCount(0)
+        file = open(file_path, 'rb', buffering=READ_BUFFER_SIZE)
         
-        # Check if we have categories from the finance tracker
-        categories = self.finance_tracker.get_category_names()
+        if os.fstat(file.fileno()).st_size < SMALL_FILE_SIZE:
+            with file:
+                text = file.read().decode('utf-8-sig')
+            return io.StringIO(text, newline='')
+            
+        return io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+        
+    def read_pending_rows(self, count):
+        """
+        Reads up to count rows from the open CSV file.
         
-        # Add transactions to the table
-        for transaction in self.transactions:
-            row = self.preview_table.rowCount()
-            self.preview_table.insertRow(row)
+        Args:
+            count (int): Maximum number of rows to read.
             
-            # Date
-            date_item = QTableWidgetItem(transaction['date'])
-            self.preview_table.setItem(row, 0, date_item)
+        Returns:
+            list: One list of values per field in TRANSACTION_FIELDS.
+        """
+        rows = list(islice(self.pending_rows, count)) if self.pending_rows is not None else []
+        
+        if len(rows) < count:
+            # The whole file has been read
+            self.close_csv_file()
             
-            # Validate date
-            try:
-                datetime.strptime(transaction['date'], "%Y-%m-%d")
-            except ValueError:
-                date_item.setBackground(Qt.red)
-                date_item.setToolTip("Invalid date format. Use YYYY-MM-DD.")
-                
-            # Amount
-            amount_item = QTableWidgetItem(transaction['amount'])
-            self.preview_table.setItem(row, 1, amount_item)
-            
-            # Validate amount
-            try:
-                amount = float(transaction['amount'])
-                if amount <= 0:
-                    amount_item.setBackground(Qt.red)
-                    amount_item.setToolTip("Amount must be positive.")
-            except ValueError:
-                amount_item.setBackground(Qt.red)
-                amount_item.setToolTip("Invalid amount. Must be a number.")
-                
-            # Category
-            category_item = QTableWidgetItem(transaction['category'])
-            self.preview_table.setItem(row, 2, category_item)
-            
-            # Validate category
-            if transaction['category'] not in categories:
-                category_item.setBackground(Qt.yellow)
-                category_item.setToolTip("Category not found in database.")
-                
-            # Description
-            self.preview_table.setItem(row, 3, QTableWidgetItem(transaction['description']))
+        # Transpose the rows into one list per field
+        columns = map(list, zip(*rows)) if rows else ([] for _ in TRANSACTION_FIELDS)
+        return list(columns)
+        
+    def start_loader(self, on_chunk):
+        """
+        Read the next page of rows from the CSV file on a background thread.
+        
+        Args:
+            on_chunk: Slot receiving the columns of the rows that were read.
+        """
+        self.import_button.setEnabled(False)
+        self.load_more_button.setEnabled(False)
+        
+        self.loader = CsvLoader(self.read_pending_rows, PREVIEW_LIMIT)
+        self.loader_thread = QThread(self)
+        self.loader.moveToThread(self.loader_thread)
+        
+        self.loader_thread.started.connect(self.loader.run)
+        self.loader.chunk_ready.connect(on_chunk)
+        self.loader.failed.connect(self.loader_failed)
+        self.loader.finished.connect(self.loader_thread.quit)
+        self.loader_thread.finished.connect(self.loader_done)
+        
+        self.loader_thread.start()
+        
+    def show_first_page(self, columns):
+        """
+        Show the first page of rows read from a newly opened CSV file.
+        
+        Args:
+            columns (list): One list of values per field in TRANSACTION_FIELDS.
+        """
+        self.transactions = dict(zip(TRANSACTION_FIELDS, columns))
+        
+        # Update the preview table
+        self.update_preview_table()
+        
+    def show_next_page(self, columns):
+        """
+        Append a page of rows read by Load More to the preview.
+        
+        Args:
+            columns (list): One list of values per field in TRANSACTION_FIELDS.
+        """
+        self.begin_preview_update()
+        try:
+            self.preview_model.append_transactions(columns)
+        finally:
+            self.end_preview_update()
             
-            # Account Type
-            self.preview_table.setItem(row, 4, QTableWidgetItem(transaction['account_type']))
+    def loader_failed(self, error):
+        """
+        Report an error raised while reading the CSV file.
+        
+        Args:
+            error (str): Error message.
+        """
+        self.close_csv_file()
+        QMessageBox.critical(self, "Error", f"Failed to load CSV file: {error}")
+        
+    def loader_done(self):
+        """
+        Clean up after the loader thread and update the buttons.
+        """
+        self.loader_thread.deleteLater()
+        self.loader.deleteLater()
+        self.loader_thread = None
+        self.loader = None
+        
+        self.update_preview_label()
+        
+        # Enable import button if transactions are loaded
+        self.import_button.setEnabled(self.preview_model.rowCount() > 0)
+        
+    def load_more(self):
+        """
+        Load the next page of transactions from the CSV file into the preview.
+        """
+        if self.loader_thread is None:
+            self.start_loader(self.show_next_page)
             
-            # Payment Method
-            self.preview_table.setItem(row, 5, QTableWidgetItem(transaction['payment_method']))
+    def update_preview_label(self):
+        """
+        Show how many rows are previewed and whether more rows are available.
+        """
+        text = f"Transaction Preview: {self.preview_model.rowCount()} rows loaded"
+        if self.pending_rows is not None:
+            text += " (more rows available, rows not loaded are imported as well)"
+        self.preview_label.setText(text + ":")
+        self.load_more_button.setEnabled(self.pending_rows is not None and self.loader_thread is None)
+        
+    def close_csv_file(self):
+        """
+        Close the CSV file and forget any rows that have not been read.
+        """
+        if self.csv_file is not None:
+            self.csv_file.close()
+        self.csv_file = None
+        self.pending_rows = None
+        
+    def done(self, result):
+        """
+        Close the CSV file when the dialog is accepted or rejected.
+        
+        The dialog stays open while a background thread is still using the file.
+        
+        Args:
+            result (int): Dialog result code.
+        """
+        if self.loader_thread is not None or self.import_thread is not None:
+            return
             
-            # Import checkbox
-            import_checkbox = QTableWidgetItem()
-            import_checkbox.setCheckState(Qt.Checked)
-            self.preview_table.setItem(row, 6, import_checkbox)
+        self.close_csv_file()
+        super().done(result)
+        
+    def update_preview_table(self):
+        """
+        Update the preview table with the loaded transactions.
+        """
+        self.begin_preview_update()
+        try:
+            # Reload the model, validating against the current categories
+            self.preview_model.set_transactions(self.transactions, self.finance_tracker.get_category_names())
+        finally:
+            self.end_preview_update()
+        self.update_preview_label()
+        
+    def begin_preview_update(self):
+        """
+        Suspend repaints and column stretching of the preview table while its
+        model is filled, so the layout is only recomputed once afterwards.
+        """
+        self.preview_table.setUpdatesEnabled(False)
+        self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        
+    def end_preview_update(self):
+        """
+        Restore the column stretching and repaint the preview table.
+        """
+        self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.preview_table.setUpdatesEnabled(True)
+        self.preview_table.viewport().update()
             
     def select_all(self):
         """
         Select all transactions for import.
         """
-        for row in range(self.preview_table.rowCount()):
-            item = self.preview_table.item(row, 6)
-            if item:
-                item.setCheckState(Qt.Checked)
+        self.preview_model.set_all_checked(True)
                 
     def deselect_all(self):
         """
         Deselect all transactions for import.
         """
-        for row in range(self.preview_table.rowCount()):
-            item = self.preview_table.item(row, 6)
-            if item:
-                item.setCheckState(Qt.Unchecked)
+        self.preview_model.set_all_checked(False)
                 
+    def selected_transactions(self):
+        """
+        Iterate over the transactions to import, one chunk at a time.
+        
+        Yields the previewed rows that are checked, followed by the rows of the
+        CSV file that were never loaded into the preview, read and validated in
+        chunks. Previewed rows reuse the validation done when they were loaded.
+        
+        Yields:
+            list: (row, values, amount, date_error, amount_error) tuples with the
+                row number, the six field values, the parsed amount and the date
+                and amount error messages (None when valid).
+        """
+        model = self.preview_model
+        checked = Qt.Checked
+        
+        # Read the model's column lists directly instead of going through model.data()
+        rows = zip(model.check_states, zip(*model.columns), model.amounts, model.errors[0], model.errors[1])
+        yield [
+            (row, values, amount, date_err, amount_err)
+            for row, (state, values, amount, date_err, amount_err) in enumerate(rows)
+            if state == checked
+        ]
+        
+        first = model.rowCount()
+        while self.pending_rows is not None:
+            columns = self.read_pending_rows(CHUNK_SIZE)
+            (date_errors, amount_errors, _), amounts = model.validate_columns(columns)
+            rows = range(first, first + len(amounts))
+            yield list(zip(rows, zip(*columns), amounts, date_errors, amount_errors))
+            first += len(amounts)
+            
     def import_transactions(self):
         """
         Import the selected transactions into the finance tracker.
+        
+        The import runs on a background thread with its own database connection;
+        the results are shown by import_finished once it is done.
         """
-        successful_imports = 0
-        failed_imports = 0
-        error_messages = []
+        if self.loader_thread is not None or self.import_thread is not None:
+            return
+            
+        self.imported_count = 0
+        
+        # Collect the previewed rows now, before the worker starts reading the file
+        chunks = self.selected_transactions()
+        chunks = chain([next(chunks)], chunks)
+        
+        self.import_worker = ImportWorker(
+            self.finance_tracker.db.db_file, chunks, self.finance_tracker.get_category_names()
+        )
+        self.import_thread = QThread(self)
+        self.import_worker.moveToThread(self.import_thread)
+        
+        self.import_thread.started.connect(self.import_worker.run)
+        self.import_worker.progress.connect(self.import_progress)
+        # The worker waits for the answer, so the question blocks its thread
+        self.import_worker.categories_needed.connect(self.ask_create_categories, Qt.BlockingQueuedConnection)
+        self.import_worker.finished.connect(self.import_finished)
+        self.import_worker.failed.connect(self.import_failed)
+        self.import_worker.finished.connect(self.import_thread.quit)
+        self.import_worker.failed.connect(self.import_thread.quit)
+        self.import_thread.finished.connect(self.import_done)
+        
+        # Show the progress: a bar when the total is known, a busy indicator otherwise
+        total = self.preview_model.check_states.count(Qt.Checked)
+        self.progress_bar.setRange(0, 0 if self.pending_rows is not None else total)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.set_controls_enabled(False)
+        
+        self.import_thread.start()
+        
+    def set_controls_enabled(self, enabled):
+        """
+        Enable or disable the preview and the buttons while importing.
+        
+        Args:
+            enabled (bool): True to enable the controls, False to disable them.
+        """
+        self.preview_table.setEnabled(enabled)
+        for button in self.findChildren(QPushButton):
+            button.setEnabled(enabled)
+            
+    def import_progress(self, processed):
+        """
+        Update the progress bar and label while importing.
+        
+        Args:
+            processed (int): Number of rows processed so far.
+        """
+        if self.progress_bar.maximum() > 0:
+            self.progress_bar.setValue(processed)
+        self.preview_label.setText(f"Importing transactions: {processed} rows processed...")
+        
+    def ask_create_categories(self, names):
+        """
+        Ask whether to create the unknown categories found by the import worker.
+        
+        Args:
+            names (list): Sorted names of the unknown categories.
+        """
+        listing = "\n".join(f"- {name}" for name in names[:20])
+        if len(names) > 20:
+            listing += f"\n- ...and {len(names) - 20} more"
+            
+        confirmation = QMessageBox.question(
+            self,
+            "Categories Not Found",
+            f"The following {len(names)} categories do not exist in the database:\n{listing}\n\n"
+            "Would you like to create them with a default monthly budget of $200?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        
+        self.import_worker.create_categories = confirmation == QMessageBox.Yes
+        
+    def import_failed(self, error):
+        """
+        Report an import that was rolled back.
+        
+        Args:
+            error (str): Error message.
+        """
+        QMessageBox.critical(self, "Error", f"Import failed, no transactions were imported: {error}")
+        
+    def import_done(self):
+        """
+        Clean up after the import thread and restore the dialog controls.
+        """
+        self.import_thread.deleteLater()
+        self.import_worker.deleteLater()
+        self.import_thread = None
+        self.import_worker = None
+        
+        self.progress_bar.setVisible(False)
+        self.set_controls_enabled(True)
+        self.update_preview_label()
+        self.import_button.setEnabled(self.preview_model.rowCount() > 0)
+        
+        # Accept the dialog only if some transactions were imported successfully
+        if self.imported_count > 0:
+            self.accept()
+        
+    def import_finished(self, successful_imports, failed_imports, error_messages):
+        """
+        Show the results of the import.
+        
+        Args:
+            successful_imports (int): Number of transactions imported.
+            failed_imports (int): Number of transactions that failed.
+            error_messages (list): Error messages for the failed transactions.
+        """
+        self.imported_count = successful_imports
         
-        categories = self.finance_tracker.get_category_names()
-        
-        for row in range(self.preview_table.rowCount()):
-            # Check if the row is selected for import
-            import_item = self.preview_table.item(row, 6)
-            if import_item and import_item.checkState() == Qt.Checked:
-                # Get transaction data
-                date = self.preview_table.item(row, 0).text()
-                amount_str = self.preview_table.item(row, 1).text()
-                category = self.preview_table.item(row, 2).text()
-                description = self.preview_table.item(row, 3).text()
-                account_type = self.preview_table.item(row, 4).text()
-                payment_method = self.preview_table.item(row, 5).text()
-                
-                try:
-                    # Validate date
-                    try:
-                        datetime.strptime(date, "%Y-%m-%d")
-                    except ValueError:
-                        raise ValueError(f"Invalid date format in row {row+1}: {date}")
-                        
-                    # Validate amount
-                    try:
-                        amount = float(amount_str)
-                        if amount <= 0:
-                            raise ValueError(f"Amount must be positive in row {row+1}: {amount}")
-                    except ValueError as ve:
-                        if "Amount must be positive" in str(ve):
-                            raise ve
-                        else:
-                            raise ValueError(f"Invalid amount in row {row+1}: {amount_str}")
-                            
-                    # Validate category
-                    if category not in categories:
-                        # Attempt to create the category with a default budget
-                        confirmation = QMessageBox.question(
-                            self,
-                            "Category Not Found",
-                            f"The category '{category}' does not exist in the database. Would you like to create it with a default monthly budget of $200?",
-                            QMessageBox.Yes | QMessageBox.No,
-                            QMessageBox.No
-                        )
-                        
-                        if confirmation == QMessageBox.Yes:
-                            # Add the category (this would need to be implemented in the finance_tracker)
-                            try:
-                                # Use database directly since we don't have a method in finance_tracker for this
-                                self.finance_tracker.db.cursor.execute('''
-                                INSERT INTO categories
-                                (category_name, monthly_budget, priority_level, icon)
-                                VALUES (?, ?, ?, ?)
-                                ''', (category, 200.00, "Medium", "default"))
-                                self.finance_tracker.db.conn.commit()
-                                
-                                # Update local categories list
-                                categories = self.finance_tracker.get_category_names()
-                            except Exception as e:
-                                raise ValueError(f"Failed to create new category: {str(e)}")
-                        else:
-                            raise ValueError(f"Category not found in row {row+1}: {category}")
-                            
-                    # Add transaction
-                    result = self.finance_tracker.add_transaction(
-                        date, amount, category, description, account_type, payment_method
-                    )
-                    
-                    if result > 0:
-                        successful_imports += 1
-                    else:
-                        failed_imports += 1
-                        error_messages.append(f"Failed to add transaction in row {row+1}")
-                        
-                except Exception as e:
-                    failed_imports += 1
-                    error_messages.append(f"Error in row {row+1}: {str(e)}")
-                    
         # Show results
         message = f"Import complete: {successful_imports} transactions imported successfully."
         
@@ -388,10 +1055,3 @@ class BatchImportDialog(QDialog):
             QMessageBox.warning(self, "Import Results", message)
         else:
             QMessageBox.information(self, "Import Results", message)
-        
-        # Accept the dialog only if some transactions were imported successfully
-        if successful_imports > 0:
-            self.accept()
-        else:
-            # Keep the dialog open if no transactions were imported
-            pass
\ No newline at end of file
@@ -6,10 +6,13 @@
 #This module handles the creation of charts and graphs for visualizing financial data.
 #It provides methods to generate various types of visualizations using matplotlib.
 
-import matplotlib.pyplot as plt
+from matplotlib import colormaps
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import calendar
+import functools
+import os
+import sqlite3
 from datetime import datetime, timedelta
 import numpy as np
 from PyQt5.QtWidgets import (QVBoxLayout, QWidget, QLabel, QComboBox, 
@@ -17,6 +20,139 @@ from PyQt5.QtWidgets import (QVBoxLayout, QWidget, QLabel, QComboBox,
                             QFormLayout)
 from PyQt5.QtCore import Qt, QDate
 
+#Chart colors, resolved once at import instead of on every chart.
+#pyplot is not imported: it would set up its own backend and figure manager,
+#while the charts are drawn on Qt canvases directly.
+PIE_COLORS = tuple(colormaps['tab10'].colors)
+TREND_COLOR = '#1f77b4'
+SPENT_COLOR = '#ff7f0e'
+BUDGET_COLOR = '#2ca02c'
+
+#Number of days in each month of a non-leap year
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+#Resolution of the chart figures; Qt scales the canvas up on HiDPI screens
+CHART_DPI = 72
+
+def last_day_of_month(year, month):
+    """
+    Gets the number of days in a month.
+    
+    Args:
+        year (int): Year of the month.
+        month (int): Month number, 1 to 12.
+        
+    Returns:
+        int: The last day of the month.
+    """
+    if month == 2 and calendar.isleap(year):
+        return 29
+    return DAYS_IN_MONTH[month - 1]
+
+def month_range(start_date, end_date):
+    """
+    Lists the first day of every month between two dates, both months included.
+    
+    The months are generated with numpy's month-precision datetime64 arithmetic
+    instead of stepping through them one by one in Python.
+    
+    Args:
+        start_date (datetime): Any date in the first month.
+        end_date (datetime): Any date in the last month.
+        
+    Returns:
+        list: datetime.date objects for the first day of each month.
+    """
+    # Truncate the dates to their month directly, without formatting them as strings
+    return month_index_dates(month_index(start_date, end_date))
+
+def month_index(start_date, end_date):
+    """
+    Builds the months between two dates as a numpy datetime64[M] array.
+    
+    Args:
+        start_date (datetime): Any date in the first month.
+        end_date (datetime): Any date in the last month.
+        
+    Returns:
+        numpy.ndarray: One datetime64[M] value per month, both months included.
+    """
+    return np.arange(np.datetime64(start_date, 'M'), np.datetime64(end_date, 'M') + 1)
+
+def month_index_dates(months):
+    """
+    Converts a datetime64[M] array to the first day of each month.
+    
+    Args:
+        months (numpy.ndarray): Months as returned by month_index().
+        
+    Returns:
+        list: datetime.date objects for the first day of each month.
+    """
+    return months.astype('datetime64[D]').tolist()
+
+def months_in_range(date_range):
+    """
+    Lists the months covered by a (MIN(date), MAX(date)) range of transactions.
+    
+    Args:
+        date_range (tuple): Earliest and latest dates in YYYY-MM-DD format,
+            either of which may be None when there are no transactions.
+            
+    Returns:
+        tuple: (year_month, display_name) tuples, oldest month first.
+    """
+    if not date_range or not date_range[0] or not date_range[1]:
+        return ()
+        
+    min_date = datetime.strptime(date_range[0], "%Y-%m-%d")
+    max_date = datetime.strptime(date_range[1], "%Y-%m-%d")
+    
+    # Generate a list of months between min and max dates
+    return tuple((month_date.strftime("%Y-%m"), month_date.strftime("%B %Y"))
+                 for month_date in month_range(min_date, max_date))
+                 
+def database_mtime(db_file):
+    """
+    Gets the modification times of a database file and of its write-ahead log.
+    
+    Commits to a WAL database only write the -wal file, so both times are
+    needed to tell whether the contents changed.
+    
+    Args:
+        db_file (str): Path to the database file.
+        
+    Returns:
+        tuple: (database mtime, WAL mtime) in nanoseconds; the WAL time is 0
+            when there is no -wal file.
+    """
+    wal_file = db_file + "-wal"
+    wal_mtime = os.stat(wal_file).st_mtime_ns if os.path.exists(wal_file) else 0
+    return (os.stat(db_file).st_mtime_ns, wal_mtime)
+    
+@functools.lru_cache(maxsize=4)
+def cached_months(db_file, mtime):
+    """
+    Lists the months covered by the transactions of a database file.
+    
+    The result is cached per database file and modification time, so it is
+    only recomputed after the database has been written to.
+    
+    Args:
+        db_file (str): Path to the database file.
+        mtime (tuple): Modification times of the file and of its write-ahead
+            log in nanoseconds, as returned by database_mtime().
+        
+    Returns:
+        tuple: (year_month, display_name) tuples, oldest month first.
+    """
+    connection = sqlite3.connect(db_file)
+    try:
+        date_range = connection.execute("SELECT MIN(date), MAX(date) FROM transactions").fetchone()
+    finally:
+        connection.close()
+    return months_in_range(date_range)
+
 class FinanceDataVisualizer:
     """
     Data Visualization class that creates charts and graphs for financial analysis.
@@ -39,12 +175,16 @@ class FinanceDataVisualizer:
         self.current_month = datetime.now().strftime("%Y-%m")
         self.current_chart = None  # Store reference to the current chart
         
-    def create_spending_by_category_chart(self, year_month=None):
+        # Spending by category per date range, cached for the current data version
+        self.cached_spending = functools.lru_cache(maxsize=32)(self.fetch_spending)
+        
+    def create_spending_by_category_chart(self, year_month=None, canvas=None):
         """
         Creates a pie chart showing spending distribution by category for a specific month.
         
         Args:
             year_month (str): Month to display in the format "YYYY-MM". Defaults to current month.
+            canvas (FigureCanvas): Existing chart canvas to redraw instead of creating a new one.
             
         Returns:
             FigureCanvas: A matplotlib figure canvas containing the pie chart.
@@ -57,25 +197,20 @@ class FinanceDataVisualizer:
         
         # Calculate start and end dates for the selected month
         start_date = f"{year}-{month:02d}-01"
-        last_day = calendar.monthrange(year, month)[1]
+        last_day = last_day_of_month(year, month)
         end_date = f"{year}-{month:02d}-{last_day}"
         
         # Get spending data by category for the selected month
-        spending_data = self.finance_tracker.db.get_spending_by_category(start_date, end_date)
+        spending_data = self.get_spending_by_category(start_date, end_date)
         
-        # Prepare data for pie chart
-        categories = []
-        amounts = []
+        # Prepare data for pie chart (categories without positive spending are left out by the query)
+        categories, amounts = zip(*spending_data) if spending_data else ((), ())
         
-        # Only include categories with non-zero spending
-        for category, amount in spending_data:
-            if amount > 0:
-                categories.append(category)
-                amounts.append(amount)
+        # Create figure and plot, reusing the canvas figure if there is one
+        fig, ax = self.prepare_figure(canvas, (8, 6))
         
-        # Create figure and plot
-        fig = Figure(figsize=(8, 6))
-        ax = fig.add_subplot(111)
+        # Let the wedges take their colors from the axes' color cycle
+        ax.set_prop_cycle(color=PIE_COLORS)
         
         # Generate pie chart
         if len(amounts) > 0:
@@ -84,8 +219,7 @@ class FinanceDataVisualizer:
                 labels=categories,
                 autopct='%1.1f%%', 
                 startangle=90,
-                shadow=False,
-                colors=plt.cm.tab10.colors[:len(categories)]  # Use a colorful palette
+                shadow=False
             )
             
             # Equal aspect ratio ensures pie chart is circular
@@ -115,17 +249,16 @@ class FinanceDataVisualizer:
                     fontsize=12)
             ax.axis('off')
         
-        # Create canvas
-        canvas = FigureCanvas(fig)
-        return canvas
+        return self.show_figure(fig, canvas)
     
-    def create_monthly_trend_chart(self, start_date=None, end_date=None):
+    def create_monthly_trend_chart(self, start_date=None, end_date=None, canvas=None):
         """
         Creates a line chart showing spending trends over a custom date range.
         
         Args:
             start_date (str): Start date in YYYY-MM-DD format. Defaults to 6 months ago.
             end_date (str): End date in YYYY-MM-DD format. Defaults to current date.
+            canvas (FigureCanvas): Existing chart canvas to redraw instead of creating a new one.
             
         Returns:
             FigureCanvas: A matplotlib figure canvas containing the line chart.
@@ -134,49 +267,43 @@ class FinanceDataVisualizer:
         if not start_date or not end_date:
             end_date_obj = datetime.now()
             start_date_obj = end_date_obj - timedelta(days=180)  # Approximately 6 months
-            
-            start_date = start_date_obj.strftime("%Y-%m-%d")
-            end_date = end_date_obj.strftime("%Y-%m-%d")
         else:
             # Parse the provided dates
             start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
             end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
         
-        # Calculate months between start and end dates
-        months = []
-        current_date = start_date_obj.replace(day=1)
-        end_date_month = end_date_obj.replace(day=1)
+        # Calculate months between start and end dates, keeping them as dates and
+        # deriving the labels and query bounds from them directly
+        months_array = month_index(start_date_obj, end_date_obj)
+        month_dates = month_index_dates(months_array)
+        months = [month_date.strftime("%b %Y") for month_date in month_dates]
         
-        while current_date <= end_date_month:
-            months.append(current_date.strftime("%b %Y"))
-            # Move to next month
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
-        
-        # Get spending for each month
-        spending_amounts = []
-        for month_str in months:
-            month_obj = datetime.strptime(month_str, "%b %Y")
-            month_start = month_obj.strftime("%Y-%m-01")
-            month_end = month_obj.replace(day=calendar.monthrange(month_obj.year, month_obj.month)[1]).strftime("%Y-%m-%d")
-            
-            # Get spending for this month
-            spending_data = self.finance_tracker.db.get_spending_by_category(month_start, month_end)
-            total = sum(amount for _, amount in spending_data)
-            spending_amounts.append(total)
-        
-        # Create figure and plot
-        fig = Figure(figsize=(10, 5))
-        ax = fig.add_subplot(111)
+        # Get the spending of every month with a single query
+        range_start = start_date_obj.strftime("%Y-%m-01")
+        last_day = last_day_of_month(end_date_obj.year, end_date_obj.month)
+        range_end = end_date_obj.strftime(f"%Y-%m-{last_day:02d}")
+        monthly_totals = self.finance_tracker.db.get_monthly_totals(range_start, range_end)
+        
+        # Map the totals onto the months, formatting all the "YYYY-MM" keys in one numpy call
+        month_keys = np.datetime_as_string(months_array).tolist()
+        spending_amounts = [monthly_totals.get(month_key, 0) for month_key in month_keys]
         
-        if len(months) > 0 and any(amount > 0 for amount in spending_amounts):
+        # Create figure and plot, reusing the canvas figure if there is one
+        fig, ax = self.prepare_figure(canvas, (10, 5), layout='constrained')
+        
+        # Check for spending with a single numpy reduction
+        spending_amounts = np.asarray(spending_amounts, dtype=np.float64)
+        if spending_amounts.size > 0 and spending_amounts.max() > 0:
+            # Plot the months at precomputed numeric positions instead of letting
+            # matplotlib map the month labels to categories on every draw
+            positions = np.arange(len(months))
+            
             # Generate line chart
-            ax.plot(months, spending_amounts, marker='o', linestyle='-', linewidth=2, markersize=8, color='#1f77b4')
+            ax.plot(positions, spending_amounts, marker='o', linestyle='-', linewidth=2, markersize=8, color=TREND_COLOR)
             
             # Fill area under the line
-            ax.fill_between(months, spending_amounts, alpha=0.3, color='#1f77b4')
+            ax.fill_between(positions, spending_amounts, alpha=0.3, color=TREND_COLOR)
+            ax.set_xticks(positions, months)
             
             # Add labels and title
             ax.set_xlabel('Month', fontsize=12)
@@ -186,15 +313,18 @@ class FinanceDataVisualizer:
             ax.set_title(f'Monthly Spending Trend: {date_range_text}', fontsize=14)
             
             # Rotate x-axis labels for better readability
-            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+            for label in ax.get_xticklabels():
+                label.set_rotation(45)
+                label.set_horizontalalignment('right')
             
             # Add grid lines for better readability
             ax.grid(True, linestyle='--', alpha=0.7)
             
             # Add data point labels
-            for i, (month, amount) in enumerate(zip(months, spending_amounts)):
-                ax.annotate(f'${amount:.2f}', 
-                          (month, amount),
+            labels = [f'${amount:.2f}' for amount in spending_amounts]
+            for label, position, amount in zip(labels, positions, spending_amounts):
+                ax.annotate(label, 
+                          (position, amount),
                           textcoords="offset points", 
                           xytext=(0, 10), 
                           ha='center',
@@ -206,19 +336,15 @@ class FinanceDataVisualizer:
                     fontsize=12)
             ax.axis('off')
         
-        # Adjust layout to make room for rotated x-axis labels
-        fig.tight_layout()
-        
-        # Create canvas
-        canvas = FigureCanvas(fig)
-        return canvas
+        return self.show_figure(fig, canvas)
     
-    def create_budget_comparison_chart(self, year_month=None):
+    def create_budget_comparison_chart(self, year_month=None, canvas=None):
         """
         Creates a bar chart comparing budget vs. actual spending by category for a specific month.
         
         Args:
             year_month (str): Month to display in the format "YYYY-MM". Defaults to current month.
+            canvas (FigureCanvas): Existing chart canvas to redraw instead of creating a new one.
             
         Returns:
             FigureCanvas: A matplotlib figure canvas containing the bar chart.
@@ -231,40 +357,19 @@ class FinanceDataVisualizer:
         
         # Calculate start and end dates for the selected month
         start_date = f"{year}-{month:02d}-01"
-        last_day = calendar.monthrange(year, month)[1]
+        last_day = last_day_of_month(year, month)
         end_date = f"{year}-{month:02d}-{last_day}"
         
-        # Get spending data for the specified month
-        spending_data = self.finance_tracker.db.get_spending_by_category(start_date, end_date)
-        
-        # Convert to dictionary for easier lookup
-        spending_dict = {category: amount for category, amount in spending_data}
-        
-        # Get all categories and their budgets
-        categories_data = self.finance_tracker.get_all_categories()
+        # Get the budget and spending of each category with a single query
+        # instead of fetching the spending and the categories separately.
+        # The amounts are kept in integer cents until they are displayed.
+        comparison_data = self.finance_tracker.db.get_budget_comparison(start_date, end_date, cents=True)
         
         # Prepare data for bar chart
-        categories = []
-        spent_amounts = []
-        budget_amounts = []
-        
-        # Extract data for categories with budget or spending
-        for category_data in categories_data:
-            category_name = category_data[1]
-            monthly_budget = category_data[2]
-            
-            # Get spending for this category (defaults to 0 if not found)
-            spent = spending_dict.get(category_name, 0)
-            
-            # Only include categories with budget or spending
-            if monthly_budget > 0 or spent > 0:
-                categories.append(category_name)
-                spent_amounts.append(spent)
-                budget_amounts.append(monthly_budget)
-        
-        # Create figure and plot
-        fig = Figure(figsize=(10, 6))
-        ax = fig.add_subplot(111)
+        categories, budget_cents, spent_cents = zip(*comparison_data) if comparison_data else ((), (), ())
+        
+        # Create figure and plot, reusing the canvas figure if there is one
+        fig, ax = self.prepare_figure(canvas, (10, 6), layout='constrained')
         
         if len(categories) > 0:
             # Set width of bars
@@ -272,32 +377,19 @@ class FinanceDataVisualizer:
             
             # Set positions of bars on x-axis
             r1 = np.arange(len(categories))
-            r2 = [x + bar_width for x in r1]
-            
-            # Create bars
-            spent_bars = ax.bar(r1, spent_amounts, bar_width, label='Spent', color='#ff7f0e')
-            budget_bars = ax.bar(r2, budget_amounts, bar_width, label='Budget', color='#2ca02c')
-            
-            # Add data labels above bars
-            for bar in spent_bars:
-                height = bar.get_height()
-                if height > 0:
-                    ax.annotate(f'${height:.0f}',
-                             xy=(bar.get_x() + bar.get_width() / 2, height),
-                             xytext=(0, 3),  # 3 points vertical offset
-                             textcoords="offset points",
-                             ha='center', va='bottom',
-                             fontsize=8)
-                             
-            for bar in budget_bars:
-                height = bar.get_height()
-                if height > 0:
-                    ax.annotate(f'${height:.0f}',
-                             xy=(bar.get_x() + bar.get_width() / 2, height),
-                             xytext=(0, 3),  # 3 points vertical offset
-                             textcoords="offset points",
-                             ha='center', va='bottom',
-                             fontsize=8)
+            r2 = r1 + bar_width
+            
+            # Create bars from float dollar arrays so matplotlib can use them as they are
+            spent_amounts = np.asarray(spent_cents, dtype=np.int64) / 100.0
+            budget_amounts = np.asarray(budget_cents, dtype=np.int64) / 100.0
+            spent_bars = ax.bar(r1, spent_amounts, bar_width, label='Spent', color=SPENT_COLOR)
+            budget_bars = ax.bar(r2, budget_amounts, bar_width, label='Budget', color=BUDGET_COLOR)
+            
+            # Add data labels above bars (3 points vertical offset)
+            ax.bar_label(spent_bars, labels=[f'${amount:.0f}' if amount > 0 else '' for amount in spent_amounts],
+                         padding=3, fontsize=8)
+            ax.bar_label(budget_bars, labels=[f'${amount:.0f}' if amount > 0 else '' for amount in budget_amounts],
+                         padding=3, fontsize=8)
             
             # Add labels and title
             ax.set_xlabel('Categories', fontsize=12)
@@ -307,11 +399,13 @@ class FinanceDataVisualizer:
             month_name = datetime(year, month, 1).strftime("%B %Y")
             ax.set_title(f'Budget vs. Actual Spending: {month_name}', fontsize=14)
             
-            ax.set_xticks([r + bar_width/2 for r in range(len(categories))])
+            ax.set_xticks(r1 + bar_width / 2)
             ax.set_xticklabels(categories)
             
             # Rotate x-axis labels for better readability
-            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+            for label in ax.get_xticklabels():
+                label.set_rotation(45)
+                label.set_horizontalalignment('right')
             
             # Add legend
             ax.legend()
@@ -325,13 +419,84 @@ class FinanceDataVisualizer:
                     fontsize=12)
             ax.axis('off')
         
-        # Adjust layout to make room for rotated x-axis labels
-        fig.tight_layout()
+        return self.show_figure(fig, canvas)
+    
+    def get_spending_by_category(self, start_date, end_date):
+        """
+        Gets the categories with positive spending in a date range, reusing earlier results.
+        
+        Results are cached per date range and database data version, so they are
+        fetched again as soon as transactions are added, updated or deleted.
+        
+        Args:
+            start_date (str): Start date in YYYY-MM-DD format.
+            end_date (str): End date in YYYY-MM-DD format.
+            
+        Returns:
+            tuple: (category, amount) tuples.
+        """
+        version = self.finance_tracker.db.get_data_version()
+        if version is None:
+            return self.fetch_spending(start_date, end_date, version)
+        return self.cached_spending(start_date, end_date, version)
         
-        # Create canvas
-        canvas = FigureCanvas(fig)
+    def fetch_spending(self, start_date, end_date, version):
+        """
+        Fetches the categories with positive spending in a date range from the database.
+        
+        Args:
+            start_date (str): Start date in YYYY-MM-DD format.
+            end_date (str): End date in YYYY-MM-DD format.
+            version: Data version the result is cached for.
+            
+        Returns:
+            tuple: (category, amount) tuples.
+        """
+        return tuple(self.finance_tracker.db.get_spending_by_category(start_date, end_date, positive_only=True))
+        
+    def prepare_figure(self, canvas, figsize, layout=None):
+        """
+        Gets an empty figure and axes to draw a chart on.
+        
+        Args:
+            canvas (FigureCanvas): Existing chart canvas whose figure is cleared
+                and reused, or None to create a new figure.
+            figsize (tuple): Size of a new figure in inches.
+            layout (str): Layout engine of a new figure. Charts with rotated axis
+                labels use "constrained", which makes room for them on every draw
+                instead of running tight_layout once per chart.
+            
+        Returns:
+            tuple: (Figure, Axes) to draw the chart on.
+        """
+        if canvas is None:
+            fig = Figure(figsize=figsize, dpi=CHART_DPI, layout=layout)
+        else:
+            fig = canvas.figure
+            fig.clear()
+            
+        ax = fig.add_subplot(111)
+        return fig, ax
+        
+    def show_figure(self, fig, canvas):
+        """
+        Displays a drawn figure on a canvas.
+        
+        Args:
+            fig (Figure): Figure containing the chart.
+            canvas (FigureCanvas): Existing chart canvas to redraw, or None to
+                create a new canvas for the figure.
+                
+        Returns:
+            FigureCanvas: The canvas showing the figure.
+        """
+        if canvas is None:
+            return FigureCanvas(fig)
+            
+        # Redraw the existing canvas instead of replacing the widget
+        canvas.draw_idle()
         return canvas
-    
+        
     def create_visualization_widget(self, chart_type="spending_by_category"):
         """
         Creates a widget containing the specified visualization chart with controls for date selection.
@@ -342,6 +507,9 @@ class FinanceDataVisualizer:
                 - "monthly_trend": Line chart of monthly spending trends
                 - "budget_comparison": Bar chart of budget vs. actual spending
                 
+        The widget gets an update_data() method that redraws its chart in place
+        from the current data, so it can be refreshed without being rebuilt.
+                
         Returns:
             QWidget: A widget containing the visualization chart and controls.
         """
@@ -349,76 +517,107 @@ class FinanceDataVisualizer:
         widget = QWidget()
         main_layout = QVBoxLayout(widget)
         
-        # Create controls based on chart type
-        if chart_type == "spending_by_category" or chart_type == "budget_comparison":
-            # Month selector for pie chart and budget comparison
-            controls_widget = QGroupBox("Select Month")
-            controls_layout = QHBoxLayout(controls_widget)
-            
-            # Create a combo box with available months
-            self.month_selector = QComboBox()
-            self.populate_month_selector(self.month_selector)
-            controls_layout.addWidget(QLabel("Month:"))
-            controls_layout.addWidget(self.month_selector)
+        # Controls, initial chart and update callback of each chart type
+        chart_types = {
+            "spending_by_category": (self.create_month_controls, self.create_spending_by_category_chart, self.update_spending_chart),
+            "monthly_trend": (self.create_date_range_controls, self.create_monthly_trend_chart, self.update_trend_chart),
+            "budget_comparison": (self.create_month_controls, self.create_budget_comparison_chart, self.update_budget_chart),
+        }
+        
+        if chart_type in chart_types:
+            create_controls, create_chart, update_chart = chart_types[chart_type]
             
-            # Apply button
-            apply_button = QPushButton("Apply")
-            controls_layout.addWidget(apply_button)
-            controls_layout.addStretch(1)
+            # Create the controls and the initial chart
+            apply_button, controls = create_controls(main_layout)
+            chart = self.current_chart = create_chart()
             
-            main_layout.addWidget(controls_widget)
+            # Connect the apply button to redraw this widget's chart from its own controls
+            apply_button.clicked.connect(lambda: update_chart(chart, *controls))
             
-            # Create the initial chart
-            if chart_type == "spending_by_category":
-                self.current_chart = self.create_spending_by_category_chart()
-                
-                # Connect the apply button to update the chart
-                apply_button.clicked.connect(lambda: self.update_spending_chart(self.current_chart, main_layout))
-            else:  # budget_comparison
-                self.current_chart = self.create_budget_comparison_chart()
-                
-                # Connect the apply button to update the chart
-                apply_button.clicked.connect(lambda: self.update_budget_chart(self.current_chart, main_layout))
-        
-        elif chart_type == "monthly_trend":
-            # Date range selector for trend chart
-            controls_widget = QGroupBox("Select Date Range")
-            controls_layout = QFormLayout(controls_widget)
-            
-            # Start date picker
-            self.start_date_edit = QDateEdit()
-            self.start_date_edit.setDate(QDate.currentDate().addMonths(-6))  # Default to 6 months ago
-            self.start_date_edit.setCalendarPopup(True)
-            controls_layout.addRow("Start Date:", self.start_date_edit)
-            
-            # End date picker
-            self.end_date_edit = QDateEdit()
-            self.end_date_edit.setDate(QDate.currentDate())  # Default to today
-            self.end_date_edit.setCalendarPopup(True)
-            controls_layout.addRow("End Date:", self.end_date_edit)
-            
-            # Apply button
-            button_layout = QHBoxLayout()
-            apply_button = QPushButton("Apply")
-            button_layout.addWidget(apply_button)
-            button_layout.addStretch(1)
-            controls_layout.addRow("", button_layout)
-            
-            main_layout.addWidget(controls_widget)
-            
-            # Create the initial chart
-            self.current_chart = self.create_monthly_trend_chart()
-            
-            # Connect the apply button to update the chart
-            apply_button.clicked.connect(lambda: self.update_trend_chart(self.current_chart, main_layout))
+            def update_data():
+                # Pick up months added since the controls were created, then redraw
+                if create_controls == self.create_month_controls:
+                    self.refresh_month_selector(controls[0])
+                update_chart(chart, *controls)
         else:
             # Default to spending by category if an invalid chart type is specified
-            self.current_chart = self.create_spending_by_category_chart()
+            chart = self.current_chart = self.create_spending_by_category_chart()
+            
+            def update_data():
+                if not self.chart_is_current(chart, "spending_by_category", None):
+                    self.create_spending_by_category_chart(canvas=chart)
+                    
+        widget.update_data = update_data
     
         # Add the chart to the widget
         main_layout.addWidget(self.current_chart)
     
         return widget
+        
+    def create_month_controls(self, layout):
+        """
+        Adds the month selector used by the pie chart and budget comparison.
+        
+        Args:
+            layout: Layout to add the controls to.
+            
+        Returns:
+            tuple: (apply_button, (month_selector,)) with the Apply button and the
+                controls passed to the chart's update callback.
+        """
+        controls_widget = QGroupBox("Select Month")
+        controls_layout = QHBoxLayout(controls_widget)
+        
+        # Create a combo box with available months
+        self.month_selector = QComboBox()
+        self.populate_month_selector(self.month_selector)
+        controls_layout.addWidget(QLabel("Month:"))
+        controls_layout.addWidget(self.month_selector)
+        
+        # Apply button
+        apply_button = QPushButton("Apply")
+        controls_layout.addWidget(apply_button)
+        controls_layout.addStretch(1)
+        
+        layout.addWidget(controls_widget)
+        return apply_button, (self.month_selector,)
+        
+    def create_date_range_controls(self, layout):
+        """
+        Adds the date range selector used by the trend chart.
+        
+        Args:
+            layout: Layout to add the controls to.
+            
+        Returns:
+            tuple: (apply_button, (start_date_edit, end_date_edit)) with the Apply
+                button and the controls passed to the chart's update callback.
+        """
+        controls_widget = QGroupBox("Select Date Range")
+        controls_layout = QFormLayout(controls_widget)
+        
+        # Start date picker
+        today = QDate.currentDate()
+        self.start_date_edit = QDateEdit()
+        self.start_date_edit.setDate(today.addMonths(-6))  # Default to 6 months ago
+        self.start_date_edit.setCalendarPopup(True)
+        controls_layout.addRow("Start Date:", self.start_date_edit)
+        
+        # End date picker
+        self.end_date_edit = QDateEdit()
+        self.end_date_edit.setDate(today)  # Default to today
+        self.end_date_edit.setCalendarPopup(True)
+        controls_layout.addRow("End Date:", self.end_date_edit)
+        
+        # Apply button
+        button_layout = QHBoxLayout()
+        apply_button = QPushButton("Apply")
+        button_layout.addWidget(apply_button)
+        button_layout.addStretch(1)
+        controls_layout.addRow("", button_layout)
+        
+        layout.addWidget(controls_widget)
+        return apply_button, (self.start_date_edit, self.end_date_edit)
     
     def populate_month_selector(self, combo_box):
         """
@@ -427,28 +626,11 @@ class FinanceDataVisualizer:
         Args:
             combo_box: QComboBox to populate.
         """
-        # Get transaction date range from database
+        # Get the months covered by the transactions in the database
         try:
-            self.finance_tracker.db.cursor.execute("SELECT MIN(date), MAX(date) FROM transactions")
-            date_range = self.finance_tracker.db.cursor.fetchone()
+            months = self.get_available_months()
             
-            if date_range and date_range[0] and date_range[1]:
-                min_date = datetime.strptime(date_range[0], "%Y-%m-%d")
-                max_date = datetime.strptime(date_range[1], "%Y-%m-%d")
-                
-                # Generate a list of months between min and max dates
-                current_date = min_date.replace(day=1)
-                end_date = max_date.replace(day=1)
-                
-                months = []
-                while current_date <= end_date:
-                    months.append((current_date.strftime("%Y-%m"), current_date.strftime("%B %Y")))
-                    # Move to next month
-                    if current_date.month == 12:
-                        current_date = current_date.replace(year=current_date.year + 1, month=1)
-                    else:
-                        current_date = current_date.replace(month=current_date.month + 1)
-                
+            if months:
                 # Add months to combo box (most recent first)
                 for year_month, display_name in reversed(months):
                     combo_box.addItem(display_name, year_month)
@@ -469,75 +651,116 @@ class FinanceDataVisualizer:
             current_date = datetime.now()
             combo_box.addItem(current_date.strftime("%B %Y"), current_date.strftime("%Y-%m"))
     
-    def update_spending_chart(self, old_chart_widget, layout):
+    def refresh_month_selector(self, combo_box):
         """
-        Updates the spending by category chart based on selected month.
+        Repopulates a month combo box with the current months, keeping the
+        selected month if it is still available.
         
         Args:
-            old_chart_widget: Current chart widget to replace.
-            layout: Layout containing the chart widget.
+            combo_box: QComboBox to repopulate.
         """
-        # Get selected month
-        selected_month = self.month_selector.currentData()
+        selected_month = combo_box.currentData()
         
-        # Create new chart
-        new_chart = self.create_spending_by_category_chart(selected_month)
+        combo_box.blockSignals(True)
+        combo_box.clear()
+        self.populate_month_selector(combo_box)
+        index = combo_box.findData(selected_month)
+        if index >= 0:
+            combo_box.setCurrentIndex(index)
+        combo_box.blockSignals(False)
         
-        # Remove old chart
-        layout.removeWidget(old_chart_widget)
-        old_chart_widget.setParent(None)
+    def get_available_months(self):
+        """
+        Gets the months covered by the transactions in the database.
         
-        # Add new chart to layout at same position (should be index 1)
-        layout.addWidget(new_chart)
+        Returns:
+            tuple: (year_month, display_name) tuples, oldest month first.
+        """
+        db = self.finance_tracker.db
         
-        # Store reference to the new chart for future updates
-        self.current_chart = new_chart
-    
-    def update_budget_chart(self, old_chart_widget, layout):
+        # Reuse the cached list until the database file changes
+        if os.path.isfile(db.db_file):
+            return cached_months(os.path.abspath(db.db_file), database_mtime(db.db_file))
+            
+        # In-memory databases can't be keyed on a file, so query them directly
+        db.cursor.execute("SELECT MIN(date), MAX(date) FROM transactions")
+        return months_in_range(db.cursor.fetchone())
+        
+    def chart_is_current(self, chart, *selection):
         """
-        Updates the budget comparison chart based on selected month.
+        Checks whether a chart already shows the given selection of the current data.
+        
+        Matplotlib has no cheap partial replot, so pressing Apply again without
+        changing the selection or the data skips the redraw entirely.
         
         Args:
-            old_chart_widget: Current chart widget to replace.
-            layout: Layout containing the chart widget.
+            chart: Chart canvas to check.
+            *selection: Values selected in the chart's controls.
+            
+        Returns:
+            bool: True if the chart is up to date, False if it has to be redrawn.
         """
-        # Get selected month
-        selected_month = self.month_selector.currentData()
-        
-        # Create new chart
-        new_chart = self.create_budget_comparison_chart(selected_month)
+        version = self.finance_tracker.db.get_data_version()
+        if version is None:
+            return False
+            
+        key = (selection, version)
+        if getattr(chart, 'chart_key', None) == key:
+            return True
+            
+        chart.chart_key = key
+        return False
         
-        # Remove old chart
-        layout.removeWidget(old_chart_widget)
-        old_chart_widget.setParent(None)
+    def update_spending_chart(self, chart, month_selector=None):
+        """
+        Updates the spending by category chart based on selected month.
         
-        # Add new chart to layout at same position (should be index 1)
-        layout.addWidget(new_chart)
+        Args:
+            chart: Current chart canvas, redrawn in place.
+            month_selector: Month combo box of the chart's widget. Defaults to the
+                most recently created one.
+        """
+        # Get selected month
+        selected_month = (month_selector or self.month_selector).currentData()
+        if self.chart_is_current(chart, "spending_by_category", selected_month):
+            return
+            
+        # Redraw the chart on its existing canvas
+        self.create_spending_by_category_chart(selected_month, chart)
+    
+    def update_budget_chart(self, chart, month_selector=None):
+        """
+        Updates the budget comparison chart based on selected month.
         
-        # Store reference to the new chart for future updates
-        self.current_chart = new_chart
+        Args:
+            chart: Current chart canvas, redrawn in place.
+            month_selector: Month combo box of the chart's widget. Defaults to the
+                most recently created one.
+        """
+        # Get selected month
+        selected_month = (month_selector or self.month_selector).currentData()
+        if self.chart_is_current(chart, "budget_comparison", selected_month):
+            return
+            
+        # Redraw the chart on its existing canvas
+        self.create_budget_comparison_chart(selected_month, chart)
     
-    def update_trend_chart(self, old_chart_widget, layout):
+    def update_trend_chart(self, chart, start_date_edit=None, end_date_edit=None):
         """
         Updates the monthly trend chart based on selected date range.
         
         Args:
-            old_chart_widget: Current chart widget to replace.
-            layout: Layout containing the chart widget.
+            chart: Current chart canvas, redrawn in place.
+            start_date_edit: Start date picker of the chart's widget. Defaults to
+                the most recently created one.
+            end_date_edit: End date picker of the chart's widget. Defaults to the
+                most recently created one.
         """
         # Get selected date range
-        start_date = self.start_date_edit.date().toString("yyyy-MM-dd")
-        end_date = self.end_date_edit.date().toString("yyyy-MM-dd")
-        
-        # Create new chart
-        new_chart = self.create_monthly_trend_chart(start_date, end_date)
-        
-        # Remove old chart
-        layout.removeWidget(old_chart_widget)
-        old_chart_widget.setParent(None)
-        
-        # Add new chart to layout at same position (should be index 1)
-        layout.addWidget(new_chart)
-        
-        # Store reference to the new chart for future updates
-        self.current_chart = new_chart
\ No newline at end of file
+        start_date = (start_date_edit or self.start_date_edit).date().toString(Qt.ISODate)
+        end_date = (end_date_edit or self.end_date_edit).date().toString(Qt.ISODate)
+        if self.chart_is_current(chart, "monthly_trend", start_date, end_date):
+            return
+            
+        # Redraw the chart on its existing canvas
+        self.create_monthly_trend_chart(start_date, end_date, chart)
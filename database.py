@@ -1,408 +1,1253 @@
-#Authors: Adnan Syed, Dhruvkumar Satishbhai Ahir, Kartik Rajeev Patil
-#Date: April 11, 2025
-
-#Database Module for Personal Finance Tracker and Advisor.
-
-#This module handles all database operations using SQLite3.
-#It provides methods to create tables, insert data, and query data.
-
-
-import sqlite3
-import os
-import csv
-from datetime import datetime
-
-class Database:
-    """
-    Database class that handles all SQLite3 operations for the finance tracker app.
-    
-    This class provides methods for:
-    - Creating and connecting to a database
-    - Creating tables for transactions and categories
-    - Inserting, updating, deleting and querying data
-    - Importing data from CSV files
-    """
-    
-    def __init__(self, db_file="finance_tracker.db"):
-        """
-        Initialize the database connection.
-        
-        Args:
-            db_file (str): Name of the database file. Defaults to "finance_tracker.db".
-        """
-        self.db_file = db_file
-        self.conn = None
-        self.cursor = None
-        
-    def connect(self):
-        """
-        Connect to the database and create a cursor.
-        
-        Returns:
-            bool: True if connection was successful, False otherwise.
-        """
-        try:
-            self.conn = sqlite3.connect(self.db_file)
-            self.cursor = self.conn.cursor()
-            return True
-        except sqlite3.Error as e:
-            print(f"Database connection error: {e}!")
-            return False
-            
-    def close(self):
-        """
-        Closes the database connection.
-        """
-        if self.conn:
-            self.conn.close()
-            
-    def create_tables(self):
-        """
-        Creates the necessary tables if they don't already exist in the database.
-        
-        Creates:
-        - transactions: Stores transaction data
-        - categories: Stores budget categories
-        
-        Returns:
-            bool: True if tables were created successfully, False otherwise.
-        """
-        try:
-            #Creates a table for categories.
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS categories (
-                category_id INTEGER PRIMARY KEY,
-                category_name TEXT NOT NULL UNIQUE,
-                monthly_budget REAL NOT NULL,
-                priority_level TEXT NOT NULL,
-                icon TEXT
-            )
-            ''')
-            
-            #Creates a table for transactions.
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS transactions (
-                transaction_id INTEGER PRIMARY KEY,
-                date TEXT NOT NULL,
-                amount REAL NOT NULL,
-                category TEXT NOT NULL,
-                description TEXT,
-                account_type TEXT,
-                payment_method TEXT,
-                FOREIGN KEY (category) REFERENCES categories(category_name)
-            )
-            ''')
-            
-            self.conn.commit()
-            return True
-        except sqlite3.Error as e:
-            print(f"Error creating tables: {e}!")
-            return False
-            
-    def import_categories_from_csv(self, csv_file):
-        """
-        Imports the categories from a CSV file.
-        
-        Args:
-            csv_file (str): Path to the CSV file.
-            
-        Returns:
-            int: Number of categories imported.
-        """
-        count = 0
-        
-        try:
-            if not os.path.exists(csv_file):
-                print(f"File not found: {csv_file}!")
-                return 0
-                
-            with open(csv_file, 'r') as file:
-                csv_reader = csv.DictReader(file)
-                
-                for row in csv_reader:
-                    try:
-                        self.cursor.execute('''
-                        INSERT OR REPLACE INTO categories
-                        (category_id, category_name, monthly_budget, priority_level, icon)
-                        VALUES (?, ?, ?, ?, ?)
-                        ''', (
-                            int(row['category_id']),
-                            row['category_name'],
-                            float(row['monthly_budget']),
-                            row['priority_level'],
-                            row['icon']
-                        ))
-                        count += 1
-                    except (KeyError, ValueError) as e:
-                        print(f"Error processing row {row}: {e}!")
-                
-                self.conn.commit()
-                return count
-        except Exception as e:
-            print(f"Error importing categories: {e}!")
-            return 0
-            
-    def import_transactions_from_csv(self, csv_file):
-        """
-        Imports the transactions from a CSV file.
-        
-        Args:
-            csv_file (str): Path to the CSV file.
-            
-        Returns:
-            int: Number of transactions imported.
-        """
-        count = 0
-        
-        try:
-            if not os.path.exists(csv_file):
-                print(f"File not found: {csv_file}")
-                return 0
-                
-            with open(csv_file, 'r') as file:
-                csv_reader = csv.DictReader(file)
-                
-                for row in csv_reader:
-                    try:
-                        self.cursor.execute('''
-                        INSERT OR REPLACE INTO transactions
-                        (transaction_id, date, amount, category, description, account_type, payment_method)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            int(row['transaction_id']),
-                            row['date'],
-                            float(row['amount']),
-                            row['category'],
-                            row['description'],
-                            row['account_type'],
-                            row['payment_method']
-                        ))
-                        count += 1
-                    except (KeyError, ValueError) as e:
-                        print(f"Error processing row {row}: {e}")
-                
-                self.conn.commit()
-                return count
-        except Exception as e:
-            print(f"Error importing transactions: {e}!")
-            return 0
-    
-    def get_all_categories(self):
-        """
-        Gets all the categories from the database.
-        
-        Returns:
-            list: List of tuples containing category data.
-        """
-        try:
-            self.cursor.execute("SELECT * FROM categories ORDER BY category_name")
-            return self.cursor.fetchall()
-        except sqlite3.Error as e:
-            print(f"Error fetching categories: {e}!")
-            return []
-            
-    def get_all_transactions(self, limit=100):
-        """
-        Gets all the transactions from the database with an optional limit.
-        
-        Args:
-            limit (int): Maximum number of transactions to return. Defaults to 100.
-            
-        Returns:
-            list: List of tuples containing transaction data.
-        """
-        try:
-            self.cursor.execute(f"SELECT * FROM transactions ORDER BY date DESC LIMIT {limit}")
-            return self.cursor.fetchall()
-        except sqlite3.Error as e:
-            print(f"Error fetching transactions: {e}!")
-            return []
-            
-    def get_transactions_by_category(self, category):
-        """
-        Gets the transactions for a specific category.
-        
-        Args:
-            category (str): Category name.
-            
-        Returns:
-            list: List of tuples containing transaction data.
-        """
-        try:
-            self.cursor.execute("SELECT * FROM transactions WHERE category = ? ORDER BY date DESC", (category,))
-            return self.cursor.fetchall()
-        except sqlite3.Error as e:
-            print(f"Error fetching transactions by category: {e}!")
-            return []
-            
-    def get_spending_by_category(self, start_date=None, end_date=None):
-        """
-        Gets the total spending amount by category within an optional date range.
-        
-        Args:
-            start_date (str, optional): Start date in YYYY-MM-DD format.
-            end_date (str, optional): End date in YYYY-MM-DD format.
-            
-        Returns:
-            list: List of tuples containing (category, total_amount).
-        """
-        try:
-            query = "SELECT category, SUM(amount) FROM transactions"
-            
-            params = []
-            if start_date or end_date:
-                query += " WHERE"
-                
-                if start_date:
-                    query += " date >= ?"
-                    params.append(start_date)
-                    
-                if end_date:
-                    if start_date:
-                        query += " AND"
-                    query += " date <= ?"
-                    params.append(end_date)
-                    
-            query += " GROUP BY category ORDER BY SUM(amount) DESC"
-            
-            self.cursor.execute(query, params)
-            return self.cursor.fetchall()
-        except sqlite3.Error as e:
-            print(f"Error fetching spending by category: {e}!")
-            return []
-            
-    def add_transaction(self, date, amount, category, description, account_type, payment_method):
-        """
-        Adds a new transaction to the database.
-        
-        Args:
-            date (str): Transaction date in YYYY-MM-DD format
-            amount (float): Transaction amount
-            category (str): Transaction category
-            description (str): Transaction description
-            account_type (str): Account type
-            payment_method (str): Payment method
-            
-        Returns:
-            int: The ID of the newly inserted transaction, or -1 if failed.
-        """
-        try:
-            #Validates the date
-            try:
-                datetime.strptime(date, "%Y-%m-%d")
-            except ValueError:
-                print("Invalid date format! Please use YYYY-MM-DD format!")
-                return -1
-                
-            #Checks if the category exists
-            self.cursor.execute("SELECT category_name FROM categories WHERE category_name = ?", (category,))
-            if not self.cursor.fetchone():
-                print(f"Category '{category}' does not exist in the database!")
-                return -1
-                
-            self.cursor.execute('''
-            INSERT INTO transactions
-            (date, amount, category, description, account_type, payment_method)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ''', (date, amount, category, description, account_type, payment_method))
-            
-            self.conn.commit()
-            return self.cursor.lastrowid
-        except sqlite3.Error as e:
-            print(f"Error adding transaction: {e}!")
-            return -1
-            
-    def get_category_budget(self, category):
-        """
-        Gets the monthly budget for a category.
-        
-        Args:
-            category (str): Category name.
-            
-        Returns:
-            float: Monthly budget amount, or 0 if category not found.
-        """
-        try:
-            self.cursor.execute("SELECT monthly_budget FROM categories WHERE category_name = ?", (category,))
-            result = self.cursor.fetchone()
-            return result[0] if result else 0
-        except sqlite3.Error as e:
-            print(f"Error fetching category budget: {e}!")
-            return 0
-            
-    def delete_transaction(self, transaction_id):
-        """
-        Deletes a transaction from the database.
-        
-        Args:
-            transaction_id (int): ID of the transaction to delete.
-            
-        Returns:
-            bool: True if transaction was deleted successfully, False otherwise.
-        """
-        try:
-            self.cursor.execute("DELETE FROM transactions WHERE transaction_id = ?", (transaction_id,))
-            self.conn.commit()
-            return self.cursor.rowcount > 0
-        except sqlite3.Error as e:
-            print(f"Error deleting transaction: {e}!")
-            return False
-            
-    def update_transaction(self, transaction_id, date, amount, category, description, account_type, payment_method):
-        """
-        Updates an existing transaction in the database.
-        
-        Args:
-            transaction_id (int): ID of the transaction to update.
-            date (str): Updated transaction date in YYYY-MM-DD format.
-            amount (float): Updated transaction amount.
-            category (str): Updated transaction category.
-            description (str): Updated transaction description.
-            account_type (str): Updated account type.
-            payment_method (str): Updated payment method.
-            
-        Returns:
-            bool: True if transaction was updated successfully, False otherwise.
-        """
-        try:
-            # Validate date
-            try:
-                datetime.strptime(date, "%Y-%m-%d")
-            except ValueError:
-                print("Invalid date format! Please use YYYY-MM-DD format!")
-                return False
-                
-            # Check if category exists
-            self.cursor.execute("SELECT category_name FROM categories WHERE category_name = ?", (category,))
-            if not self.cursor.fetchone():
-                print(f"Category '{category}' does not exist in the database!")
-                return False
-                
-            self.cursor.execute('''
-            UPDATE transactions
-            SET date = ?, amount = ?, category = ?, description = ?, account_type = ?, payment_method = ?
-            WHERE transaction_id = ?
-            ''', (date, amount, category, description, account_type, payment_method, transaction_id))
-            
-            self.conn.commit()
-            return self.cursor.rowcount > 0
-        except sqlite3.Error as e:
-            print(f"Error updating transaction: {e}!")
-            return False
-            
-    def get_transaction(self, transaction_id):
-        """
-        Gets a specific transaction by its ID.
-        
-        Args:
-            transaction_id (int): ID of the transaction to retrieve.
-            
-        Returns:
-            tuple: Transaction data, or None if not found.
-        """
-        try:
-            self.cursor.execute("SELECT * FROM transactions WHERE transaction_id = ?", (transaction_id,))
-            return self.cursor.fetchone()
-        except sqlite3.Error as e:
-            print(f"Error fetching transaction: {e}!")
+#Authors: Adnan Syed, Dhruvkumar Satishbhai Ahir, Kartik Rajeev Patil
+#Date: April 11, 2025
+
+#Database Module for Personal Finance Tracker and Advisor.
+
+#This module handles all database operations using SQLite3.
+#It provides methods to create tables, insert data, and query data.
+
+
+import sqlite3
+import atexit
+import os
+import csv
+import json
+import calendar
+import queue
+import re
+from contextlib import contextmanager
+from itertools import chain, islice
+from operator import itemgetter
+
+# Number of CSV rows inserted with each executemany call
+IMPORT_BATCH_SIZE = 10000
+
+# Size of the read buffer used for CSV imports (1 MB). csv.reader needs
+# decoded text, so a memory-mapped file would still be copied and decoded;
+# a large buffered read is as fast and doesn't hold the whole file in memory.
+READ_BUFFER_SIZE = 1 << 20
+
+# Number of rows checked in Python before a CSV file is imported as raw strings
+VALIDATION_SAMPLE_SIZE = 10
+
+# Columns of a transaction row, in the order they are inserted
+TRANSACTION_COLUMNS = ('transaction_id', 'date', 'amount', 'category',
+                       'description', 'account_type', 'payment_method')
+
+# Number of compiled statements sqlite3 keeps per connection
+CACHED_STATEMENTS = 256
+
+# Number of extra connections kept open for read queries
+READER_POOL_SIZE = 4
+
+# Turns a YYYY-MM-DD date into the number of days since 1970-01-01. Dates are
+# compared and indexed as these integers through the date_i column.
+DAY_SQL = "(CAST(strftime('%s', {}) AS INTEGER) / 86400)"
+
+# Stored columns of a transaction, leaving out the generated date_i
+TXN_COLUMNS = "transaction_id, date, amount, category, description, account_type, payment_method"
+
+# Whether SQLite can return the written rows from INSERT/UPDATE/DELETE (3.35+)
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# SQL of the frequently run statements. Every call passes the same text, so
+# sqlite3 reuses the statement it compiled the first time.
+SQL_INSERT_TXN = '''
+INSERT INTO transactions
+(date, amount, category, description, account_type, payment_method)
+VALUES (?, ?, ?, ?, ?, ?)
+'''
+# Rows whose transaction_id already exists are updated in place rather than
+# replaced, so the update trigger moves their spending in category_month_totals
+SQL_UPSERT_TXN_SET = '''
+ON CONFLICT (transaction_id) DO UPDATE SET
+    date = excluded.date, amount = excluded.amount, category = excluded.category,
+    description = excluded.description, account_type = excluded.account_type,
+    payment_method = excluded.payment_method
+'''
+SQL_UPSERT_TXN_ROW = f'''
+INSERT INTO transactions
+({TXN_COLUMNS})
+VALUES (?, ?, ?, ?, ?, ?, ?)
+{SQL_UPSERT_TXN_SET}
+'''
+SQL_INSERT_CATEGORY_ROW = '''
+INSERT INTO categories
+(category_id, category_name, monthly_budget, priority_level, icon)
+VALUES (?, ?, ?, ?, ?)
+'''
+SQL_REPLACE_CATEGORY_ROW = '''
+INSERT OR REPLACE INTO categories
+(category_id, category_name, monthly_budget, priority_level, icon)
+VALUES (?, ?, ?, ?, ?)
+'''
+SQL_INSERT_TXN_IF_CATEGORY = f'''
+INSERT INTO transactions
+(date, amount, category, description, account_type, payment_method)
+SELECT ?, ?, ?, ?, ?, ?
+WHERE EXISTS (SELECT 1 FROM categories WHERE category_name = ?)
+{"RETURNING transaction_id" if SUPPORTS_RETURNING else ""}
+'''
+SQL_UPDATE_TXN = f'''
+UPDATE transactions
+SET date = ?, amount = ?, category = ?, description = ?, account_type = ?, payment_method = ?
+WHERE transaction_id = ?
+{"RETURNING transaction_id" if SUPPORTS_RETURNING else ""}
+'''
+SQL_GET_TXN = f"SELECT {TXN_COLUMNS} FROM transactions WHERE transaction_id = ?"
+SQL_DEL_TXN = f"""
+DELETE FROM transactions WHERE transaction_id = ?
+{"RETURNING transaction_id" if SUPPORTS_RETURNING else ""}
+"""
+# Finds a row of the given IDs (a JSON array) whose amount SQLite kept as text
+SQL_FIND_UNCONVERTED_AMOUNT = '''
+SELECT 1 FROM transactions
+WHERE transaction_id IN (SELECT CAST(value AS INTEGER) FROM json_each(?))
+AND typeof(amount) NOT IN ('integer', 'real')
+LIMIT 1
+'''
+SQL_GET_BUDGET = "SELECT monthly_budget FROM categories WHERE category_name = ?"
+SQL_GET_TXN_BY_CAT = f"SELECT {TXN_COLUMNS} FROM transactions WHERE category = ? ORDER BY date_i DESC"
+SQL_GET_ALL_TXN = f"SELECT {TXN_COLUMNS} FROM transactions ORDER BY date_i DESC LIMIT ?"
+SQL_GET_ALL_CATEGORIES = "SELECT * FROM categories ORDER BY category_name"
+
+# Schema of the database, created in one transaction by create_tables().
+# - date_i holds the transaction date as a day number, computed from the text
+# - The indexes serve the date range and category queries
+# - category_month_totals is a rollup of the spending per category and month,
+#   filled from the existing transactions when it is first created. The
+#   triggers keep it in step with the transactions table, in whole cents so
+#   repeated additions and removals do not drift. Its month index covers the
+#   month range reads, so they never touch the table itself.
+# - meta holds application flags, such as whether the startup data files
+#   were already imported
+SQL_SCHEMA = f'''
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS categories (
+    category_id INTEGER PRIMARY KEY,
+    category_name TEXT NOT NULL UNIQUE,
+    monthly_budget REAL NOT NULL,
+    priority_level TEXT NOT NULL,
+    icon TEXT
+);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    transaction_id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    amount REAL NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT,
+    account_type TEXT,
+    payment_method TEXT,
+    date_i INTEGER GENERATED ALWAYS AS {DAY_SQL.format("date")} VIRTUAL,
+    FOREIGN KEY (category) REFERENCES categories(category_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_txn_date_i ON transactions (date_i DESC, category, amount);
+CREATE INDEX IF NOT EXISTS idx_txn_cat_date_i ON transactions (category, date_i DESC, amount);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS category_month_totals (
+    category TEXT NOT NULL,
+    month TEXT NOT NULL,
+    total_cents INTEGER NOT NULL,
+    PRIMARY KEY (category, month)
+);
+CREATE INDEX IF NOT EXISTS idx_month_totals_month ON category_month_totals (month, category, total_cents);
+
+INSERT INTO category_month_totals (category, month, total_cents)
+SELECT category, substr(date, 1, 7), SUM(CAST(ROUND(amount * 100) AS INTEGER))
+FROM transactions
+WHERE NOT EXISTS (SELECT 1 FROM category_month_totals)
+GROUP BY category, substr(date, 1, 7);
+
+CREATE TRIGGER IF NOT EXISTS trg_txn_insert_month_total
+AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO category_month_totals (category, month, total_cents)
+    VALUES (NEW.category, substr(NEW.date, 1, 7), CAST(ROUND(NEW.amount * 100) AS INTEGER))
+    ON CONFLICT (category, month) DO UPDATE SET total_cents = total_cents + excluded.total_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_txn_delete_month_total
+AFTER DELETE ON transactions
+BEGIN
+    UPDATE category_month_totals
+    SET total_cents = total_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER)
+    WHERE category = OLD.category AND month = substr(OLD.date, 1, 7);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_txn_update_month_total
+AFTER UPDATE OF date, amount, category ON transactions
+BEGIN
+    UPDATE category_month_totals
+    SET total_cents = total_cents - CAST(ROUND(OLD.amount * 100) AS INTEGER)
+    WHERE category = OLD.category AND month = substr(OLD.date, 1, 7);
+    INSERT INTO category_month_totals (category, month, total_cents)
+    VALUES (NEW.category, substr(NEW.date, 1, 7), CAST(ROUND(NEW.amount * 100) AS INTEGER))
+    ON CONFLICT (category, month) DO UPDATE SET total_cents = total_cents + excluded.total_cents;
+END;
+
+COMMIT;
+'''
+
+
+# Matches dates in YYYY-MM-DD format
+_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+
+
+def is_valid_date(date):
+    """
+    Checks whether a date is a real calendar date in YYYY-MM-DD format.
+    
+    Args:
+        date (str): Date to check.
+        
+    Returns:
+        bool: True if the date is valid, False otherwise.
+    """
+    match = _DATE_RE.match(date) if isinstance(date, str) else None
+    if not match:
+        return False
+    year, month, day = int(match[1]), int(match[2]), int(match[3])
+    return year >= 1 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]
+
+
+def shift_month(month, months):
+    """
+    Moves a month forwards or backwards by a number of months.
+    
+    Args:
+        month (str): Month in YYYY-MM format.
+        months (int): Number of months to move by, negative to move back.
+        
+    Returns:
+        str: Resulting month in YYYY-MM format.
+    """
+    year, month_index = divmod(int(month[:4]) * 12 + int(month[5:7]) - 1 + months, 12)
+    return f"{year:04d}-{month_index + 1:02d}"
+
+
+def full_months(start_date, end_date):
+    """
+    Gets the first and last month lying entirely inside a date range.
+    
+    Args:
+        start_date (str): Start date in YYYY-MM-DD format.
+        end_date (str): End date in YYYY-MM-DD format.
+        
+    Returns:
+        tuple: (first_month, last_month) in YYYY-MM format. first_month is after
+            last_month when the range does not cover a whole month.
+    """
+    first_month = start_date[:7]
+    if start_date[8:10] != "01":
+        first_month = shift_month(first_month, 1)
+        
+    last_month = end_date[:7]
+    if int(end_date[8:10]) != calendar.monthrange(int(end_date[:4]), int(end_date[5:7]))[1]:
+        last_month = shift_month(last_month, -1)
+        
+    return first_month, last_month
+
+def tune_connection(connection):
+    """
+    Applies the journal, cache and foreign key settings used by every connection.
+    
+    Args:
+        connection (sqlite3.Connection): Connection to configure.
+    """
+    #Tunes the connection for faster writes and a bigger page cache (64 MB)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    connection.execute("PRAGMA cache_size=-65536")
+    
+    #Makes SQLite enforce the category foreign key of the transactions
+    connection.execute("PRAGMA foreign_keys=ON")
+    
+
+class Database:
+    """
+    Database class that handles all SQLite3 operations for the finance tracker app.
+    
+    This class provides methods for:
+    - Creating and connecting to a database
+    - Creating tables for transactions and categories
+    - Inserting, updating, deleting and querying data
+    - Importing data from CSV files
+    """
+    
+    def __init__(self, db_file="finance_tracker.db"):
+        """
+        Initialize the database connection.
+        
+        Args:
+            db_file (str): Name of the database file. Defaults to "finance_tracker.db".
+        """
+        self.db_file = db_file
+        self.conn = None
+        self.cursor = None
+        self.readers = None
+        
+    def connect(self, readers=READER_POOL_SIZE):
+        """
+        Connect to the database and create a cursor.
+        
+        The connection uses write-ahead logging with synchronous=NORMAL, so
+        writes need far fewer fsyncs. WAL needs the database file to be on a
+        local file system, as its shared-memory index does not work over
+        network file systems.
+        
+        Writes go through this connection, while read queries are spread over
+        a pool of more connections that can run in parallel and keep their
+        own page caches. Instances used from a single worker thread can pass
+        readers=0 to read through the main connection instead. In-memory
+        databases can't be shared between connections, so they are always
+        read through the main connection.
+        
+        The connection is kept open until close() is called, so the page
+        cache stays warm between queries. An application should reuse one
+        Database for its whole life rather than reconnecting; calling connect()
+        again on a connected instance does nothing. The connection is also
+        closed at interpreter exit, which checkpoints the WAL.
+        
+        Args:
+            readers (int): Number of reader connections to open. Defaults to
+                READER_POOL_SIZE.
+        
+        Returns:
+            bool: True if connection was successful, False otherwise.
+        """
+        if self.conn is not None:
+            return True
+            
+        try:
+            self.conn = sqlite3.connect(self.db_file, cached_statements=CACHED_STATEMENTS)
+            self.cursor = self.conn.cursor()
+            tune_connection(self.conn)
+            
+            #Opens the pool of reader connections
+            if readers > 0 and self.db_file not in (":memory:", ""):
+                self.readers = queue.Queue()
+                for _ in range(readers):
+                    reader = sqlite3.connect(self.db_file, check_same_thread=False,
+                                             cached_statements=CACHED_STATEMENTS)
+                    tune_connection(reader)
+                    self.readers.put(reader)
+                    
+            atexit.register(self.close)
+            return True
+        except sqlite3.Error as e:
+            print(f"Database connection error: {e}!")
+            return False
+            
+    def close(self):
+        """
+        Closes the database connection and the reader connections.
+        """
+        atexit.unregister(self.close)
+        if self.readers:
+            while not self.readers.empty():
+                self.readers.get().close()
+            self.readers = None
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+            self.cursor = None
+            
+    def __enter__(self):
+        """
+        Connects to the database when entering a with block.
+        
+        Returns:
+            Database: This database instance.
+        """
+        self.connect()
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the database when leaving a with block.
+        """
+        self.close()
+            
+    @contextmanager
+    def reader(self):
+        """
+        Lends a cursor for a read query from the pool of reader connections.
+        
+        Uses the main connection instead when there is no pool, or when it has
+        uncommitted changes that the reader connections could not see yet.
+        
+        Yields:
+            sqlite3.Cursor: Cursor to run the read query with.
+        """
+        if self.readers is None or self.conn.in_transaction:
+            yield self.conn.cursor()
+            return
+            
+        connection = self.readers.get()
+        try:
+            yield connection.cursor()
+        finally:
+            self.readers.put(connection)
+            
+    def create_tables(self):
+        """
+        Creates the necessary tables if they don't already exist in the database.
+        
+        Creates:
+        - transactions: Stores transaction data
+        - categories: Stores budget categories
+        - date_i: Generated column holding the transaction date as a day number
+        - Indexes on the transaction date and category
+        - category_month_totals: Stores the spending per category and month,
+          kept up to date by triggers on transactions
+        
+        Returns:
+            bool: True if tables were created successfully, False otherwise.
+        """
+        try:
+            #Adds the date_i column to a transactions table created without it
+            self.cursor.execute("PRAGMA table_xinfo(transactions)")
+            columns = [column[1] for column in self.cursor.fetchall()]
+            if columns and "date_i" not in columns:
+                self.cursor.execute(f'''
+                ALTER TABLE transactions
+                ADD COLUMN date_i INTEGER GENERATED ALWAYS AS {DAY_SQL.format("date")} VIRTUAL
+                ''')
+                
+            #Creates all the tables, indexes and triggers in one script
+            self.cursor.executescript(SQL_SCHEMA)
+            return True
+        except sqlite3.Error as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            print(f"Error creating tables: {e}!")
+            return False
+            
+    def import_categories_from_csv(self, csv_file):
+        """
+        Imports the categories from a CSV file.
+        
+        A row whose ID or name exists replaces that category. Transactions
+        refer to their category by name, so a row that would rename a category
+        still used by transactions is skipped and reported, like a malformed
+        row, while the other rows are imported.
+        
+        Args:
+            csv_file (str): Path to the CSV file.
+            
+        Returns:
+            int: Number of categories imported.
+        """
+        count = 0
+        
+        try:
+            if not os.path.exists(csv_file):
+                print(f"File not found: {csv_file}!")
+                return 0
+                
+            with open(csv_file, 'r', newline='', buffering=READ_BUFFER_SIZE) as file:
+                #Reads plain row lists and looks the columns up by position
+                csv_reader = csv.reader(file)
+                idx = {name: i for i, name in enumerate(next(csv_reader, []))}
+                batch = []
+                
+                #Runs the whole import as a single write transaction
+                self.begin_write()
+                
+                for row in csv_reader:
+                    try:
+                        batch.append((
+                            int(row[idx['category_id']]),
+                            row[idx['category_name']],
+                            float(row[idx['monthly_budget']]),
+                            row[idx['priority_level']],
+                            row[idx['icon']]
+                        ))
+                    except (KeyError, IndexError, ValueError) as e:
+                        print(f"Error processing row {row}: {e}!")
+                        continue
+                        
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        count += self.insert_category_rows(batch)
+                        batch.clear()
+                
+                #Inserts the rows left over after the last full batch
+                count += self.insert_category_rows(batch)
+                self.conn.commit()
+                return count
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error importing categories: {e}!")
+            return 0
+            
+    def import_transactions_from_csv(self, csv_file):
+        """
+        Imports the transactions from a CSV file.
+        
+        The fields are bound as the raw strings from the file and SQLite's
+        column affinity turns the IDs and amounts into numbers. If a sample of
+        the first rows doesn't parse, or a value is left that SQLite couldn't
+        convert, the file is imported again with the values parsed in Python,
+        reporting every malformed row.
+        
+        Args:
+            csv_file (str): Path to the CSV file.
+            
+        Returns:
+            int: Number of transactions imported.
+        """
+        try:
+            if not os.path.exists(csv_file):
+                print(f"File not found: {csv_file}")
+                return 0
+                
+            with open(csv_file, 'r', newline='', buffering=READ_BUFFER_SIZE) as file:
+                #Reads plain row lists and looks the columns up by position
+                csv_reader = csv.reader(file)
+                idx = {name: i for i, name in enumerate(next(csv_reader, []))}
+                
+                #Runs the whole import as a single write transaction
+                self.begin_write()
+                
+                count = -1
+                sample = list(islice(csv_reader, VALIDATION_SAMPLE_SIZE))
+                if self.sample_is_valid(sample, idx):
+                    count = self.load_raw_rows(chain(sample, csv_reader), idx)
+                    
+                if count < 0:
+                    #Parses every row in Python, reporting the malformed ones
+                    file.seek(0)
+                    csv_reader = csv.reader(file)
+                    next(csv_reader, None)
+                    count = self.insert_parsed_transaction_rows(csv_reader, idx)
+                    
+                self.conn.commit()
+                
+                #Refreshes the planner statistics after the bulk load
+                self.cursor.execute("ANALYZE")
+                return count
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error importing transactions: {e}!")
+            return 0
+            
+    def sample_is_valid(self, sample, idx):
+        """
+        Checks that the first rows of a transaction CSV file parse cleanly.
+        
+        Args:
+            sample (list): First rows of the file.
+            idx (dict): Mapping of column names to their positions.
+            
+        Returns:
+            bool: True if every row of the sample parses, False otherwise.
+        """
+        try:
+            last_position = max(idx[name] for name in TRANSACTION_COLUMNS)
+            for row in sample:
+                int(row[idx['transaction_id']])
+                float(row[idx['amount']])
+                if len(row) <= last_position:
+                    return False
+            return True
+        except (KeyError, IndexError, ValueError):
+            return False
+            
+    def load_raw_rows(self, csv_reader, idx):
+        """
+        Inserts transaction rows as raw strings, keeping them only if SQLite converted them.
+        
+        Args:
+            csv_reader: Iterator over the rows of the file.
+            idx (dict): Mapping of column names to their positions.
+            
+        Returns:
+            int: Number of rows inserted, or -1 if a row couldn't be stored as
+                is, in which case the rows inserted are undone.
+        """
+        self.cursor.execute("SAVEPOINT raw_import")
+        try:
+            count = self.insert_raw_transaction_rows(csv_reader, idx)
+            if count >= 0:
+                self.cursor.execute("RELEASE raw_import")
+                return count
+        except (KeyError, IndexError, sqlite3.IntegrityError, sqlite3.OperationalError):
+            pass
+            
+        self.cursor.execute("ROLLBACK TO raw_import")
+        self.cursor.execute("RELEASE raw_import")
+        return -1
+        
+    def insert_raw_transaction_rows(self, csv_reader, idx):
+        """
+        Inserts transaction rows as raw strings, leaving the conversion to SQLite.
+        
+        Args:
+            csv_reader: Iterator over the rows of the file.
+            idx (dict): Mapping of column names to their positions.
+            
+        Returns:
+            int: Number of rows inserted, or -1 if an amount of a batch was
+                not converted to a number.
+        """
+        count = 0
+        
+        #Picks the columns of each row with itemgetter and map, so a whole
+        #batch is collected without running Python code per row
+        pick_columns = itemgetter(*[idx[name] for name in TRANSACTION_COLUMNS])
+        while True:
+            batch = list(map(pick_columns, islice(csv_reader, IMPORT_BATCH_SIZE)))
+            if not batch:
+                return count
+            count += self.insert_transaction_rows(batch)
+            
+            #Checks that every amount of the batch was converted to a number
+            self.cursor.execute(SQL_FIND_UNCONVERTED_AMOUNT, (json.dumps([row[0] for row in batch]),))
+            if self.cursor.fetchone() is not None:
+                return -1
+            
+    def insert_parsed_transaction_rows(self, csv_reader, idx):
+        """
+        Parses transaction rows in Python and inserts the valid ones.
+        
+        Rows that don't parse or whose category doesn't exist are reported
+        and skipped.
+        
+        Args:
+            csv_reader: Iterator over the rows of the file.
+            idx (dict): Mapping of column names to their positions.
+            
+        Returns:
+            int: Number of rows inserted.
+        """
+        count = 0
+        batch = []
+        
+        #Rows of unknown categories would fail the foreign key, so skip them
+        self.cursor.execute("SELECT category_name FROM categories")
+        categories = {category for category, in self.cursor.fetchall()}
+        
+        for row in csv_reader:
+            try:
+                transaction = (
+                    int(row[idx['transaction_id']]),
+                    row[idx['date']],
+                    float(row[idx['amount']]),
+                    row[idx['category']],
+                    row[idx['description']],
+                    row[idx['account_type']],
+                    row[idx['payment_method']]
+                )
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"Error processing row {row}: {e}")
+                continue
+                
+            if transaction[3] not in categories:
+                print(f"Error processing row {row}: category '{transaction[3]}' does not exist")
+                continue
+            batch.append(transaction)
+                
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                count += self.insert_transaction_rows(batch)
+                batch.clear()
+        
+        #Inserts the rows left over after the last full batch
+        count += self.insert_transaction_rows(batch)
+        return count
+        
+    def begin_write(self):
+        """
+        Starts a write transaction, taking the write lock right away.
+        
+        Does nothing if a transaction is already open on the connection.
+        """
+        if not self.conn.in_transaction:
+            self.cursor.execute("BEGIN IMMEDIATE")
+            
+    def insert_category_rows(self, rows):
+        """
+        Inserts or replaces a batch of parsed category rows.
+        
+        If a row breaks a constraint, such as renaming a category that
+        transactions still use, the batch is undone and inserted again row by
+        row, skipping the rows that fail.
+        
+        Args:
+            rows (list): List of (category_id, category_name, monthly_budget,
+                priority_level, icon) tuples.
+            
+        Returns:
+            int: Number of rows inserted.
+        """
+        self.cursor.execute("SAVEPOINT category_rows")
+        try:
+            self.cursor.executemany(SQL_REPLACE_CATEGORY_ROW, rows)
+            self.cursor.execute("RELEASE category_rows")
+            return len(rows)
+        except sqlite3.IntegrityError:
+            self.cursor.execute("ROLLBACK TO category_rows")
+            self.cursor.execute("RELEASE category_rows")
+            
+        #A failing statement is undone on its own, leaving the earlier rows
+        count = 0
+        for row in rows:
+            try:
+                self.cursor.execute(SQL_REPLACE_CATEGORY_ROW, row)
+                count += 1
+            except sqlite3.IntegrityError as e:
+                print(f"Error processing row {row}: {e}!")
+        return count
+        
+    def insert_transaction_rows(self, rows):
+        """
+        Inserts a batch of parsed transaction rows, updating those whose ID exists.
+        
+        Args:
+            rows (list): List of (transaction_id, date, amount, category,
+                description, account_type, payment_method) tuples.
+            
+        Returns:
+            int: Number of rows in the batch.
+        """
+        self.cursor.executemany(SQL_UPSERT_TXN_ROW, rows)
+        return len(rows)
+    
+    def written_id(self, transaction_id=None):
+        """
+        Gets the ID of the transaction written by the last statement.
+        
+        Reads the row returned by the statement's RETURNING clause, or falls
+        back to the row count on SQLite versions without it.
+        
+        Args:
+            transaction_id (int, optional): ID the statement was meant to
+                update or delete. Leave out for inserts, whose ID is new.
+            
+        Returns:
+            int: ID of the written transaction, or None if no row was written.
+        """
+        if SUPPORTS_RETURNING:
+            rows = self.cursor.fetchall()
+            return rows[0][0] if rows else None
+        if self.cursor.rowcount > 0:
+            return self.cursor.lastrowid if transaction_id is None else transaction_id
+        return None
+        
+    def get_meta(self, key):
+        """
+        Gets an application flag from the meta table.
+        
+        Args:
+            key (str): Name of the flag.
+            
+        Returns:
+            str: Value of the flag, or None if it is not set or failed.
+        """
+        try:
+            self.cursor.execute("SELECT value FROM meta WHERE key = ?", (key,))
+            row = self.cursor.fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            print(f"Error fetching meta value: {e}!")
+            return None
+            
+    def set_meta(self, key, value):
+        """
+        Sets an application flag in the meta table.
+        
+        Args:
+            key (str): Name of the flag.
+            value (str): Value of the flag.
+            
+        Returns:
+            bool: True if the flag was saved, False otherwise.
+        """
+        try:
+            self.cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving meta value: {e}!")
+            return False
+            
+    def get_data_version(self):
+        """
+        Gets a value that changes whenever the database contents change.
+        
+        Combines the number of rows changed through this connection with
+        SQLite's data_version, which changes when another connection commits.
+        
+        Returns:
+            tuple: Version of the database contents, or None if failed.
+        """
+        try:
+            self.cursor.execute("PRAGMA data_version")
+            return (self.conn.total_changes, self.cursor.fetchone()[0])
+        except sqlite3.Error as e:
+            print(f"Error fetching data version: {e}!")
+            return None
+            
+    def get_all_categories(self):
+        """
+        Gets all the categories from the database.
+        
+        Returns:
+            list: List of tuples containing category data.
+        """
+        try:
+            with self.reader() as cursor:
+                cursor.execute(SQL_GET_ALL_CATEGORIES)
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching categories: {e}!")
+            return []
+            
+    def get_all_transactions(self, limit=100):
+        """
+        Gets all the transactions from the database with an optional limit.
+        
+        Args:
+            limit (int): Maximum number of transactions to return. Defaults to 100.
+            
+        Returns:
+            list: List of tuples containing transaction data.
+        """
+        try:
+            #Binds the limit so the same statement is reused for every limit
+            with self.reader() as cursor:
+                cursor.execute(SQL_GET_ALL_TXN, (int(limit),))
+                return cursor.fetchall()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Error fetching transactions: {e}!")
+            return []
+            
+    def get_transactions_by_category(self, category):
+        """
+        Gets the transactions for a specific category.
+        
+        Args:
+            category (str): Category name.
+            
+        Returns:
+            list: List of tuples containing transaction data.
+        """
+        try:
+            with self.reader() as cursor:
+                cursor.execute(SQL_GET_TXN_BY_CAT, (category,))
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching transactions by category: {e}!")
+            return []
+            
+    def spending_query(self, start_date=None, end_date=None, positive_only=False):
+        """
+        Builds the query of the total spending by category within an optional date range.
+        
+        Categories whose total is zero are left out, as category_month_totals
+        keeps a zero row for a month whose transactions were all removed. The
+        months lying entirely inside the range are read from
+        category_month_totals, so only the transactions of the partial months
+        at either end are summed.
+        
+        Args:
+            start_date (str, optional): Start date in YYYY-MM-DD format.
+            end_date (str, optional): End date in YYYY-MM-DD format.
+            positive_only (bool): Whether to also leave out categories whose
+                total is negative, such as those with only refunds.
+            
+        Returns:
+            tuple: (query, params) selecting (category, total_amount) rows.
+        """
+        first_month, last_month = full_months(start_date or "0000-01-01", end_date or "9999-12-31")
+        
+        day = DAY_SQL.format("?")
+        params = [first_month, last_month]
+        edges = []
+        if first_month > last_month:
+            #No whole month in the range, so all of it is summed row by row
+            edges.append(f"(date_i >= {day} AND date_i <= {day})")
+            params += [start_date or "0001-01-01", end_date or "9999-12-31"]
+        else:
+            if start_date:
+                edges.append(f"(date_i >= {day} AND date_i < {day})")
+                params += [start_date, first_month + "-01"]
+            if end_date:
+                edges.append(f"(date_i >= {day} AND date_i <= {day})")
+                params += [shift_month(last_month, 1) + "-01", end_date]
+                
+        query = '''
+        SELECT category, SUM(cents) / 100.0 AS spent FROM (
+            SELECT category, total_cents AS cents
+            FROM category_month_totals
+            WHERE month >= ? AND month <= ?
+        '''
+        if edges:
+            query += f'''
+            UNION ALL
+            SELECT category, CAST(ROUND(amount * 100) AS INTEGER)
+            FROM transactions
+            WHERE {" OR ".join(edges)}
+            '''
+            
+        # Leave out categories without any spending
+        query += f") GROUP BY category HAVING SUM(cents) {'>' if positive_only else '!='} 0"
+        return query, params
+        
+    def get_spending_by_category(self, start_date=None, end_date=None, positive_only=False):
+        """
+        Gets the total spending amount by category within an optional date range.
+        
+        Categories whose total is zero are left out.
+        
+        Args:
+            start_date (str, optional): Start date in YYYY-MM-DD format.
+            end_date (str, optional): End date in YYYY-MM-DD format.
+            positive_only (bool): Whether to only return categories whose total
+                is greater than zero.
+            
+        Returns:
+            list: List of tuples containing (category, total_amount).
+        """
+        try:
+            query, params = self.spending_query(start_date, end_date, positive_only)
+            with self.reader() as cursor:
+                cursor.execute(query + " ORDER BY SUM(cents) DESC", params)
+                return cursor.fetchall()
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error fetching spending by category: {e}!")
+            return []
+            
+    def get_budget_and_spent(self, start_date=None, end_date=None):
+        """
+        Gets the monthly budget and the spending of every category within an optional date range.
+        
+        Args:
+            start_date (str, optional): Start date in YYYY-MM-DD format.
+            end_date (str, optional): End date in YYYY-MM-DD format.
+            
+        Returns:
+            list: List of tuples containing (category, monthly_budget, spent_amount),
+                ordered by category name. Categories without spending have 0 spent.
+        """
+        try:
+            query, params = self.spending_query(start_date, end_date)
+            with self.reader() as cursor:
+                cursor.execute(f'''
+                SELECT c.category_name, c.monthly_budget, COALESCE(s.spent, 0)
+                FROM categories c
+                LEFT JOIN ({query}) s ON s.category = c.category_name
+                ORDER BY c.category_name
+                ''', params)
+                return cursor.fetchall()
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error fetching budgets and spending: {e}!")
+            return []
+            
+    def get_spending_by_month(self, year, month):
+        """
+        Gets the total spending amount by category for a single calendar month.
+        
+        The totals are read straight from category_month_totals by month key, so
+        no date range has to be built for the month. Categories whose total is
+        zero are left out.
+        
+        Args:
+            year (int): Year of the month.
+            month (int): Month number, 1 to 12.
+            
+        Returns:
+            list: List of tuples containing (category, total_amount).
+        """
+        try:
+            with self.reader() as cursor:
+                cursor.execute('''
+                SELECT category, total_cents / 100.0 FROM category_month_totals
+                WHERE month = ? AND total_cents != 0
+                ORDER BY total_cents DESC
+                ''', ("%04d-%02d" % (year, month),))
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching spending by month: {e}!")
+            return []
+            
+    def get_budget_comparison(self, start_date, end_date, cents=False):
+        """
+        Gets the budget and the spending of each category within a date range.
+        
+        Categories without a budget and without spending are left out. The
+        spending is summed in whole cents, so the totals carry no floating-point
+        rounding error.
+        
+        Args:
+            start_date (str): Start date in YYYY-MM-DD format.
+            end_date (str): End date in YYYY-MM-DD format.
+            cents (bool): Whether to return the amounts as integer cents instead
+                of dollars.
+            
+        Returns:
+            list: List of tuples containing (category, monthly_budget, spent_amount).
+        """
+        divisor = 1 if cents else 100.0
+        day = DAY_SQL.format("?")
+        
+        try:
+            with self.reader() as cursor:
+                cursor.execute(f'''
+                SELECT c.category_name,
+                       CAST(ROUND(c.monthly_budget * 100) AS INTEGER) / ?,
+                       COALESCE(s.spent_cents, 0) / ?
+                FROM categories c
+                LEFT JOIN (
+                    SELECT category, SUM(CAST(ROUND(amount * 100) AS INTEGER)) AS spent_cents
+                    FROM transactions
+                    WHERE date_i >= {day} AND date_i <= {day}
+                    GROUP BY category
+                ) s ON s.category = c.category_name
+                WHERE c.monthly_budget > 0 OR s.spent_cents > 0
+                ORDER BY c.category_name
+                ''', (divisor, divisor, start_date, end_date))
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching budget comparison: {e}!")
+            return []
+            
+    def get_over_budget(self, start_date=None, end_date=None, multiplier=1.0):
+        """
+        Gets the categories whose spending is over the budget within an optional date range.
+        
+        Args:
+            start_date (str, optional): Start date in YYYY-MM-DD format.
+            end_date (str, optional): End date in YYYY-MM-DD format.
+            multiplier (float): Number of monthly budgets the date range covers.
+            
+        Returns:
+            list: List of tuples containing (category, spent_amount, budget, percentage),
+                ordered by the percentage of the budget used in descending order.
+        """
+        day = DAY_SQL.format("?")
+        where = f"WHERE date_i >= {day} AND date_i <= {day}" if start_date or end_date else ""
+        params = [start_date or "0001-01-01", end_date or "9999-12-31"] if where else []
+        
+        try:
+            with self.reader() as cursor:
+                cursor.execute(f'''
+                SELECT c.category_name, s.spent, c.monthly_budget * ? AS budget,
+                       s.spent / (c.monthly_budget * ?) * 100 AS percentage
+                FROM categories c
+                JOIN (
+                    SELECT category, SUM(CAST(ROUND(amount * 100) AS INTEGER)) / 100.0 AS spent
+                    FROM transactions
+                    {where}
+                    GROUP BY category
+                ) s ON s.category = c.category_name
+                WHERE c.monthly_budget > 0 AND s.spent > c.monthly_budget * ?
+                ORDER BY percentage DESC
+                ''', [multiplier, multiplier] + params + [multiplier])
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching over budget categories: {e}!")
+            return []
+            
+    def get_monthly_totals(self, start_date, end_date):
+        """
+        Gets the total spending amount of each month within a date range.
+        
+        Args:
+            start_date (str): Start date in YYYY-MM-DD format.
+            end_date (str): End date in YYYY-MM-DD format.
+            
+        Returns:
+            dict: Dictionary mapping "YYYY-MM" months to their total amount.
+        """
+        day = DAY_SQL.format("?")
+        
+        try:
+            with self.reader() as cursor:
+                cursor.execute(f'''
+                SELECT strftime('%Y-%m', date_i * 86400, 'unixepoch') AS year_month, SUM(amount)
+                FROM transactions
+                WHERE date_i >= {day} AND date_i <= {day}
+                GROUP BY year_month
+                ''', (start_date, end_date))
+                return dict(cursor)
+        except sqlite3.Error as e:
+            print(f"Error fetching monthly totals: {e}!")
+            return {}
+            
+    def add_transaction(self, date, amount, category, description, account_type, payment_method):
+        """
+        Adds a new transaction to the database.
+        
+        Args:
+            date (str): Transaction date in YYYY-MM-DD format
+            amount (float): Transaction amount
+            category (str): Transaction category
+            description (str): Transaction description
+            account_type (str): Account type
+            payment_method (str): Payment method
+            
+        Returns:
+            int: The ID of the newly inserted transaction, or -1 if failed.
+        """
+        try:
+            #Validates the date
+            if not is_valid_date(date):
+                print("Invalid date format! Please use YYYY-MM-DD format!")
+                return -1
+                
+            #Inserts the transaction only if the category exists
+            self.cursor.execute(SQL_INSERT_TXN_IF_CATEGORY,
+                                (date, amount, category, description, account_type, payment_method, category))
+            
+            written = self.written_id()
+            
+            self.conn.commit()
+            if written is None:
+                print(f"Category '{category}' does not exist in the database!")
+                return -1
+            return written
+        except sqlite3.Error as e:
+            print(f"Error adding transaction: {e}!")
+            return -1
+            
+    def add_transactions(self, transactions, commit=True):
+        """
+        Adds several transactions to the database with a single executemany call.
+        
+        The rows are expected to be validated already (date format and existing
+        category), as done by the batch import dialog.
+        
+        Args:
+            transactions (list): List of (date, amount, category, description,
+                account_type, payment_method) tuples.
+            commit (bool): Whether to commit once the rows are inserted. Pass False
+                to insert several batches in the same SQL transaction.
+            
+        Returns:
+            int: Number of transactions inserted, or -1 if failed, in which case
+                none of the rows are kept.
+        """
+        try:
+            self.begin_write()
+            self.cursor.execute("SAVEPOINT add_transactions")
+            try:
+                self.cursor.executemany(SQL_INSERT_TXN, transactions)
+                count = max(self.cursor.rowcount, 0)
+            except sqlite3.Error:
+                self.cursor.execute("ROLLBACK TO add_transactions")
+                raise
+            finally:
+                self.cursor.execute("RELEASE add_transactions")
+                
+            if commit:
+                self.conn.commit()
+            return count
+        except sqlite3.Error as e:
+            if commit:
+                self.conn.rollback()
+            print(f"Error adding transactions: {e}!")
+            return -1
+            
+    def get_category_budget(self, category):
+        """
+        Gets the monthly budget for a category.
+        
+        Args:
+            category (str): Category name.
+            
+        Returns:
+            float: Monthly budget amount, or 0 if category not found.
+        """
+        try:
+            with self.reader() as cursor:
+                cursor.execute(SQL_GET_BUDGET, (category,))
+                result = cursor.fetchone()
+                return result[0] if result else 0
+        except sqlite3.Error as e:
+            print(f"Error fetching category budget: {e}!")
+            return 0
+            
+    def delete_transaction(self, transaction_id):
+        """
+        Deletes a transaction from the database.
+        
+        Args:
+            transaction_id (int): ID of the transaction to delete.
+            
+        Returns:
+            bool: True if transaction was deleted successfully, False otherwise.
+        """
+        try:
+            self.cursor.execute(SQL_DEL_TXN, (transaction_id,))
+            written = self.written_id(transaction_id)
+            self.conn.commit()
+            return written is not None
+        except sqlite3.Error as e:
+            print(f"Error deleting transaction: {e}!")
+            return False
+            
+    def update_transaction(self, transaction_id, date, amount, category, description, account_type, payment_method):
+        """
+        Updates an existing transaction in the database.
+        
+        Args:
+            transaction_id (int): ID of the transaction to update.
+            date (str): Updated transaction date in YYYY-MM-DD format.
+            amount (float): Updated transaction amount.
+            category (str): Updated transaction category.
+            description (str): Updated transaction description.
+            account_type (str): Updated account type.
+            payment_method (str): Updated payment method.
+            
+        Returns:
+            bool: True if transaction was updated successfully, False otherwise.
+        """
+        try:
+            # Validate date
+            if not is_valid_date(date):
+                print("Invalid date format! Please use YYYY-MM-DD format!")
+                return False
+                
+            # The foreign key rejects categories that don't exist
+            self.cursor.execute(SQL_UPDATE_TXN, (date, amount, category, description, account_type, payment_method, transaction_id))
+            written = self.written_id(transaction_id)
+            
+            self.conn.commit()
+            return written is not None
+        except sqlite3.IntegrityError as e:
+            self.conn.rollback()
+            if "FOREIGN KEY" in str(e):
+                print(f"Category '{category}' does not exist in the database!")
+            else:
+                print(f"Error updating transaction: {e}!")
+            return False
+        except sqlite3.Error as e:
+            print(f"Error updating transaction: {e}!")
+            return False
+            
+    def get_transaction(self, transaction_id):
+        """
+        Gets a specific transaction by its ID.
+        
+        Args:
+            transaction_id (int): ID of the transaction to retrieve.
+            
+        Returns:
+            tuple: Transaction data, or None if not found.
+        """
+        try:
+            with self.reader() as cursor:
+                cursor.execute(SQL_GET_TXN, (transaction_id,))
+                return cursor.fetchone()
+        except sqlite3.Error as e:
+            print(f"Error fetching transaction: {e}!")
             return None
\ No newline at end of file
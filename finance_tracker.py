@@ -1,389 +1,539 @@
-#Authors: Adnan Syed, Dhruvkumar Satishbhai Ahir, Kartik Rajeev Patil
-#Date: May 02, 2025
-
-#Finance Tracker Module for Personal Finance Tracker and Advisor.
-
-#This module handles the business logic for tracking finances
-#and provides methods for analyzing financial data.
-
-
-from datetime import datetime, timedelta
-import calendar
-
-class FinanceTracker:
-    """
-    Finance Tracker class that manages financial data and analysis.
-    
-    This class provides methods for:
-    - Adding and retrieving transactions
-    - Calculating spending by category
-    - Analyzing budget usage
-    - Generating basic financial insights
-    """
-    
-    def __init__(self, database):
-        """
-        Initializes the finance tracker with a database connection.
-        
-        Args:
-            database: Database instance for data storage and retrieval.
-        """
-        self.db = database
-        
-    def add_transaction(self, date, amount, category, description, account_type, payment_method):
-        """
-        Adds a new transaction.
-        
-        Args:
-            date (str): Transaction date in YYYY-MM-DD format.
-            amount (float): Transaction amount.
-            category (str): Transaction category.
-            description (str): Transaction description.
-            account_type (str): Account type.
-            payment_method (str): Payment method.
-            
-        Returns:
-            int: Transaction ID if successful, -1 otherwise.
-        """
-        return self.db.add_transaction(date, amount, category, description, account_type, payment_method)
-        
-    def get_recent_transactions(self, limit=10):
-        """
-        Gets the most recent transactions.
-        
-        Args:
-            limit (int): Maximum number of transactions to return.
-            
-        Returns:
-            list: List of transaction data.
-        """
-        return self.db.get_all_transactions(limit)
-        
-    def get_transactions_by_category(self, category):
-        """
-        Gets the transactions for a specific category.
-        
-        Args:
-            category (str): Category name.
-            
-        Returns:
-            list: List of transaction data.
-        """
-        return self.db.get_transactions_by_category(category)
-        
-    def get_all_categories(self):
-        """
-        Gets all the available categories from the database.
-        
-        Returns:
-            list: List of category data.
-        """
-        return self.db.get_all_categories()
-        
-    def get_category_names(self):
-        """
-        Gets only the names of all categories.
-        
-        Returns:
-            list: List of category names.
-        """
-        categories = self.db.get_all_categories()
-        return [category[1] for category in categories]  # category_name is at index 1
-        
-    def get_spending_by_category(self, time_period="all"):
-        """
-        Gets the total spending by category for a specified time period.
-        
-        Args:
-            time_period (str): Time period for analysis. Options:
-                - "all": All time
-                - "month": Current month
-                - "prev_month": Previous month
-                - "year": Current year
-                
-        Returns:
-            list: List of (category, amount) tuples.
-        """
-        today = datetime.now()
-        
-        if time_period == "month":
-            # Current month
-            start_date = f"{today.year}-{today.month:02d}-01"
-            # Last day of current month
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            end_date = f"{today.year}-{today.month:02d}-{last_day}"
-            
-        elif time_period == "prev_month":
-            # Previous month
-            prev_month_date = today.replace(day=1) - timedelta(days=1)
-            start_date = f"{prev_month_date.year}-{prev_month_date.month:02d}-01"
-            last_day = calendar.monthrange(prev_month_date.year, prev_month_date.month)[1]
-            end_date = f"{prev_month_date.year}-{prev_month_date.month:02d}-{last_day}"
-            
-        elif time_period == "year":
-            # Current year
-            start_date = f"{today.year}-01-01"
-            end_date = f"{today.year}-12-31"
-            
-        else:  # "all" or any invalid values
-            # All time
-            start_date = None
-            end_date = None
-            
-        return self.db.get_spending_by_category(start_date, end_date)
-        
-    def calculate_budget_usage(self, time_period="month"):
-        """
-        Calculates the budget usage for each category.
-        
-        Args:
-            time_period (str): Time period for analysis. Options:
-                - "month": Current month (default)
-                - "prev_month": Previous month
-                - "year": Current year
-                - "all": All time
-                
-        Returns:
-            list: List of (category, spent, budget, percentage) tuples.
-        """
-        # Gets the spending by category for the specified time period
-        spending = self.get_spending_by_category(time_period)
-        
-        # Gets all the categories and their budgets
-        categories = self.db.get_all_categories()
-        
-        # Creates a dictionary of the category budgets for easy lookup
-        budgets = {category[1]: category[2] for category in categories}  # category_name: monthly_budget
-        
-        # For year and all time, we need to adjust the budget calculation
-        today = datetime.now()
-        budget_multiplier = 1.0  # Default for month
-
-        if time_period == "year":
-            # For a full year, multiply by 12
-            budget_multiplier = 12.0
-        elif time_period == "all":
-            # For all time, we need to find the range of dates in transactions
-            try:
-                self.db.cursor.execute("SELECT MIN(date), MAX(date) FROM transactions")
-                date_range = self.db.cursor.fetchone()
-                if date_range and date_range[0] and date_range[1]:
-                    min_date = datetime.strptime(date_range[0], "%Y-%m-%d")
-                    max_date = datetime.strptime(date_range[1], "%Y-%m-%d")
-                    # Calculate number of months (including partial months)
-                    month_diff = (max_date.year - min_date.year) * 12 + max_date.month - min_date.month
-                    if month_diff < 1:
-                        budget_multiplier = 1.0  # At least one month
-                    else:
-                        budget_multiplier = float(month_diff + 1)  # +1 to include partial months
-            except:
-                budget_multiplier = 1.0  # Default to 1 month if there's an error
-        
-        # Calculates the budget usage for each category
-        budget_usage = []
-        for category_data in categories:
-            category_name = category_data[1]
-            monthly_budget = category_data[2]
-            
-            # Calculate total budget based on time period
-            total_budget = monthly_budget * budget_multiplier
-            
-            # Find the spending for this category
-            spent = 0
-            for spend_category, amount in spending:
-                if spend_category == category_name:
-                    spent = amount
-                    break
-                    
-            # Calculates the percentage of the budget used
-            percentage = (spent / total_budget * 100) if total_budget > 0 else 0
-            
-            budget_usage.append((category_name, spent, total_budget, percentage))
-            
-        # Sort by the percentage of budget used in descending order
-        budget_usage.sort(key=lambda x: x[3], reverse=True)
-        
-        return budget_usage
-        
-    def get_over_budget_categories(self, time_period="month"):
-        """
-        Gets the categories that are over the budget for the specified time period.
-        
-        Args:
-            time_period (str): Time period to check. Options:
-                - "month": Current month (default)
-                - "prev_month": Previous month
-                - "year": Current year
-                - "all": All time
-                
-        Returns:
-            list: List of (category, spent, budget, percentage) tuples for over-budget categories.
-        """
-        budget_usage = self.calculate_budget_usage(time_period)
-        return [category for category in budget_usage if category[3] > 100]
-        
-    def get_spending_trend(self, num_months=6):
-        """
-        Gets the monthly spending trend for the past several months.
-        
-        Args:
-            num_months (int): Number of months to include.
-            
-        Returns:
-            dict: Dictionary with months as keys and total spending as values.
-        """
-        today = datetime.now()
-        spending_trend = {}
-        
-        for i in range(num_months):
-            # Calculate month
-            month_date = today.replace(day=1) - timedelta(days=i * 30)
-            month_str = f"{month_date.year}-{month_date.month:02d}"
-            month_name = month_date.strftime("%b %Y")
-            
-            # Calculate date range for the month
-            start_date = f"{month_date.year}-{month_date.month:02d}-01"
-            last_day = calendar.monthrange(month_date.year, month_date.month)[1]
-            end_date = f"{month_date.year}-{month_date.month:02d}-{last_day}"
-            
-            # Get spending for the month
-            spending = self.db.get_spending_by_category(start_date, end_date)
-            total = sum(amount for _, amount in spending)
-            
-            spending_trend[month_name] = total
-            
-        return spending_trend
-        
-    def get_account_types(self):
-        """
-        Gets the unique account types from transactions.
-        
-        Returns:
-            list: List of account types.
-        """
-        try:
-            self.db.cursor.execute("SELECT DISTINCT account_type FROM transactions")
-            results = self.db.cursor.fetchall()
-            return [r[0] for r in results if r[0]]
-        except Exception as e:
-            print(f"Error getting account types: {e}")
-            return []
-            
-    def get_payment_methods(self):
-        """
-        Gets the unique payment methods from the transactions.
-        
-        Returns:
-            list: List of payment methods.
-        """
-        try:
-            self.db.cursor.execute("SELECT DISTINCT payment_method FROM transactions")
-            results = self.db.cursor.fetchall()
-            return [r[0] for r in results if r[0]]
-        except Exception as e:
-            print(f"Error getting payment methods: {e}")
-            return []
-            
-    def delete_transaction(self, transaction_id):
-        """
-        Deletes a transaction.
-        
-        Args:
-            transaction_id (int): ID of the transaction to delete.
-            
-        Returns:
-            bool: True if transaction was deleted successfully, False otherwise.
-        """
-        return self.db.delete_transaction(transaction_id)
-        
-    def update_transaction(self, transaction_id, date, amount, category, description, account_type, payment_method):
-        """
-        Updates an existing transaction.
-        
-        Args:
-            transaction_id (int): ID of the transaction to update.
-            date (str): Updated transaction date in YYYY-MM-DD format.
-            amount (float): Updated transaction amount.
-            category (str): Updated transaction category.
-            description (str): Updated transaction description.
-            account_type (str): Updated account type.
-            payment_method (str): Updated payment method.
-            
-        Returns:
-            bool: True if transaction was updated successfully, False otherwise.
-        """
-        return self.db.update_transaction(transaction_id, date, amount, category, description, account_type, payment_method)
-        
-    def get_transaction(self, transaction_id):
-        """
-        Gets a specific transaction by its ID.
-        
-        Args:
-            transaction_id (int): ID of the transaction to retrieve.
-            
-        Returns:
-            tuple: Transaction data, or None if not found.
-        """
-        return self.db.get_transaction(transaction_id)
-
-    def clear_transactions_by_date_range(self, start_date, end_date):
-        """
-        Clears all transactions between the specified start and end dates.
-        
-        Args:
-            start_date (str): Start date in YYYY-MM-DD format.
-            end_date (str): End date in YYYY-MM-DD format.
-            
-        Returns:
-            int: Number of transactions deleted.
-        """
-        try:
-            # Validate dates
-            try:
-                datetime.strptime(start_date, "%Y-%m-%d")
-                datetime.strptime(end_date, "%Y-%m-%d")
-            except ValueError:
-                print("Invalid date format. Please use YYYY-MM-DD format.")
-                return 0
-                
-            # Get count of transactions to be deleted (for return value)
-            self.db.cursor.execute(
-                "SELECT COUNT(*) FROM transactions WHERE date >= ? AND date <= ?",
-                (start_date, end_date)
-            )
-            count = self.db.cursor.fetchone()[0]
-            
-            # Delete transactions
-            self.db.cursor.execute(
-                "DELETE FROM transactions WHERE date >= ? AND date <= ?",
-                (start_date, end_date)
-            )
-            
-            self.db.conn.commit()
-            return count
-            
-        except Exception as e:
-            print(f"Error clearing transactions by date range: {e}")
-            return 0
-            
-    def clear_all_transactions(self):
-        """
-        Clears all transactions from the database.
-        
-        Returns:
-            int: Number of transactions deleted.
-        """
-        try:
-            # Get count of transactions to be deleted (for return value)
-            self.db.cursor.execute("SELECT COUNT(*) FROM transactions")
-            count = self.db.cursor.fetchone()[0]
-            
-            # Delete all transactions
-            self.db.cursor.execute("DELETE FROM transactions")
-            
-            self.db.conn.commit()
-            return count
-            
-        except Exception as e:
-            print(f"Error clearing all transactions: {e}")
+#Authors: Adnan Syed, Dhruvkumar Satishbhai Ahir, Kartik Rajeev Patil
+#Date: May 02, 2025
+
+#Finance Tracker Module for Personal Finance Tracker and Advisor.
+
+#This module handles the business logic for tracking finances
+#and provides methods for analyzing financial data.
+
+
+from datetime import datetime, timedelta
+from operator import itemgetter
+import calendar
+import heapq
+import math
+
+from database import DAY_SQL, is_valid_date
+
+# Month labels of the spending trend. calendar.month_abbr formats a date with
+# strftime on every lookup, so the names are kept here once.
+MONTH_ABBR = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Account types and payment methods offered when entering a transaction
+ACCOUNT_TYPES = ("Checking", "Savings", "Credit")
+PAYMENT_METHODS = ("Cash", "Debit Card", "Credit Card", "Bank Transfer", "Mobile Payment")
+
+# SQL of the queries run by the tracker itself. Every call passes the same
+# text, so sqlite3 reuses the statement it compiled the first time.
+SQL_MONTH_SPAN = '''
+SELECT (strftime('%Y', last) - strftime('%Y', first)) * 12
+       + strftime('%m', last) - strftime('%m', first) + 1
+FROM (
+    SELECT date((SELECT MIN(date_i) FROM transactions) * 86400, 'unixepoch') AS first,
+           date((SELECT MAX(date_i) FROM transactions) * 86400, 'unixepoch') AS last
+)
+'''
+SQL_ACCOUNT_VALUES = '''
+SELECT DISTINCT 0, account_type FROM transactions WHERE account_type IS NOT NULL AND account_type <> ''
+UNION ALL
+SELECT DISTINCT 1, payment_method FROM transactions WHERE payment_method IS NOT NULL AND payment_method <> ''
+'''
+SQL_DEL_TXN_RANGE = f"DELETE FROM transactions WHERE date_i >= {DAY_SQL.format('?')} AND date_i <= {DAY_SQL.format('?')}"
+SQL_DEL_ALL_TXN = "DELETE FROM transactions"
+
+
+def parse_amount_text(text):
+    """
+    Parses an amount typed by the user, allowing a leading "$" and thousands
+    separators such as "$1,234.50".
+    
+    Args:
+        text (str): Amount text to parse.
+        
+    Returns:
+        float: The amount, or None if it is not a positive number.
+    """
+    try:
+        amount = float(text.strip().lstrip("$").replace(",", ""))
+    except ValueError:
+        return None
+    return amount if math.isfinite(amount) and amount > 0 else None
+
+
+class FinanceTracker:
+    """
+    Finance Tracker class that manages financial data and analysis.
+    
+    This class provides methods for:
+    - Adding and retrieving transactions
+    - Calculating spending by category
+    - Analyzing budget usage
+    - Generating basic financial insights
+    """
+    
+    def __init__(self, database):
+        """
+        Initializes the finance tracker with a database connection.
+        
+        Args:
+            database: Database instance for data storage and retrieval.
+        """
+        self.db = database
+        
+        # Account types and payment methods, with the data version they were read at
+        self._account_cache = ([], [])
+        self._account_cache_version = None
+        
+        # Budget usage of each time period, with the key it is valid for
+        self._usage_cache = {}
+        
+        # Category rows, with the data version they were read at
+        self._categories_cache = []
+        self._categories_cache_version = None
+        
+    def add_transaction(self, date, amount, category, description, account_type, payment_method):
+        """
+        Adds a new transaction.
+        
+        Args:
+            date (str): Transaction date in YYYY-MM-DD format.
+            amount (float): Transaction amount.
+            category (str): Transaction category.
+            description (str): Transaction description.
+            account_type (str): Account type.
+            payment_method (str): Payment method.
+            
+        Returns:
+            int: Transaction ID if successful, -1 otherwise.
+        """
+        return self.db.add_transaction(date, amount, category, description, account_type, payment_method)
+        
+    def add_transactions(self, transactions, commit=True):
+        """
+        Adds several validated transactions at once.
+        
+        Args:
+            transactions (list): List of (date, amount, category, description,
+                account_type, payment_method) tuples.
+            commit (bool): Whether to commit once the rows are inserted.
+            
+        Returns:
+            int: Number of transactions inserted, or -1 if failed.
+        """
+        return self.db.add_transactions(transactions, commit)
+        
+    def get_recent_transactions(self, limit=10):
+        """
+        Gets the most recent transactions.
+        
+        Args:
+            limit (int): Maximum number of transactions to return.
+            
+        Returns:
+            list: List of transaction data.
+        """
+        return self.db.get_all_transactions(limit)
+        
+    def get_transactions_by_category(self, category):
+        """
+        Gets the transactions for a specific category.
+        
+        Args:
+            category (str): Category name.
+            
+        Returns:
+            list: List of transaction data.
+        """
+        return self.db.get_transactions_by_category(category)
+        
+    def get_all_categories(self):
+        """
+        Gets all the available categories from the database.
+        
+        Categories rarely change, so the rows are kept until the database
+        contents change.
+        
+        Returns:
+            list: List of category data.
+        """
+        data_version = self.db.get_data_version()
+        if data_version is None or self._categories_cache_version != data_version:
+            self._categories_cache = self.db.get_all_categories()
+            self._categories_cache_version = data_version
+        return list(self._categories_cache)
+        
+    def get_category_names(self):
+        """
+        Gets only the names of all categories.
+        
+        Returns:
+            list: List of category names.
+        """
+        categories = self.get_all_categories()
+        return [category[1] for category in categories]  # category_name is at index 1
+        
+    def get_spending_by_category(self, time_period="all"):
+        """
+        Gets the total spending by category for a specified time period.
+        
+        Args:
+            time_period (str): Time period for analysis. Options:
+                - "all": All time
+                - "month": Current month
+                - "prev_month": Previous month
+                - "year": Current year
+                
+        Returns:
+            list: List of (category, amount) tuples.
+        """
+        today = datetime.now()
+        
+        # Single months are looked up by their month key
+        if time_period == "month":
+            return self.db.get_spending_by_month(today.year, today.month)
+        elif time_period == "prev_month":
+            year, month = divmod(today.year * 12 + today.month - 2, 12)
+            return self.db.get_spending_by_month(year, month + 1)
+            
+        start_date, end_date = self.get_date_range(time_period)
+        return self.db.get_spending_by_category(start_date, end_date)
+        
+    def get_date_range(self, time_period="all"):
+        """
+        Gets the start and end dates of a time period.
+        
+        Args:
+            time_period (str): Time period, one of "all", "month", "prev_month" or "year".
+                
+        Returns:
+            tuple: (start_date, end_date) in YYYY-MM-DD format, or (None, None) for all time.
+        """
+        today = datetime.now()
+        
+        if time_period == "month":
+            # Current month
+            start_date = f"{today.year}-{today.month:02d}-01"
+            # Last day of current month
+            last_day = calendar.monthrange(today.year, today.month)[1]
+            end_date = f"{today.year}-{today.month:02d}-{last_day}"
+            
+        elif time_period == "prev_month":
+            # Previous month
+            prev_month_date = today.replace(day=1) - timedelta(days=1)
+            start_date = f"{prev_month_date.year}-{prev_month_date.month:02d}-01"
+            last_day = calendar.monthrange(prev_month_date.year, prev_month_date.month)[1]
+            end_date = f"{prev_month_date.year}-{prev_month_date.month:02d}-{last_day}"
+            
+        elif time_period == "year":
+            # Current year
+            start_date = f"{today.year}-01-01"
+            end_date = f"{today.year}-12-31"
+            
+        else:  # "all" or any invalid values
+            # All time
+            start_date = None
+            end_date = None
+            
+        return start_date, end_date
+        
+    def calculate_budget_usage(self, time_period="month", top_k=None, spending=None):
+        """
+        Calculates the budget usage for each category.
+        
+        Args:
+            time_period (str): Time period for analysis. Options:
+                - "month": Current month (default)
+                - "prev_month": Previous month
+                - "year": Current year
+                - "all": All time
+            top_k (int, optional): Only return this many categories with the
+                highest percentage of budget used.
+            spending (list, optional): (category, amount) tuples already fetched
+                for the time period, instead of querying them again.
+                
+        Returns:
+            list: List of (category, spent, budget, percentage) tuples.
+        """
+        # Reuses the usage while the data and the day are unchanged
+        cached = self.get_cached_budget_usage(time_period)
+        if cached is not None:
+            if top_k is not None:
+                return heapq.nlargest(top_k, cached, key=itemgetter(3))
+            return list(cached)
+            
+        # Gets the budget and the spending of each category for the specified time period
+        if spending is None:
+            start_date, end_date = self.get_date_range(time_period)
+            budgets = self.db.get_budget_and_spent(start_date, end_date)  # (category_name, monthly_budget, spent)
+        else:
+            spending_map = dict(spending)  # category: amount
+            budgets = [(category[1], category[2], spending_map.get(category[1], 0))
+                       for category in self.get_all_categories()]
+        
+        # For year and all time, we need to adjust the budget calculation
+        budget_multiplier = self.get_budget_multiplier(time_period)
+        
+        # Calculates the budget usage for each category, with the percentage of the
+        # total budget for the time period that was used
+        budget_usage = [
+            (category_name, spent, monthly_budget * budget_multiplier,
+             (spent / (monthly_budget * budget_multiplier) * 100) if monthly_budget * budget_multiplier > 0 else 0)
+            for category_name, monthly_budget, spent in budgets
+        ]
+            
+        # Sort by the percentage of budget used in descending order
+        if top_k is not None:
+            return heapq.nlargest(top_k, budget_usage, key=itemgetter(3))
+        budget_usage.sort(key=itemgetter(3), reverse=True)
+        
+        self._usage_cache[time_period] = (self.usage_cache_key(), budget_usage)
+        return list(budget_usage)
+        
+    def usage_cache_key(self):
+        """
+        Gets the key the cached budget usage is valid for.
+        
+        Returns:
+            tuple: (date, data version), or None if the data version is unknown.
+        """
+        data_version = self.db.get_data_version()
+        if data_version is None:
+            return None
+        return (datetime.now().date(), data_version)
+        
+    def get_cached_budget_usage(self, time_period):
+        """
+        Gets the budget usage cached for a time period, if it is still valid.
+        
+        Args:
+            time_period (str): Time period of the budget usage.
+            
+        Returns:
+            list: The cached (category, spent, budget, percentage) tuples, or None.
+        """
+        key, budget_usage = self._usage_cache.get(time_period, (None, None))
+        if key is None or key != self.usage_cache_key():
+            return None
+        return budget_usage
+        
+    def get_budget_multiplier(self, time_period="month"):
+        """
+        Gets the number of monthly budgets a time period covers.
+        
+        Args:
+            time_period (str): Time period, one of "month", "prev_month", "year" or "all".
+                
+        Returns:
+            float: Number of months in the time period.
+        """
+        budget_multiplier = 1.0  # Default for month
+
+        if time_period == "year":
+            # For a full year, multiply by 12
+            budget_multiplier = 12.0
+        elif time_period == "all":
+            # For all time, count the months between the first and last transaction in SQL
+            try:
+                with self.db.reader() as cursor:
+                    cursor.execute(SQL_MONTH_SPAN)
+                    month_count = cursor.fetchone()[0]
+                # Including partial months, at least one month
+                if month_count:
+                    budget_multiplier = float(max(month_count, 1))
+            except:
+                budget_multiplier = 1.0  # Default to 1 month if there's an error
+        
+        return budget_multiplier
+        
+    def get_over_budget_categories(self, time_period="month"):
+        """
+        Gets the categories that are over the budget for the specified time period.
+        
+        Args:
+            time_period (str): Time period to check. Options:
+                - "month": Current month (default)
+                - "prev_month": Previous month
+                - "year": Current year
+                - "all": All time
+                
+        Returns:
+            list: List of (category, spent, budget, percentage) tuples for over-budget categories.
+        """
+        # Reuses the budget usage if it was just calculated
+        budget_usage = self.get_cached_budget_usage(time_period)
+        if budget_usage is not None:
+            return [category for category in budget_usage if category[3] > 100]
+            
+        start_date, end_date = self.get_date_range(time_period)
+        return self.db.get_over_budget(start_date, end_date, self.get_budget_multiplier(time_period))
+        
+    def get_spending_trend(self, num_months=6):
+        """
+        Gets the monthly spending trend for the past several months.
+        
+        Args:
+            num_months (int): Number of months to include.
+            
+        Returns:
+            dict: Dictionary with months as keys and total spending as values.
+        """
+        today = datetime.now()
+        spending_trend = {}
+        
+        # Calculate the (year, month) pairs, one calendar month back per step
+        months = []
+        for i in range(num_months):
+            month = today.month - i
+            months.append((today.year + (month - 1) // 12, (month - 1) % 12 + 1))
+        if not months:
+            return spending_trend
+            
+        # Get the spending of all the months with a single query
+        oldest_year, oldest_month = months[-1]
+        start_date = f"{oldest_year}-{oldest_month:02d}-01"
+        last_day = calendar.monthrange(today.year, today.month)[1]
+        end_date = f"{today.year}-{today.month:02d}-{last_day}"
+        monthly_totals = self.db.get_monthly_totals(start_date, end_date)
+        
+        for year, month in months:
+            month_str = f"{year}-{month:02d}"
+            month_name = f"{MONTH_ABBR[month - 1]} {year}"
+            spending_trend[month_name] = monthly_totals.get(month_str, 0)
+            
+        return spending_trend
+        
+    def get_account_types_and_payment_methods(self):
+        """
+        Gets the unique account types and payment methods from the transactions.
+        
+        Both lists are read with a single query and kept until the database
+        contents change.
+        
+        Returns:
+            tuple: (account_types, payment_methods) lists.
+        """
+        data_version = self.db.get_data_version()
+        if data_version is not None and self._account_cache_version == data_version:
+            return self._account_cache
+            
+        # Each row is tagged 0 for an account type or 1 for a payment method
+        account_types, payment_methods = [], []
+        values = (account_types, payment_methods)
+        try:
+            with self.db.reader() as cursor:
+                for kind, value in cursor.execute(SQL_ACCOUNT_VALUES):
+                    values[kind].append(value)
+        except Exception as e:
+            print(f"Error getting account types and payment methods: {e}")
+            return [], []
+            
+        self._account_cache = (account_types, payment_methods)
+        self._account_cache_version = data_version
+        return self._account_cache
+        
+    def get_account_types(self):
+        """
+        Gets the unique account types from transactions.
+        
+        Returns:
+            list: List of account types.
+        """
+        return list(self.get_account_types_and_payment_methods()[0])
+            
+    def get_payment_methods(self):
+        """
+        Gets the unique payment methods from the transactions.
+        
+        Returns:
+            list: List of payment methods.
+        """
+        return list(self.get_account_types_and_payment_methods()[1])
+            
+    def delete_transaction(self, transaction_id):
+        """
+        Deletes a transaction.
+        
+        Args:
+            transaction_id (int): ID of the transaction to delete.
+            
+        Returns:
+            bool: True if transaction was deleted successfully, False otherwise.
+        """
+        return self.db.delete_transaction(transaction_id)
+        
+    def update_transaction(self, transaction_id, date, amount, category, description, account_type, payment_method):
+        """
+        Updates an existing transaction.
+        
+        Args:
+            transaction_id (int): ID of the transaction to update.
+            date (str): Updated transaction date in YYYY-MM-DD format.
+            amount (float): Updated transaction amount.
+            category (str): Updated transaction category.
+            description (str): Updated transaction description.
+            account_type (str): Updated account type.
+            payment_method (str): Updated payment method.
+            
+        Returns:
+            bool: True if transaction was updated successfully, False otherwise.
+        """
+        return self.db.update_transaction(transaction_id, date, amount, category, description, account_type, payment_method)
+        
+    def get_transaction(self, transaction_id):
+        """
+        Gets a specific transaction by its ID.
+        
+        Args:
+            transaction_id (int): ID of the transaction to retrieve.
+            
+        Returns:
+            tuple: Transaction data, or None if not found.
+        """
+        return self.db.get_transaction(transaction_id)
+
+    def clear_transactions_by_date_range(self, start_date, end_date):
+        """
+        Clears all transactions between the specified start and end dates.
+        
+        Args:
+            start_date (str): Start date in YYYY-MM-DD format.
+            end_date (str): End date in YYYY-MM-DD format.
+            
+        Returns:
+            int: Number of transactions deleted.
+        """
+        try:
+            # Validate dates
+            if not (is_valid_date(start_date) and is_valid_date(end_date)):
+                print("Invalid date format. Please use YYYY-MM-DD format.")
+                return 0
+                
+            # Delete transactions, the rowcount is the number deleted
+            self.db.cursor.execute(SQL_DEL_TXN_RANGE, (start_date, end_date))
+            count = self.db.cursor.rowcount
+            
+            self.db.conn.commit()
+            return count
+            
+        except Exception as e:
+            print(f"Error clearing transactions by date range: {e}")
+            return 0
+            
+    def clear_all_transactions(self):
+        """
+        Clears all transactions from the database.
+        
+        Returns:
+            int: Number of transactions deleted.
+        """
+        try:
+            # Delete all transactions, the rowcount is the number deleted
+            self.db.cursor.execute(SQL_DEL_ALL_TXN)
+            count = self.db.cursor.rowcount
+            
+            self.db.conn.commit()
+            return count
+            
+        except Exception as e:
+            print(f"Error clearing all transactions: {e}")
             return 0
\ No newline at end of file
@@ -7,24 +7,587 @@
 #It provides a user-friendly way to interact with the finance tracker.
 
 
-import sys
+import atexit
+from bisect import bisect_left
+from functools import lru_cache
+from contextlib import contextmanager
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QLabel, QPushButton, QComboBox, 
-                            QTableWidget, QTableWidgetItem, QLineEdit,
-                            QDateEdit, QMessageBox, QTabWidget, QFormLayout,
+                            QLineEdit, QDateEdit, QMessageBox, QTabWidget, QFormLayout,
                             QGroupBox, QSplitter, QFrame, QHeaderView,
-                            QDialog, QDialogButtonBox, QFileDialog, QStackedWidget,
-                            QScrollArea)
-from PyQt5.QtCore import Qt, QDate
-from PyQt5.QtGui import QColor, QFont, QIcon
-import datetime
+                            QDialog, QDialogButtonBox, QStackedWidget,
+                            QTableView, QStyledItemDelegate, QStyle,
+                            QStyleOptionButton, QStyleOptionViewItem,
+                            QAbstractItemView)
+from PyQt5.QtCore import (Qt, QDate, QRect, QAbstractTableModel, QModelIndex, QPersistentModelIndex,
+                          QEvent, QObject, QThread, QTimer, pyqtSignal, pyqtSlot)
+from PyQt5.QtGui import QBrush, QColor, QFont, QPainter, QPalette, QPixmap
 
 # Import our custom modules
+from database import Database
+from finance_tracker import ACCOUNT_TYPES, PAYMENT_METHODS, FinanceTracker, parse_amount_text
 from batch_import import BatchImportDialog
 from data_visualizer import FinanceDataVisualizer
 from multi_transaction import MultiTransactionDialog
 from transaction_clearer import ClearTransactionsDialog
 
+#Colors of the budget percentages: over budget, close to the budget and within it
+#Brushes are shared by every cell rather than built per paint
+OVER_BUDGET_BRUSH = QBrush(QColor(255, 80, 80))  # red
+NEAR_BUDGET_BRUSH = QBrush(QColor(255, 255, 80))  # yellow
+UNDER_BUDGET_BRUSH = QBrush(QColor(80, 200, 80))  # green
+
+#Percentages above each threshold move to the next brush
+BUDGET_THRESHOLDS = (80, 100)
+BUDGET_BRUSHES = (UNDER_BUDGET_BRUSH, NEAR_BUDGET_BRUSH, OVER_BUDGET_BRUSH)
+
+#Category filter entry showing the most recent transactions of every category
+ALL_CATEGORIES = "All Categories"
+
+#Chart types of the visualizations, in the order of the visualization selector
+VIZ_TYPES = ("spending_by_category", "monthly_trend", "budget_comparison")
+
+#Colors of the edit and delete buttons of the transactions table
+EDIT_BUTTON_COLOR = QColor("#4caf50")
+DELETE_BUTTON_COLOR = QColor("#f44336")
+
+_RIGHT_ALIGNED = int(Qt.AlignRight | Qt.AlignVCenter)
+
+#Style of the button opening the clear transactions dialog
+CLEAR_BUTTON_STYLE = "background-color: #f44336; color: white;"
+
+@contextmanager
+def updates_suspended(*widgets):
+    """
+    Stops the widgets from repainting while they are repopulated, then
+    repaints each of them once.
+    
+    Args:
+        *widgets: Widgets to freeze.
+    """
+    for widget in widgets:
+        widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        for widget in widgets:
+            widget.setUpdatesEnabled(True)
+            widget.update()
+
+
+@lru_cache(maxsize=8)
+def item_positions(items):
+    """
+    Maps the items of a combo box to their positions, so selecting an item by
+    text is a dict lookup instead of a findText scan. The maps of the few
+    distinct item tuples in use are kept.
+    
+    Args:
+        items (tuple): Texts of the combo box items, in order.
+        
+    Returns:
+        dict: Position of each item text.
+    """
+    return {text: i for i, text in enumerate(items)}
+
+
+def select_item(combo, items, text):
+    """
+    Selects the item of a combo box with the given text, if there is one.
+    
+    Args:
+        combo (QComboBox): Combo box filled with items.
+        items (tuple): Texts of the combo box items, in order.
+        text (str): Text of the item to select.
+    """
+    index = item_positions(items).get(text, -1)
+    if index >= 0:
+        combo.setCurrentIndex(index)
+
+
+def make_table_view(model, row_height=30):
+    """
+    Creates a read-only table view with fixed row heights and stretched
+    columns, so Qt never measures cell contents to size rows or columns.
+    
+    Args:
+        model: Model shown by the view.
+        row_height (int): Height of every row in pixels.
+        
+    Returns:
+        QTableView: The table view.
+    """
+    view = QTableView()
+    view.setModel(model)
+    view.setItemDelegate(CachedRolesDelegate(view))
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.verticalHeader().setDefaultSectionSize(row_height)
+    view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+    view.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+    view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    return view
+
+
+#Role returning every role of a cell at once, as a {role: value} dict
+MULTI_ROLE = Qt.UserRole + 100
+
+
+class RowTableModel(QAbstractTableModel):
+    """
+    Base table model for a list of row tuples shown read-only.
+    
+    Subclasses build all the roles of a cell at once in cell_roles(), or of a
+    whole row in row_roles(); by default a cell shows its value as is. The
+    result is cached per row until the rows are replaced, and a cell's roles
+    are returned whole under MULTI_ROLE so CachedRolesDelegate needs a single
+    data() call per cell when painting.
+    
+    Rows are handed to the view FETCH_BATCH at a time through fetchMore(), so
+    a long result is laid out and painted only as far as it is scrolled.
+    """
+    
+    HEADERS = []
+    FETCH_BATCH = 200
+    
+    def __init__(self, rows=(), parent=None):
+        """
+        Initialize the model.
+        
+        Args:
+            rows: Row tuples to show.
+            parent: Parent object.
+        """
+        super().__init__(parent)
+        self.rows = []
+        self.cells = {}
+        self.fetched = 0
+        self.load_rows(rows)
+        
+    def load_rows(self, rows):
+        """
+        Stores new rows and drops the cached cells. Subclasses can extend it
+        to precompute per-row values.
+        
+        Args:
+            rows: Row tuples to show.
+        """
+        self.rows = list(rows)
+        self.cells = {}
+        self.fetched = min(len(self.rows), self.FETCH_BATCH)
+        
+    def set_rows(self, rows):
+        """
+        Replaces the rows shown by the model. When a refresh returns the rows
+        already shown, the model is left alone and keeps its formatted cells.
+        
+        Args:
+            rows: New row tuples.
+        """
+        rows = list(rows)
+        if rows == self.rows:
+            return
+        self.beginResetModel()
+        self.load_rows(rows)
+        self.endResetModel()
+        
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Returns the number of rows handed to the view so far.
+        """
+        return 0 if parent.isValid() else self.fetched
+        
+    def canFetchMore(self, parent=QModelIndex()):
+        """
+        Returns whether some rows were not handed to the view yet.
+        """
+        return not parent.isValid() and self.fetched < len(self.rows)
+        
+    def fetchMore(self, parent=QModelIndex()):
+        """
+        Hands the next batch of rows to the view.
+        """
+        if parent.isValid():
+            return
+        count = min(self.FETCH_BATCH, len(self.rows) - self.fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.fetched, self.fetched + count - 1)
+        self.fetched += count
+        self.endInsertRows()
+        
+    def columnCount(self, parent=QModelIndex()):
+        """
+        Returns the number of columns.
+        """
+        return 0 if parent.isValid() else len(self.HEADERS)
+        
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """
+        Returns the column titles for the horizontal header.
+        """
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+        
+    def cell_roles(self, row, column):
+        """
+        Builds the roles of a cell. By default the cell shows the row's value
+        for its column as is.
+        
+        Args:
+            row (int): Row of the cell.
+            column (int): Column of the cell.
+            
+        Returns:
+            dict: Values of the cell keyed by their Qt role.
+        """
+        return {Qt.DisplayRole: self.rows[row][column]}
+        
+    def row_roles(self, row):
+        """
+        Builds the roles of every cell of a row.
+        
+        Args:
+            row (int): Row to build.
+            
+        Returns:
+            list: Roles dict of each column.
+        """
+        cell_roles = self.cell_roles
+        return [cell_roles(row, column) for column in range(len(self.HEADERS))]
+        
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Returns the data for a cell from its row's cached roles.
+        """
+        if not index.isValid():
+            return None
+            
+        row = index.row()
+        row_cells = self.cells.get(row)
+        if row_cells is None:
+            row_cells = self.cells[row] = self.row_roles(row)
+        roles = row_cells[index.column()]
+            
+        if role == MULTI_ROLE:
+            return roles
+        return roles.get(role)
+
+
+class TransactionsModel(RowTableModel):
+    """
+    Table model holding the transaction rows shown on the dashboard.
+    
+    The rows are kept as the tuples returned by SQLite and the cell text is
+    built only when the view asks for a visible cell. The Edit and Delete
+    columns are drawn as buttons by ActionButtonDelegate, and every cell
+    returns the transaction_id under Qt.UserRole.
+    """
+    
+    HEADERS = ["Date", "Category", "Amount", "Description", "Payment Method", "Edit", "Delete"]
+    EDIT_COLUMN = 5
+    DELETE_COLUMN = 6
+    
+    def row_roles(self, row):
+        """
+        Builds the roles of every cell of a row, unpacking the transaction
+        tuple once.
+        """
+        transaction_id, date, amount, category, description, _, payment_method = self.rows[row]
+        display, user = Qt.DisplayRole, Qt.UserRole
+        return [
+            {display: date, user: transaction_id},
+            {display: category, user: transaction_id},
+            {display: f"${amount:.2f}", Qt.TextAlignmentRole: _RIGHT_ALIGNED, user: transaction_id},
+            {display: description, user: transaction_id},
+            {display: payment_method, user: transaction_id},
+            {display: "Edit", user: transaction_id},
+            {display: "Delete", user: transaction_id},
+        ]
+
+
+class BudgetUsageModel(RowTableModel):
+    """
+    Table model holding the budget usage rows shown on the dashboard.
+    
+    The highlight color of each percentage is picked once when the rows are
+    set, not every time the cell is painted.
+    """
+    
+    HEADERS = ["Category", "Spent", "Budget", "Percentage"]
+    PERCENTAGE_COLUMN = 3
+    
+    def load_rows(self, rows):
+        """
+        Stores new (category, spent, budget, percentage) rows and picks the
+        highlight color of each.
+        """
+        super().load_rows(rows)
+        self.colors = [BUDGET_BRUSHES[bisect_left(BUDGET_THRESHOLDS, row[3])]
+                       for row in self.rows]
+        
+    def cell_roles(self, row, column):
+        """
+        Builds the roles of a cell, highlighting the percentage by how much
+        of the budget is used.
+        """
+        values = self.rows[row]
+        if column == 0:
+            return {Qt.DisplayRole: values[0]}
+        if column == self.PERCENTAGE_COLUMN:
+            return {Qt.DisplayRole: f"{values[3]:.1f}%",
+                    Qt.TextAlignmentRole: _RIGHT_ALIGNED,
+                    Qt.BackgroundRole: self.colors[row]}
+        return {Qt.DisplayRole: f"${values[column]:.2f}",
+                Qt.TextAlignmentRole: _RIGHT_ALIGNED}
+
+
+class CachedRolesDelegate(QStyledItemDelegate):
+    """
+    Item delegate that fills the style option from a single MULTI_ROLE fetch,
+    instead of one data() call for each role Qt looks up when painting.
+    """
+    
+    def initStyleOption(self, option, index):
+        """
+        Sets up the style option of a cell from its cached roles.
+        """
+        roles = index.data(MULTI_ROLE)
+        if roles is None:
+            super().initStyleOption(option, index)
+            return
+            
+        option.index = index
+        text = roles.get(Qt.DisplayRole)
+        if text is not None:
+            option.features |= QStyleOptionViewItem.HasDisplay
+            option.text = str(text)
+        alignment = roles.get(Qt.TextAlignmentRole)
+        if alignment is not None:
+            option.displayAlignment = Qt.Alignment(alignment)
+        background = roles.get(Qt.BackgroundRole)
+        if background is not None:
+            option.backgroundBrush = background
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """
+    Item delegate that draws a cell as a push button and reports clicks.
+    
+    A single delegate serves every row of its column, so no button widget is
+    created per row. The button is rendered once per size and state into a
+    shared pixmap, which every cell then copies.
+    """
+    
+    # Emitted with the transaction_id of the clicked row
+    clicked = pyqtSignal(int)
+    
+    def __init__(self, text, color, parent=None):
+        """
+        Initialize the delegate.
+        
+        Args:
+            text (str): Label of the buttons.
+            color (QColor): Background color of the buttons.
+            parent: Parent object.
+        """
+        super().__init__(parent)
+        self.color = color
+        
+        # One button option is reused for every cell, only its rect changes
+        self.button = QStyleOptionButton()
+        self.button.text = text
+        self.palette_key = None
+        
+        # Rendered buttons keyed by (width, height, pixel ratio, sunken)
+        self.pixmaps = {}
+        
+        # Cell whose button is held down, if any
+        self.pressed = None
+        
+    def paint(self, painter, option, index):
+        """
+        Draws the cell as a button.
+        """
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        if rect.isEmpty():
+            return
+        widget = option.widget
+        
+        # Rebuild the button palette and drop the rendered buttons only when
+        # the view's palette changes
+        if self.palette_key != option.palette.cacheKey():
+            self.palette_key = option.palette.cacheKey()
+            self.button.palette = QPalette(option.palette)
+            self.button.palette.setColor(QPalette.Button, self.color)
+            self.pixmaps.clear()
+            
+        # Draw the pressed button sunken
+        sunken = self.pressed is not None and QModelIndex(self.pressed) == index
+        ratio = widget.devicePixelRatioF() if widget else 1.0
+        key = (rect.width(), rect.height(), ratio, sunken)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is None:
+            # Resizing a column renders a new size, so old sizes are dropped
+            if len(self.pixmaps) >= 8:
+                self.pixmaps.clear()
+            pixmap = self.pixmaps[key] = self.render_button(rect.width(), rect.height(), ratio, sunken, widget)
+        painter.drawPixmap(rect.topLeft(), pixmap)
+        
+    def render_button(self, width, height, ratio, sunken, widget):
+        """
+        Renders the button into a pixmap.
+        
+        Args:
+            width (int): Width of the button.
+            height (int): Height of the button.
+            ratio (float): Device pixel ratio of the view.
+            sunken (bool): Whether to draw the button pressed.
+            widget: View the button is drawn for, or None.
+            
+        Returns:
+            QPixmap: The rendered button.
+        """
+        pixmap = QPixmap(round(width * ratio), round(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        
+        button = self.button
+        button.rect = QRect(0, 0, width, height)
+        button.state = QStyle.State_Enabled | (QStyle.State_Sunken if sunken else QStyle.State_Raised)
+        
+        style = widget.style() if widget else QApplication.style()
+        painter = QPainter(pixmap)
+        style.drawControl(QStyle.CE_PushButton, button, painter, widget)
+        painter.end()
+        return pixmap
+        
+    def editorEvent(self, event, model, option, index):
+        """
+        Tracks the button pressed with the left mouse button, and emits clicked
+        when the button is released over the same cell, like a QPushButton.
+        """
+        event_type = event.type()
+        if event_type not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+            
+        inside = option.rect.contains(event.pos())
+        if event_type == QEvent.MouseButtonPress:
+            if not inside:
+                return False
+            self.pressed = QPersistentModelIndex(index)
+            self.repaint_cell(index)
+            return True
+            
+        # Releasing away from the pressed button cancels the click
+        pressed, self.pressed = self.pressed, None
+        if pressed is None:
+            return False
+        self.repaint_cell(QModelIndex(pressed))
+        if inside and QModelIndex(pressed) == index:
+            self.clicked.emit(index.data(Qt.UserRole))
+        return True
+        
+    def repaint_cell(self, index):
+        """
+        Repaints a cell of the view the delegate belongs to.
+        
+        Args:
+            index (QModelIndex): Cell to repaint.
+        """
+        view = self.parent()
+        if isinstance(view, QAbstractItemView) and index.isValid():
+            view.update(index)
+
+
+def load_dashboard_data(finance_tracker, time_period=None, category=None):
+    """
+    Fetches the rows of the dashboard tables.
+    
+    Args:
+        finance_tracker: FinanceTracker to read the data with.
+        time_period (str, optional): Time period of the budget usage, or None to skip it.
+        category (str, optional): Category filter of the transactions, or None to skip them.
+        
+    Returns:
+        tuple: (budget_usage, transactions), None for the parts that were skipped.
+    """
+    budget_data = transactions = None
+    if time_period is not None:
+        budget_data = finance_tracker.calculate_budget_usage(time_period)
+    if category == ALL_CATEGORIES:
+        transactions = finance_tracker.get_recent_transactions(20)
+    elif category is not None:
+        transactions = finance_tracker.get_transactions_by_category(category)
+    return budget_data, transactions
+
+
+class DashboardLoader(QObject):
+    """
+    Worker fetching the dashboard tables on a separate thread, so long
+    queries such as the all-time budget usage do not block the window.
+    
+    SQLite connections can only be used from the thread that created them, so
+    the worker opens its own connection to the database file the first time
+    it loads, and keeps it (with the tracker's caches) until its thread ends.
+    """
+    
+    loaded = pyqtSignal(int, object, object)
+    failed = pyqtSignal(int, object, object)
+    
+    def __init__(self, db_file):
+        """
+        Initialize the loader.
+        
+        Args:
+            db_file (str): Path of the database file.
+        """
+        super().__init__()
+        
+        self.db_file = db_file
+        self.db = None
+        self.finance_tracker = None
+        
+    @pyqtSlot(int, object, object)
+    def load(self, request_id, time_period, category):
+        """
+        Fetches the requested dashboard data and emits it with loaded.
+        
+        Args:
+            request_id (int): ID of the request, passed back with the data.
+            time_period (str): Time period of the budget usage, or None.
+            category (str): Category filter of the transactions, or None.
+        """
+        try:
+            if self.finance_tracker is None:
+                # Every query runs on the loader's thread, so no reader pool
+                db = Database(self.db_file)
+                if not db.connect(readers=0):
+                    raise RuntimeError("Could not connect to the database.")
+                # Closed on this thread by close(), not at exit from the main thread
+                atexit.unregister(db.close)
+                self.db = db
+                self.finance_tracker = FinanceTracker(db)
+                
+            budget_data, transactions = load_dashboard_data(self.finance_tracker, time_period, category)
+            self.loaded.emit(request_id, budget_data, transactions)
+        except Exception as e:
+            print(f"Error loading dashboard data: {e}!")
+            self.failed.emit(request_id, time_period, category)
+            
+    def close(self):
+        """
+        Closes the loader's database connection. Runs on the loader's thread.
+        """
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+            self.finance_tracker = None
+
+
 class FinanceTrackerGUI(QMainWindow):
     """
     Main GUI window for the Finance Tracker application.
@@ -36,19 +599,88 @@ class FinanceTrackerGUI(QMainWindow):
     - Providing interactive visualizations
     """
     
-    def __init__(self, finance_tracker):
+    # Asks the dashboard loader for (request_id, time_period, category)
+    data_requested = pyqtSignal(int, object, object)
+    
+    def __init__(self, finance_tracker, populate=True):
         """
         Initialize the GUI window.
         
         Args:
             finance_tracker: FinanceTracker instance for business logic.
+            populate (bool): Whether to load the data right away. Pass False
+                to show the empty window first and call populate() later.
         """
         super().__init__()
         
         self.finance_tracker = finance_tracker
         # Create the data visualizer instance
         self.data_visualizer = FinanceDataVisualizer(finance_tracker)
+        # Whether a dashboard refresh is already queued
+        self.refresh_pending = False
+        
+        # Category names shown in the dropdowns and passed to the edit dialog
+        self.category_names = ()
+        
+        # Latest requests whose results may still be shown in each table
+        self.request_id = 0
+        self.budget_request = 0
+        self.transactions_request = 0
+        self.start_loader()
+        
         self.init_ui()
+        if populate:
+            self.populate()
+            
+    def populate(self):
+        """
+        Loads the categories and the dashboard data into the window.
+        """
+        self.run_refresh()
+        
+    def start_loader(self):
+        """
+        Starts the thread fetching the dashboard tables. In-memory databases
+        can't be opened from another connection, so they are read on the GUI
+        thread instead.
+        """
+        self.loader = self.loader_thread = None
+        db_file = self.finance_tracker.db.db_file
+        if db_file in (":memory:", ""):
+            return
+            
+        self.loader = DashboardLoader(db_file)
+        self.loader_thread = QThread(self)
+        self.loader.moveToThread(self.loader_thread)
+        
+        self.data_requested.connect(self.loader.load)
+        self.loader.loaded.connect(self.apply_dashboard_data)
+        self.loader.failed.connect(self.load_dashboard_now)
+        # finished is emitted on the loader's thread, where its connection was opened
+        self.loader_thread.finished.connect(self.loader.close, Qt.DirectConnection)
+        self.loader_thread.start()
+        
+        # Stop the thread before the application and the window are torn down
+        QApplication.instance().aboutToQuit.connect(self.stop_loader)
+        atexit.register(self.stop_loader)
+        
+    def stop_loader(self):
+        """
+        Stops the loader thread and waits for it to close its connection.
+        """
+        atexit.unregister(self.stop_loader)
+        if self.loader_thread is not None:
+            self.loader_thread.quit()
+            self.loader_thread.wait()
+            self.loader_thread = None
+            self.loader = None
+            
+    def closeEvent(self, event):
+        """
+        Stops the loader thread when the window is closed.
+        """
+        self.stop_loader()
+        super().closeEvent(event)
         
     def init_ui(self):
         """
@@ -100,7 +732,7 @@ class FinanceTrackerGUI(QMainWindow):
         
         # Clear Transactions button
         clear_button = QPushButton("Clear Transactions")
-        clear_button.setStyleSheet("background-color: #f44336; color: white;")
+        clear_button.setStyleSheet(CLEAR_BUTTON_STYLE)
         clear_button.clicked.connect(self.open_transaction_clearer)
         transaction_mgmt_layout.addWidget(clear_button)
         
@@ -121,11 +753,8 @@ class FinanceTrackerGUI(QMainWindow):
         # Budget usage section
         budget_group = QGroupBox("Budget Usage")
         budget_layout = QVBoxLayout(budget_group)
-        self.budget_table = QTableWidget(0, 4)
-        self.budget_table.setHorizontalHeaderLabels(["Category", "Spent", "Budget", "Percentage"])
-        self.budget_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        # Make table read-only
-        self.budget_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.budget_model = BudgetUsageModel(parent=self)
+        self.budget_table = make_table_view(self.budget_model)
         budget_layout.addWidget(self.budget_table)
         left_layout.addWidget(budget_group)
         
@@ -141,17 +770,21 @@ class FinanceTrackerGUI(QMainWindow):
         filter_layout = QHBoxLayout()
         filter_layout.addWidget(QLabel("Filter by Category:"))
         self.category_filter = QComboBox()
-        self.category_filter.addItem("All Categories")
+        self.category_filter.addItem(ALL_CATEGORIES)
         self.category_filter.currentIndexChanged.connect(self.update_transactions)
         filter_layout.addWidget(self.category_filter)
         filter_layout.addStretch(1)
         transactions_layout.addLayout(filter_layout)
         
-        self.transactions_table = QTableWidget(0, 7)  # Added an extra column for edit/delete buttons
-        self.transactions_table.setHorizontalHeaderLabels(["Date", "Category", "Amount", "Description", "Payment Method", "Edit", "Delete"])
-        self.transactions_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        # Make transaction table read-only except for edit/delete buttons
-        self.transactions_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.transactions_model = TransactionsModel(parent=self)
+        # The edit/delete columns are drawn as buttons by their delegates
+        self.transactions_table = make_table_view(self.transactions_model)
+        self.edit_delegate = ActionButtonDelegate("Edit", EDIT_BUTTON_COLOR, self.transactions_table)
+        self.edit_delegate.clicked.connect(self.edit_transaction)
+        self.transactions_table.setItemDelegateForColumn(TransactionsModel.EDIT_COLUMN, self.edit_delegate)
+        self.delete_delegate = ActionButtonDelegate("Delete", DELETE_BUTTON_COLOR, self.transactions_table)
+        self.delete_delegate.clicked.connect(self.delete_transaction)
+        self.transactions_table.setItemDelegateForColumn(TransactionsModel.DELETE_COLUMN, self.delete_delegate)
         transactions_layout.addWidget(self.transactions_table)
         right_layout.addWidget(transactions_group)
         
@@ -160,10 +793,35 @@ class FinanceTrackerGUI(QMainWindow):
         dashboard_splitter.addWidget(right_panel)
         dashboard_splitter.setSizes([400, 600])
         
-        # Transactions tab
-        transactions_tab = QWidget()
-        tabs.addTab(transactions_tab, "Transactions")
-        transactions_layout = QVBoxLayout(transactions_tab)
+        # The other tabs are built the first time they are opened
+        self.category_combo = None
+        self.viz_stack = None
+        self.tabs = tabs
+        self.tab_builders = [None, self.build_transactions_tab, self.build_visualizations_tab]
+        tabs.addTab(QWidget(), "Transactions")
+        tabs.addTab(QWidget(), "Visualizations")
+        tabs.currentChanged.connect(self.build_tab)
+        
+    def build_tab(self, index):
+        """
+        Builds the contents of a tab the first time it is opened.
+        
+        Args:
+            index (int): Index of the tab.
+        """
+        builder = self.tab_builders[index]
+        if builder is not None:
+            self.tab_builders[index] = None
+            builder(self.tabs.widget(index))
+            
+    def build_transactions_tab(self, tab):
+        """
+        Builds the form for adding transactions.
+        
+        Args:
+            tab (QWidget): Tab to build the form in.
+        """
+        transactions_layout = QVBoxLayout(tab)
         
         # Form for adding new transactions
         add_transaction_group = QGroupBox("Add New Transaction")
@@ -182,6 +840,7 @@ class FinanceTrackerGUI(QMainWindow):
         
         # Category dropdown
         self.category_combo = QComboBox()
+        self.category_combo.addItems(self.category_names)
         form_layout.addRow("Category:", self.category_combo)
         
         # Description field
@@ -191,12 +850,12 @@ class FinanceTrackerGUI(QMainWindow):
         
         # Account type dropdown
         self.account_combo = QComboBox()
-        self.account_combo.addItems(["Checking", "Savings", "Credit"])
+        self.account_combo.addItems(ACCOUNT_TYPES)
         form_layout.addRow("Account Type:", self.account_combo)
         
         # Payment method dropdown
         self.payment_combo = QComboBox()
-        self.payment_combo.addItems(["Cash", "Debit Card", "Credit Card", "Bank Transfer", "Mobile Payment"])
+        self.payment_combo.addItems(PAYMENT_METHODS)
         form_layout.addRow("Payment Method:", self.payment_combo)
         
         transactions_layout.addWidget(add_transaction_group)
@@ -222,10 +881,14 @@ class FinanceTrackerGUI(QMainWindow):
         transactions_layout.addLayout(buttons_layout)
         transactions_layout.addStretch(1)
         
-        # Visualizations tab
-        visualizations_tab = QWidget()
-        tabs.addTab(visualizations_tab, "Visualizations")
-        viz_layout = QVBoxLayout(visualizations_tab)
+    def build_visualizations_tab(self, tab):
+        """
+        Builds the visualization selector and shows the selected visualization.
+        
+        Args:
+            tab (QWidget): Tab to build the visualizations in.
+        """
+        viz_layout = QVBoxLayout(tab)
         
         # Visualization type selector
         viz_selector_layout = QHBoxLayout()
@@ -251,171 +914,188 @@ class FinanceTrackerGUI(QMainWindow):
         self.viz_stack = QStackedWidget()
         viz_layout.addWidget(self.viz_stack)
         
-        # Add visualization widgets
-        self.viz_stack.addWidget(self.data_visualizer.create_visualization_widget("spending_by_category"))
-        self.viz_stack.addWidget(self.data_visualizer.create_visualization_widget("monthly_trend"))
-        self.viz_stack.addWidget(self.data_visualizer.create_visualization_widget("budget_comparison"))
+        # Visualization widgets are created the first time they are shown, the
+        # stack holds empty placeholders until then
+        self.viz_widgets = [None] * len(VIZ_TYPES)
+        self.viz_dirty = [True] * len(VIZ_TYPES)
+        for _ in VIZ_TYPES:
+            self.viz_stack.addWidget(QWidget())
         
-        # Load initial data
-        self.load_categories()
-        self.refresh_dashboard()
+        self.show_visualization(self.viz_type_combo.currentIndex())
         
     def load_categories(self):
         """
-        Load categories into the category dropdowns.
+        Load categories into the category dropdowns, if they changed since
+        they were last loaded.
         """
         # Get categories from finance tracker
-        categories = self.finance_tracker.get_category_names()
+        categories = tuple(self.finance_tracker.get_category_names())
+        if categories == self.category_names:
+            return
+        self.category_names = categories
         
-        # Update category combo box
-        self.category_combo.clear()
-        self.category_combo.addItems(categories)
+        # Update category combo box, once the transactions tab is built
+        if self.category_combo is not None:
+            self.category_combo.blockSignals(True)
+            self.category_combo.clear()
+            self.category_combo.addItems(categories)
+            self.category_combo.blockSignals(False)
         
-        # Update category filter
+        # Update category filter without refreshing the transactions for every item
         current_text = self.category_filter.currentText()
+        filter_items = (ALL_CATEGORIES,) + categories
+        self.category_filter.blockSignals(True)
         self.category_filter.clear()
-        self.category_filter.addItem("All Categories")
-        self.category_filter.addItems(categories)
+        self.category_filter.addItems(filter_items)
         
         # Try to restore previous selection
-        index = self.category_filter.findText(current_text)
-        if index >= 0:
-            self.category_filter.setCurrentIndex(index)
+        select_item(self.category_filter, filter_items, current_text)
+        self.category_filter.blockSignals(False)
+        
+        # Only refresh if the selected category was removed
+        if current_text and self.category_filter.currentText() != current_text:
+            self.update_transactions()
             
     def refresh_dashboard(self):
         """
         Refresh all dashboard elements.
+        
+        The refresh runs once control returns to the event loop, so several
+        requests in a row are coalesced into a single refresh.
+        """
+        if self.refresh_pending:
+            return
+        self.refresh_pending = True
+        QTimer.singleShot(0, self.run_refresh)
+        
+    def run_refresh(self):
+        """
+        Refreshes all dashboard elements right away.
+        """
+        self.refresh_pending = False
+        
+        # Pick up categories added by imports or other dialogs
+        self.load_categories()
+        
+        # Repaint the tables and the visualization once, after all of them are updated
+        widgets = [self.budget_table, self.transactions_table]
+        if self.viz_stack is not None:
+            widgets.append(self.viz_stack)
+        with updates_suspended(*widgets):
+            self.request_dashboard_data(self.selected_time_period(), self.category_filter.currentText())
+            # Charts are drawn on the GUI thread
+            self.refresh_visualization()
+            
+    def request_dashboard_data(self, time_period=None, category=None):
+        """
+        Fetches the dashboard tables on the loader thread, or right away when
+        there is no loader.
+        
+        Args:
+            time_period (str, optional): Time period of the budget usage, or None to keep it.
+            category (str, optional): Category filter of the transactions, or None to keep them.
         """
-        self.update_dashboard()
-        self.update_transactions()
-        self.refresh_visualization()
+        if self.loader is None:
+            self.load_dashboard_now(0, time_period, category)
+            return
+            
+        self.request_id += 1
+        if time_period is not None:
+            self.budget_request = self.request_id
+        if category is not None:
+            self.transactions_request = self.request_id
+        self.data_requested.emit(self.request_id, time_period, category)
+        
+    def load_dashboard_now(self, request_id, time_period, category):
+        """
+        Fetches the dashboard tables on the GUI thread.
+        
+        Args:
+            request_id (int): ID of the request.
+            time_period (str): Time period of the budget usage, or None.
+            category (str): Category filter of the transactions, or None.
+        """
+        budget_data, transactions = load_dashboard_data(self.finance_tracker, time_period, category)
+        self.apply_dashboard_data(request_id, budget_data, transactions)
+        
+    def apply_dashboard_data(self, request_id, budget_data, transactions):
+        """
+        Shows fetched dashboard data, unless a newer request for the same
+        table was made in the meantime.
+        
+        Args:
+            request_id (int): ID of the request the data belongs to.
+            budget_data (list): Budget usage rows, or None.
+            transactions (list): Transaction rows, or None.
+        """
+        if budget_data is not None and request_id >= self.budget_request:
+            self.budget_model.set_rows(budget_data)
+        if transactions is not None and request_id >= self.transactions_request:
+            self.transactions_model.set_rows(transactions)
         
     def refresh_visualization(self):
         """
         Refresh the current visualization to reflect updated data.
+        
+        The other visualizations are marked out of date and redrawn the next
+        time they are shown. Nothing is drawn until the visualizations tab is
+        built.
         """
-        viz_type_index = self.viz_type_combo.currentIndex()
+        if self.viz_stack is None:
+            return
+        self.viz_dirty = [True] * len(VIZ_TYPES)
+        self.show_visualization(self.viz_type_combo.currentIndex())
         
-        # Create a new visualization widget based on the current selection
-        viz_widget = None
-        if viz_type_index == 0:
-            viz_widget = self.data_visualizer.create_visualization_widget("spending_by_category")
-        elif viz_type_index == 1:
-            viz_widget = self.data_visualizer.create_visualization_widget("monthly_trend")
-        elif viz_type_index == 2:
-            viz_widget = self.data_visualizer.create_visualization_widget("budget_comparison")
+    def show_visualization(self, viz_type_index):
+        """
+        Shows a visualization, creating it on first use and redrawing its chart
+        in place if the data changed since it was last shown.
+        
+        Args:
+            viz_type_index (int): Index of the visualization in VIZ_TYPES.
+        """
+        viz_widget = self.viz_widgets[viz_type_index]
+        if viz_widget is None:
+            # Replace the placeholder with the visualization widget
+            viz_widget = self.data_visualizer.create_visualization_widget(VIZ_TYPES[viz_type_index])
+            placeholder = self.viz_stack.widget(viz_type_index)
+            self.viz_stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.viz_stack.insertWidget(viz_type_index, viz_widget)
+            self.viz_widgets[viz_type_index] = viz_widget
+        elif self.viz_dirty[viz_type_index]:
+            viz_widget.update_data()
             
-        # Replace the current widget with the new one
-        self.viz_stack.removeWidget(self.viz_stack.widget(viz_type_index))
-        self.viz_stack.insertWidget(viz_type_index, viz_widget)
+        self.viz_dirty[viz_type_index] = False
         self.viz_stack.setCurrentIndex(viz_type_index)
         
-    def update_dashboard(self):
+    def selected_time_period(self):
         """
-        Update dashboard data based on selected time period.
+        Gets the time period selected in the dashboard.
+        
+        Returns:
+            str: "month", "prev_month", "year" or "all".
         """
-        # Get time period from combo box
         time_period_index = self.time_period_combo.currentIndex()
         if time_period_index == 0:
-            time_period = "month"
+            return "month"
         elif time_period_index == 1:
-            time_period = "prev_month"
+            return "prev_month"
         elif time_period_index == 2:
-            time_period = "year"
-        else:
-            time_period = "all"
-            
-        # Get budget usage data
-        budget_data = self.finance_tracker.calculate_budget_usage(time_period)
-            
-        # Update budget table
-        self.budget_table.setRowCount(len(budget_data))
-        for row, (category, spent, budget, percentage) in enumerate(budget_data):
-            # Category
-            self.budget_table.setItem(row, 0, QTableWidgetItem(category))
-            
-            # Spent
-            spent_item = QTableWidgetItem(f"${spent:.2f}")
-            spent_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.budget_table.setItem(row, 1, spent_item)
-            
-            # Budget
-            budget_item = QTableWidgetItem(f"${budget:.2f}")
-            budget_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.budget_table.setItem(row, 2, budget_item)
-            
-            # Percentage
-            percentage_item = QTableWidgetItem(f"{percentage:.1f}%")
-            percentage_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Highlight over-budget categories
-            if percentage > 100:
-                percentage_item.setBackground(QColor(255, 80, 80))  # red
-            elif percentage > 80:
-                percentage_item.setBackground(QColor(255, 255, 80))  # yellow
-            else:
-                percentage_item.setBackground(QColor(80, 200, 80))  # green
-                
-            self.budget_table.setItem(row, 3, percentage_item)
+            return "year"
+        return "all"
+        
+    def update_dashboard(self):
+        """
+        Update dashboard data based on selected time period.
+        """
+        self.request_dashboard_data(time_period=self.selected_time_period())
             
     def update_transactions(self):
         """
         Update transactions table based on category filter.
         """
-        # Get selected category
-        category = self.category_filter.currentText()
-        
-        # Get transactions
-        if category == "All Categories":
-            transactions = self.finance_tracker.get_recent_transactions(20)
-        else:
-            transactions = self.finance_tracker.get_transactions_by_category(category)
-            
-        # Update table
-        self.transactions_table.setRowCount(len(transactions))
-        
-        for row, transaction in enumerate(transactions):
-            # Parse transaction data
-            # SQLite returns: transaction_id, date, amount, category, description, account_type, payment_method
-            transaction_id = transaction[0]
-            date = transaction[1]
-            amount = transaction[2]
-            category = transaction[3]
-            description = transaction[4]
-            payment_method = transaction[6]
-            
-            # Date
-            self.transactions_table.setItem(row, 0, QTableWidgetItem(date))
-            
-            # Category
-            self.transactions_table.setItem(row, 1, QTableWidgetItem(category))
-            
-            # Amount
-            amount_item = QTableWidgetItem(f"${amount:.2f}")
-            amount_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.transactions_table.setItem(row, 2, amount_item)
-            
-            # Description
-            self.transactions_table.setItem(row, 3, QTableWidgetItem(description))
-            
-            # Payment Method
-            self.transactions_table.setItem(row, 4, QTableWidgetItem(payment_method))
-            
-            # Edit button
-            edit_button = QPushButton("Edit")
-            edit_button.setStyleSheet("background-color: #4caf50;")
-            # Store the transaction_id as a property of the button
-            edit_button.setProperty("transaction_id", transaction_id)
-            edit_button.clicked.connect(self.edit_transaction)
-            self.transactions_table.setCellWidget(row, 5, edit_button)
-            
-            # Delete button
-            delete_button = QPushButton("Delete")
-            delete_button.setStyleSheet("background-color: #f44336;")
-            # Store the transaction_id as a property of the button
-            delete_button.setProperty("transaction_id", transaction_id)
-            delete_button.clicked.connect(self.delete_transaction)
-            self.transactions_table.setCellWidget(row, 6, delete_button)
+        self.request_dashboard_data(category=self.category_filter.currentText())
     
     def update_visualization(self):
         """
@@ -425,9 +1105,7 @@ class FinanceTrackerGUI(QMainWindow):
         viz_type_index = self.viz_type_combo.currentIndex()
         
         # Update the stacked widget to show the selected visualization
-        self.viz_stack.setCurrentIndex(viz_type_index)
-        
-        self.refresh_visualization()
+        self.show_visualization(viz_type_index)
         
     def add_transaction(self):
         """
@@ -435,14 +1113,11 @@ class FinanceTrackerGUI(QMainWindow):
         """
         try:
             # Get values from form
-            date = self.date_edit.date().toString("yyyy-MM-dd")
+            date = self.date_edit.date().toString(Qt.ISODate)
             
             # Validate amount
-            try:
-                amount = float(self.amount_edit.text())
-                if amount <= 0:
-                    raise ValueError("Amount must be positive")
-            except ValueError:
+            amount = parse_amount_text(self.amount_edit.text())
+            if amount is None:
                 QMessageBox.warning(self, "Invalid Amount", "Please enter a valid positive number for the amount.")
                 return
                 
@@ -498,17 +1173,13 @@ class FinanceTrackerGUI(QMainWindow):
             # Refresh dashboard after clearing transactions
             self.refresh_dashboard()
             
-    def delete_transaction(self):
+    def delete_transaction(self, transaction_id):
         """
         Deletes a transaction when the delete button is clicked.
+        
+        Args:
+            transaction_id (int): ID of the transaction in the clicked row.
         """
-        # Gets the button that was clicked
-        button = self.sender()
-        if not button:
-            return
-            
-        # Gets the transaction_id from the button's properties
-        transaction_id = button.property("transaction_id")
         if not transaction_id:
             return
             
@@ -532,17 +1203,13 @@ class FinanceTrackerGUI(QMainWindow):
             else:
                 QMessageBox.warning(self, "Error", "Failed to delete transaction!")
                 
-    def edit_transaction(self):
+    def edit_transaction(self, transaction_id):
         """
         Opens an edit dialog for a transaction when the edit button is clicked.
+        
+        Args:
+            transaction_id (int): ID of the transaction in the clicked row.
         """
-        # Gets the button that was clicked
-        button = self.sender()
-        if not button:
-            return
-            
-        # Gets the transaction_id from the button's properties
-        transaction_id = button.property("transaction_id")
         if not transaction_id:
             return
             
@@ -553,7 +1220,7 @@ class FinanceTrackerGUI(QMainWindow):
             return
             
         # Opens the edit dialog
-        dialog = EditTransactionDialog(self, transaction, self.finance_tracker)
+        dialog = EditTransactionDialog(self, transaction, self.finance_tracker, self.category_names)
         if dialog.exec_() == QDialog.Accepted:
             # Refreshes the dashboard
             self.refresh_dashboard()
@@ -569,7 +1236,7 @@ class EditTransactionDialog(QDialog):
     - Cancel and discard changes
     """
     
-    def __init__(self, parent, transaction, finance_tracker):
+    def __init__(self, parent, transaction, finance_tracker, categories=None):
         """
         Initialize the edit transaction dialog.
         
@@ -577,11 +1244,16 @@ class EditTransactionDialog(QDialog):
             parent: Parent widget.
             transaction: Transaction data to edit.
             finance_tracker: FinanceTracker instance.
+            categories (tuple, optional): Category names to choose from. Read
+                from the finance tracker when not given.
         """
         super().__init__(parent)
         
         self.transaction = transaction
         self.finance_tracker = finance_tracker
+        if categories is None:
+            categories = finance_tracker.get_category_names()
+        self.categories = tuple(categories)
         
         self.init_ui()
         
@@ -607,8 +1279,7 @@ class EditTransactionDialog(QDialog):
         
         # Date field
         self.date_edit = QDateEdit()
-        date = datetime.datetime.strptime(self.transaction[1], "%Y-%m-%d").date()
-        self.date_edit.setDate(QDate(date.year, date.month, date.day))
+        self.date_edit.setDate(QDate.fromString(self.transaction[1], Qt.ISODate))
         self.date_edit.setCalendarPopup(True)
         form_layout.addRow("Date:", self.date_edit)
         
@@ -619,10 +1290,8 @@ class EditTransactionDialog(QDialog):
         
         # Category dropdown
         self.category_combo = QComboBox()
-        self.category_combo.addItems(self.finance_tracker.get_category_names())
-        current_category_index = self.category_combo.findText(self.transaction[3])
-        if current_category_index >= 0:
-            self.category_combo.setCurrentIndex(current_category_index)
+        self.category_combo.addItems(self.categories)
+        select_item(self.category_combo, self.categories, self.transaction[3])
         form_layout.addRow("Category:", self.category_combo)
         
         # Description field
@@ -632,18 +1301,14 @@ class EditTransactionDialog(QDialog):
         
         # Account type dropdown
         self.account_combo = QComboBox()
-        self.account_combo.addItems(["Checking", "Savings", "Credit"])
-        current_account_index = self.account_combo.findText(self.transaction[5])
-        if current_account_index >= 0:
-            self.account_combo.setCurrentIndex(current_account_index)
+        self.account_combo.addItems(ACCOUNT_TYPES)
+        select_item(self.account_combo, ACCOUNT_TYPES, self.transaction[5])
         form_layout.addRow("Account Type:", self.account_combo)
         
         # Payment method dropdown
         self.payment_combo = QComboBox()
-        self.payment_combo.addItems(["Cash", "Debit Card", "Credit Card", "Bank Transfer", "Mobile Payment"])
-        current_payment_index = self.payment_combo.findText(self.transaction[6])
-        if current_payment_index >= 0:
-            self.payment_combo.setCurrentIndex(current_payment_index)
+        self.payment_combo.addItems(PAYMENT_METHODS)
+        select_item(self.payment_combo, PAYMENT_METHODS, self.transaction[6])
         form_layout.addRow("Payment Method:", self.payment_combo)
         
         # Button box
@@ -658,14 +1323,11 @@ class EditTransactionDialog(QDialog):
         """
         try:
             # Get values from form
-            date = self.date_edit.date().toString("yyyy-MM-dd")
+            date = self.date_edit.date().toString(Qt.ISODate)
             
             # Validate amount
-            try:
-                amount = float(self.amount_edit.text())
-                if amount <= 0:
-                    raise ValueError("Amount must be positive!")
-            except ValueError:
+            amount = parse_amount_text(self.amount_edit.text())
+            if amount is None:
                 QMessageBox.warning(self, "Invalid Amount", "Please enter a valid positive number for the amount!")
                 return
                 
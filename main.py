@@ -12,9 +12,11 @@ import os
 from PyQt5.QtWidgets import QApplication, QMessageBox, QSplashScreen
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt, QTimer
-from database import Database
+from database import Database, SQL_INSERT_CATEGORY_ROW
 from finance_tracker import FinanceTracker
-from gui import FinanceTrackerGUI
+
+# Meta flag set once the data files were imported on first run
+DATA_IMPORTED_KEY = "data_files_imported"
 
 def check_data_files():
     """
@@ -58,6 +60,11 @@ def main():
     # Message to display on splash screen
     splash.showMessage("Loading Personal Finance Tracker...", 
                       Qt.AlignCenter | Qt.AlignBottom, Qt.black)
+    app.processEvents()
+    
+    # The GUI pulls in matplotlib and numpy, which take about half a second to
+    # import, so it is imported once the splash screen is painted
+    from gui import FinanceTrackerGUI
     
     # Initialize database
     db = Database()
@@ -72,6 +79,54 @@ def main():
         QMessageBox.critical(None, "Database Error", "Failed to create database tables.")
         return
     
+    # The data files are only looked at until their first import is done
+    if needs_data_import(db):
+        import_data_files(db, splash)
+    
+    # Update splash message
+    splash.showMessage("Creating finance tracker...", 
+                      Qt.AlignCenter | Qt.AlignBottom, Qt.black)
+    
+    # Create finance tracker
+    finance_tracker = FinanceTracker(db)
+    
+    # Update splash message
+    splash.showMessage("Initializing user interface...", 
+                      Qt.AlignCenter | Qt.AlignBottom, Qt.black)
+    
+    # Create GUI, leaving the data to load once the window is shown
+    gui = FinanceTrackerGUI(finance_tracker, populate=False)
+    
+    def populate():
+        gui.populate()
+        # Close splash screen once the window is up
+        splash.finish(gui)
+    
+    # Show GUI, then load its data on the first pass of the event loop
+    gui.show()
+    QTimer.singleShot(0, populate)
+    
+    # Execute application
+    result = app.exec_()
+    
+    # Clean up
+    db.close()
+    
+    return result
+
+def import_data_files(db, splash):
+    """
+    Import categories and transactions from the data files on first run.
+    
+    Categories are imported (or the defaults added) when there are none, and
+    transactions when there are none. Once there are transactions, the meta
+    table records that the import is done, so later launches skip the data
+    files entirely.
+    
+    Args:
+        db: Database instance.
+        splash: Splash screen showing the progress.
+    """
     # Update splash message
     splash.showMessage("Checking for data files...", 
                       Qt.AlignCenter | Qt.AlignBottom, Qt.black)
@@ -80,10 +135,7 @@ def main():
     transactions_file, categories_file = check_data_files()
     
     # First check if any categories exist in the database
-    db.cursor.execute("SELECT COUNT(*) FROM categories")
-    category_count_db = db.cursor.fetchone()[0]
-    
-    if category_count_db == 0:
+    if not table_has_rows(db, "categories"):
         # No categories in database, try to import from CSV first
         if os.path.exists(categories_file):
             splash.showMessage(f"Importing categories from {categories_file}...", 
@@ -92,49 +144,67 @@ def main():
             print(f"Imported {imported_count} categories from {categories_file}")
         
         # If still no categories, add defaults
-        db.cursor.execute("SELECT COUNT(*) FROM categories")
-        if db.cursor.fetchone()[0] == 0:
+        if not table_has_rows(db, "categories"):
             splash.showMessage("Adding default categories...", 
                               Qt.AlignCenter | Qt.AlignBottom, Qt.black)
             add_default_categories(db)
     
     # Now check for transactions
-    db.cursor.execute("SELECT COUNT(*) FROM transactions")
-    transaction_count_db = db.cursor.fetchone()[0]
-    
-    if transaction_count_db == 0 and os.path.exists(transactions_file):
+    if not table_has_rows(db, "transactions") and os.path.exists(transactions_file):
         splash.showMessage(f"Importing transactions from {transactions_file}...", 
                           Qt.AlignCenter | Qt.AlignBottom, Qt.black)
         imported_count = db.import_transactions_from_csv(transactions_file)
         print(f"Imported {imported_count} transactions from {transactions_file}")
     
-    # Update splash message
-    splash.showMessage("Creating finance tracker...", 
-                      Qt.AlignCenter | Qt.AlignBottom, Qt.black)
-    
-    # Create finance tracker
-    finance_tracker = FinanceTracker(db)
-    
-    # Update splash message
-    splash.showMessage("Initializing user interface...", 
-                      Qt.AlignCenter | Qt.AlignBottom, Qt.black)
-    
-    # Create GUI
-    gui = FinanceTrackerGUI(finance_tracker)
+    mark_data_imported(db)
+
+def needs_data_import(db):
+    """
+    Checks whether the data files should be looked at on startup.
     
-    # Close splash screen after a delay
-    QTimer.singleShot(1000, splash.close)
+    Args:
+        db: Database instance.
+        
+    Returns:
+        bool: True until the first import of the data files is recorded.
+    """
+    return db.get_meta(DATA_IMPORTED_KEY) is None
+
+def mark_data_imported(db):
+    """
+    Records that the data files were imported, once there are transactions.
     
-    # Show GUI
-    gui.show()
+    While there are none, a transactions file added later must still be
+    imported, so categories alone (imported or the defaults) don't count.
+    With transactions in the database neither file would be imported again,
+    so from then on the data files are skipped.
     
-    # Execute application
-    result = app.exec_()
+    Args:
+        db: Database instance.
+        
+    Returns:
+        bool: True if the import is recorded as done.
+    """
+    if not table_has_rows(db, "transactions"):
+        return False
+    return db.set_meta(DATA_IMPORTED_KEY, "1")
+
+def table_has_rows(db, table):
+    """
+    Checks whether a table holds any row.
     
-    # Clean up
-    db.close()
+    SQLite keeps no row count, so COUNT(*) scans the whole table; this stops
+    at the first row instead.
     
-    return result
+    Args:
+        db: Database instance.
+        table (str): Name of the table to check.
+        
+    Returns:
+        bool: True if the table has at least one row.
+    """
+    db.cursor.execute(f"SELECT 1 FROM {table} LIMIT 1")
+    return db.cursor.fetchone() is not None
 
 def add_default_categories(db):
     """
@@ -160,16 +230,13 @@ def add_default_categories(db):
     ]
     
     try:
-        for category in default_categories:
-            db.cursor.execute('''
-            INSERT INTO categories
-            (category_id, category_name, monthly_budget, priority_level, icon)
-            VALUES (?, ?, ?, ?, ?)
-            ''', category)
+        # One executemany call inserts every category in a single transaction
+        db.cursor.executemany(SQL_INSERT_CATEGORY_ROW, default_categories)
             
         db.conn.commit()
         print("Added default categories")
     except Exception as e:
+        db.conn.rollback()
         print(f"Error adding default categories: {e}")
 
 if __name__ == "__main__":
@@ -5,14 +5,29 @@
 
 #This module provides a dialog for adding multiple transactions at once.
 
-import sys
+from dataclasses import dataclass
+
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QPushButton, QTableWidget, QTableWidgetItem,
-                           QHeaderView, QMessageBox, QDateEdit, QComboBox,
+                           QPushButton, QMessageBox, QDateEdit, QComboBox,
                            QLineEdit, QScrollArea, QWidget, QFormLayout,
-                           QGroupBox, QCheckBox)
-from PyQt5.QtCore import Qt, QDate
-from datetime import datetime
+                           QGroupBox)
+from PyQt5.QtCore import Qt, QDate, QStringListModel
+
+from finance_tracker import ACCOUNT_TYPES, PAYMENT_METHODS, parse_amount_text
+
+
+@dataclass
+class TransactionForm:
+    """
+    Widgets of one transaction form in the multi-transaction dialog.
+    """
+    group_box: QGroupBox
+    date_edit: QDateEdit
+    amount_edit: QLineEdit
+    category_combo: QComboBox
+    description_edit: QLineEdit
+    account_combo: QComboBox
+    payment_combo: QComboBox
 
 class MultiTransactionDialog(QDialog):
     """
@@ -36,6 +51,14 @@ class MultiTransactionDialog(QDialog):
         
         self.finance_tracker = finance_tracker
         self.transaction_forms = []  # List to store transaction form groups
+        
+        # Category names are read once, and every form's dropdowns share one
+        # item model per field instead of holding their own copy of the items
+        self.category_names = tuple(finance_tracker.get_category_names())
+        self.category_model = QStringListModel(list(self.category_names), self)
+        self.account_model = QStringListModel(list(ACCOUNT_TYPES), self)
+        self.payment_model = QStringListModel(list(PAYMENT_METHODS), self)
+        
         self.init_ui()
         
     def init_ui(self):
@@ -121,7 +144,7 @@ class MultiTransactionDialog(QDialog):
         
         # Category dropdown
         category_combo = QComboBox()
-        category_combo.addItems(self.finance_tracker.get_category_names())
+        category_combo.setModel(self.category_model)
         form_layout.addRow("Category:", category_combo)
         
         # Description field
@@ -131,24 +154,17 @@ class MultiTransactionDialog(QDialog):
         
         # Account type dropdown
         account_combo = QComboBox()
-        account_combo.addItems(["Checking", "Savings", "Credit"])
+        account_combo.setModel(self.account_model)
         form_layout.addRow("Account Type:", account_combo)
         
         # Payment method dropdown
         payment_combo = QComboBox()
-        payment_combo.addItems(["Cash", "Debit Card", "Credit Card", "Bank Transfer", "Mobile Payment"])
+        payment_combo.setModel(self.payment_model)
         form_layout.addRow("Payment Method:", payment_combo)
         
         # Add the form to the list
-        form_data = {
-            'group_box': group_box,
-            'date_edit': date_edit,
-            'amount_edit': amount_edit,
-            'category_combo': category_combo,
-            'description_edit': description_edit,
-            'account_combo': account_combo,
-            'payment_combo': payment_combo
-        }
+        form_data = TransactionForm(group_box, date_edit, amount_edit, category_combo,
+                                    description_edit, account_combo, payment_combo)
         
         self.transaction_forms.append(form_data)
         
@@ -168,65 +184,78 @@ class MultiTransactionDialog(QDialog):
             form_data = self.transaction_forms.pop()
             
             # Remove the group box from the layout
-            self.transactions_layout.removeWidget(form_data['group_box'])
+            self.transactions_layout.removeWidget(form_data.group_box)
             
             # Delete the group box
-            form_data['group_box'].deleteLater()
+            form_data.group_box.deleteLater()
             
             # Disable the remove button if only one transaction remains
             if len(self.transaction_forms) == 1:
                 self.remove_button.setEnabled(False)
                 
+    def read_form(self, form_data, categories):
+        """
+        Reads and validates the values of one transaction form.
+        
+        Args:
+            form_data (TransactionForm): Widgets of the form.
+            categories (set): Names of the existing categories.
+            
+        Returns:
+            tuple: ((date, amount, category, description, account_type,
+                payment_method), None) for a valid form, or (None, error
+                message) for an invalid one.
+        """
+        # Validate amount
+        amount_text = form_data.amount_edit.text()
+        if not amount_text.strip():
+            return None, "Amount is required"
+        amount = parse_amount_text(amount_text)
+        if amount is None:
+            return None, "Amount must be a positive number"
+            
+        category = form_data.category_combo.currentText()
+        if category not in categories:
+            return None, f"Category '{category}' does not exist"
+            
+        return (
+            form_data.date_edit.date().toString(Qt.ISODate),
+            amount,
+            category,
+            form_data.description_edit.text(),
+            form_data.account_combo.currentText(),
+            form_data.payment_combo.currentText(),
+        ), None
+        
     def save_transactions(self):
         """
         Save all transactions to the database.
+        
+        The forms are validated in a single pass and the valid transactions
+        are inserted together, with a single commit.
         """
         successful_count = 0
-        failed_count = 0
         error_messages = []
+        valid_rows = []
+        categories = set(self.category_names)
         
-        # Process each transaction form
-        for form_index, form_data in enumerate(self.transaction_forms):
-            try:
-                # Get values from form
-                date = form_data['date_edit'].date().toString("yyyy-MM-dd")
-                
-                # Validate amount
-                try:
-                    amount_text = form_data['amount_edit'].text()
-                    if not amount_text:
-                        raise ValueError(f"Transaction #{form_index+1}: Amount is required")
-                        
-                    amount = float(amount_text)
-                    if amount <= 0:
-                        raise ValueError(f"Transaction #{form_index+1}: Amount must be positive")
-                except ValueError as e:
-                    if "could not convert string to float" in str(e):
-                        error_messages.append(f"Transaction #{form_index+1}: Invalid amount format")
-                    else:
-                        error_messages.append(str(e))
-                    failed_count += 1
-                    continue
-                    
-                category = form_data['category_combo'].currentText()
-                description = form_data['description_edit'].text()
-                account_type = form_data['account_combo'].currentText()
-                payment_method = form_data['payment_combo'].currentText()
-                
-                # Add transaction
-                result = self.finance_tracker.add_transaction(
-                    date, amount, category, description, account_type, payment_method
-                )
-                
-                if result > 0:
-                    successful_count += 1
-                else:
-                    failed_count += 1
-                    error_messages.append(f"Transaction #{form_index+1}: Failed to add to database")
-                    
-            except Exception as e:
-                failed_count += 1
-                error_messages.append(f"Transaction #{form_index+1}: {str(e)}")
+        # Validate every form first, then insert the valid ones together
+        for form_index, form_data in enumerate(self.transaction_forms, 1):
+            row, error = self.read_form(form_data, categories)
+            if error is None:
+                valid_rows.append(row)
+            else:
+                error_messages.append(f"Transaction #{form_index}: {error}")
+        failed_count = len(error_messages)
+            
+        # Add all valid transactions with one executemany call and one commit
+        if valid_rows:
+            result = self.finance_tracker.add_transactions(valid_rows)
+            if result > 0:
+                successful_count = result
+            else:
+                failed_count += len(valid_rows)
+                error_messages.append("Failed to add the transactions to the database")
                 
         # Show results
         if successful_count > 0:
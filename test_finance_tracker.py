@@ -6,49 +6,75 @@
 #This module contains extensive tests for the database, finance tracker,
 #data visualization, and transaction processing components.
 
-import sys
 import os
 import pytest
 import sqlite3
 from datetime import datetime, timedelta
 import calendar
-import tempfile
-import shutil
+import csv
+from collections import defaultdict
 
-# Add parent directory to path for importing modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database import Database, SQL_INSERT_CATEGORY_ROW, TXN_COLUMNS
+from finance_tracker import FinanceTracker, parse_amount_text
+from main import add_default_categories, needs_data_import, mark_data_imported
 
-from database import Database
-from finance_tracker import FinanceTracker
-
-# Use a temporary database for testing
+# Tests run on in-memory databases; this file is only used by the tests
+# that need a database on disk
 TEST_DB = "test_finance.db"
 
+# Inserts a sample transaction with its id
+SQL_INSERT_SAMPLE_TXN = f"INSERT INTO transactions ({TXN_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+
 @pytest.fixture
 def cleanup_test_db():
     """
     Fixture to clean up test database before and after tests.
     """
-    # Remove test database if it exists before test
-    if os.path.exists(TEST_DB):
-        os.remove(TEST_DB)
+    # Remove test database (and its WAL files) if it exists before test
+    for path in (TEST_DB, TEST_DB + "-wal", TEST_DB + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
         
     # Execute test
     yield
     
-    # Remove test database after test
-    if os.path.exists(TEST_DB):
-        os.remove(TEST_DB)
+    # Remove test database (and its WAL files) after test
+    for path in (TEST_DB, TEST_DB + "-wal", TEST_DB + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
 
-@pytest.fixture
-def database(cleanup_test_db):
+@pytest.fixture(scope="session")
+def test_dates():
     """
-    Fixture to create a test database with sample data.
+    Fixture to work out the sample data's dates once, so the seeded rows and the
+    assertions agree even if the session runs past midnight.
     
     Returns:
-        Database: A database instance for testing.
+        dict: Dates of the sample transactions and the labels of their months.
     """
-    db = Database(TEST_DB)
+    today = datetime.now()
+    last_month = today.replace(day=1) - timedelta(days=1)
+    two_months_ago = last_month.replace(day=1) - timedelta(days=1)
+    
+    return {
+        "today": today.strftime("%Y-%m-%d"),
+        "current_month": today.replace(day=15).strftime("%Y-%m-%d"),
+        "last_month": last_month.replace(day=15).strftime("%Y-%m-%d"),
+        "two_months_ago": two_months_ago.replace(day=15).strftime("%Y-%m-%d"),
+        "this_month_label": today.strftime("%b %Y"),
+        "last_month_label": last_month.strftime("%b %Y"),
+        "two_months_ago_label": two_months_ago.strftime("%b %Y")
+    }
+
+@pytest.fixture(scope="session")
+def seeded_database(test_dates):
+    """
+    Fixture to build the sample database once for the whole test session.
+    
+    Yields:
+        Database: An in-memory database with the sample data.
+    """
+    db = Database(":memory:")
     db.connect()
     db.create_tables()
     
@@ -61,19 +87,13 @@ def database(cleanup_test_db):
         (5, "Transportation", 250.00, "Medium", "car")
     ]
     
-    for category in categories:
-        db.cursor.execute('''
-        INSERT INTO categories
-        (category_id, category_name, monthly_budget, priority_level, icon)
-        VALUES (?, ?, ?, ?, ?)
-        ''', category)
+    db.cursor.executemany(SQL_INSERT_CATEGORY_ROW, categories)
     
     # Add sample transactions
     # Create transactions spanning multiple months
-    today = datetime.now()
-    current_month = today.replace(day=15).strftime("%Y-%m-%d")
-    last_month = (today.replace(day=1) - timedelta(days=1)).replace(day=15).strftime("%Y-%m-%d")
-    two_months_ago = (today.replace(day=1) - timedelta(days=32)).replace(day=15).strftime("%Y-%m-%d")
+    current_month = test_dates["current_month"]
+    last_month = test_dates["last_month"]
+    two_months_ago = test_dates["two_months_ago"]
     
     transactions = [
         (1001, current_month, 45.67, "Groceries", "Current Month Grocery", "Checking", "Debit Card"),
@@ -85,16 +105,35 @@ def database(cleanup_test_db):
         (1007, two_months_ago, 22.50, "Transportation", "Two Months Ago Transportation", "Credit", "Credit Card")
     ]
     
-    for transaction in transactions:
-        db.cursor.execute('''
-        INSERT INTO transactions
-        (transaction_id, date, amount, category, description, account_type, payment_method)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', transaction)
+    db.cursor.executemany(SQL_INSERT_SAMPLE_TXN, transactions)
     
     db.conn.commit()
     
-    return db
+    # Gives the query planner statistics for the seeded tables; the copies keep them
+    db.cursor.execute("ANALYZE")
+    
+    yield db
+    
+    db.close()
+
+@pytest.fixture
+def database(seeded_database):
+    """
+    Fixture to create a test database with sample data.
+    
+    Each test gets its own in-memory copy of the session's seeded database,
+    so tests that change data don't affect each other.
+    
+    Yields:
+        Database: A database instance for testing.
+    """
+    db = Database(":memory:")
+    db.connect()
+    seeded_database.conn.backup(db.conn)
+    
+    yield db
+    
+    db.close()
 
 @pytest.fixture
 def finance_tracker(database):
@@ -109,17 +148,15 @@ def finance_tracker(database):
     """
     return FinanceTracker(database)
 
-@pytest.fixture
-def temp_csv_dir():
+@pytest.fixture(scope="session")
+def temp_csv_dir(tmp_path_factory):
     """
-    Fixture to create a temporary directory for CSV files.
+    Fixture to create a temporary directory for CSV files, shared by the session.
     
     Returns:
         str: Path to temporary directory.
     """
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir)
+    return str(tmp_path_factory.mktemp("csv"))
 
 #Test 1: Database Creation and Tables
 def test_database_creation(database):
@@ -129,113 +166,65 @@ def test_database_creation(database):
     Args:
         database: The test database fixture.
     """
-    # Check that tables exist
-    database.cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = database.cursor.fetchall()
-    table_names = [table[0] for table in tables]
+    # Fetch the columns of both tables in one query
+    database.cursor.execute('''
+    SELECT m.name, p.name
+    FROM sqlite_master AS m, pragma_table_info(m.name) AS p
+    WHERE m.type = 'table' AND m.name IN ('categories', 'transactions')
+    ''')
+    table_columns = defaultdict(set)
+    for table, column in database.cursor.fetchall():
+        table_columns[table].add(column)
     
     # Verify both tables exist
-    assert "categories" in table_names
-    assert "transactions" in table_names
+    assert set(table_columns) == {"categories", "transactions"}
     
     # Verify categories table schema
-    database.cursor.execute("PRAGMA table_info(categories)")
-    category_columns = database.cursor.fetchall()
-    category_column_names = [col[1] for col in category_columns]
-    
-    assert "category_id" in category_column_names
-    assert "category_name" in category_column_names
-    assert "monthly_budget" in category_column_names
-    assert "priority_level" in category_column_names
-    assert "icon" in category_column_names
+    assert {"category_id", "category_name", "monthly_budget", "priority_level", "icon"} <= table_columns["categories"]
     
     # Verify transactions table schema
-    database.cursor.execute("PRAGMA table_info(transactions)")
-    transaction_columns = database.cursor.fetchall()
-    transaction_column_names = [col[1] for col in transaction_columns]
-    
-    assert "transaction_id" in transaction_column_names
-    assert "date" in transaction_column_names
-    assert "amount" in transaction_column_names
-    assert "category" in transaction_column_names
-    assert "description" in transaction_column_names
-    assert "account_type" in transaction_column_names
-    assert "payment_method" in transaction_column_names
+    assert {"transaction_id", "date", "amount", "category", "description",
+            "account_type", "payment_method"} <= table_columns["transactions"]
 
 #Test 2: Budget Calculation with Different Time Periods
-def test_budget_calculation_time_periods(finance_tracker):
+@pytest.mark.parametrize("time_period, category, spent, monthly_budget, budget_multiplier", [
+    ("month", "Groceries", 45.67, 500.00, 1),
+    ("month", "Dining", 35.50, 300.00, 1),
+    ("prev_month", "Groceries", 42.30, 500.00, 1),
+    # Utilities only appears in two_months_ago; the budget is multiplied by 12 for annual view
+    ("year", "Utilities", 33.45, 350.00, 12)
+])
+def test_budget_calculation_time_periods(finance_tracker, time_period, category, spent, monthly_budget, budget_multiplier):
     """
     Test that budget usage is calculated correctly for different time periods.
     
     Args:
         finance_tracker: The finance tracker fixture.
+        time_period: The time period the budget usage is calculated for.
+        category: The category to check.
+        spent: The expected spending of the category.
+        monthly_budget: The monthly budget of the category.
+        budget_multiplier: The number of months of budget in the time period.
     """
-    # Get budget usage for current month
-    current_month_usage = finance_tracker.calculate_budget_usage("month")
-    
-    # Convert to dictionary for easier checking
-    current_month_dict = {category: (spent, budget, percentage) 
-                          for category, spent, budget, percentage in current_month_usage}
-    
-    # Check Groceries budget for current month
-    assert "Groceries" in current_month_dict
-    groceries_spent, groceries_budget, groceries_percentage = current_month_dict["Groceries"]
-    assert groceries_spent == 45.67
-    assert groceries_budget == 500.00
-    assert groceries_percentage == pytest.approx(45.67 / 500.00 * 100)
-    
-    # Check Dining budget for current month
-    assert "Dining" in current_month_dict
-    dining_spent, dining_budget, dining_percentage = current_month_dict["Dining"]
-    assert dining_spent == 35.50
-    assert dining_budget == 300.00
-    assert dining_percentage == pytest.approx(35.50 / 300.00 * 100)
-    
-    # Get budget usage for previous month
-    prev_month_usage = finance_tracker.calculate_budget_usage("prev_month")
-    
-    # Convert to dictionary for easier checking
-    prev_month_dict = {category: (spent, budget, percentage) 
-                       for category, spent, budget, percentage in prev_month_usage}
-    
-    # Check Groceries budget for previous month
-    assert "Groceries" in prev_month_dict
-    groceries_spent, groceries_budget, groceries_percentage = prev_month_dict["Groceries"]
-    assert groceries_spent == 42.30
-    assert groceries_budget == 500.00
-    assert groceries_percentage == pytest.approx(42.30 / 500.00 * 100)
-    
-    # Get budget usage for current year (should use multiplier for the budget)
-    year_usage = finance_tracker.calculate_budget_usage("year")
-    
-    # Convert to dictionary for easier checking
-    year_dict = {category: (spent, budget, percentage) 
-                for category, spent, budget, percentage in year_usage}
-    
-    # Check Utilities budget for the year (only appears in two_months_ago)
-    assert "Utilities" in year_dict
-    utilities_spent, utilities_budget, utilities_percentage = year_dict["Utilities"]
-    assert utilities_spent == 33.45
-    
-    # Budget should be multiplied by 12 for annual view
-    assert utilities_budget == pytest.approx(350.00 * 12)
-    assert utilities_percentage == pytest.approx(33.45 / (350.00 * 12) * 100)
+    # Get budget usage for the time period, keyed by category
+    usage = {row[0]: row[1:] for row in finance_tracker.calculate_budget_usage(time_period)}
+    
+    # Check the spending, budget and percentage of the category
+    budget = monthly_budget * budget_multiplier
+    assert usage.get(category) == (spent, budget, pytest.approx(spent / budget * 100))
 
 #Test 3: Transaction Addition and Retrieval
-def test_transaction_addition_retrieval(finance_tracker):
+def test_transaction_addition_retrieval(finance_tracker, test_dates):
     """
     Test adding a new transaction and retrieving transactions by various criteria.
     
     Args:
         finance_tracker: The finance tracker fixture.
+        test_dates: The dates of the sample data.
     """
-    # Get initial transaction count
-    initial_transactions = finance_tracker.get_recent_transactions(20)
-    initial_count = len(initial_transactions)
-    
     # Add a new transaction
     new_transaction_id = finance_tracker.add_transaction(
-        datetime.now().strftime("%Y-%m-%d"),
+        test_dates["today"],
         75.25,
         "Groceries",
         "Test Transaction",
@@ -246,9 +235,10 @@ def test_transaction_addition_retrieval(finance_tracker):
     # Check that transaction was added successfully
     assert new_transaction_id > 0
     
-    # Get updated transaction count
+    # The sample data has 7 transactions, so the recent ones now include 8
     updated_transactions = finance_tracker.get_recent_transactions(20)
-    assert len(updated_transactions) == initial_count + 1
+    assert len(updated_transactions) == 8
+    assert new_transaction_id in {transaction[0] for transaction in updated_transactions}
     
     # Get the added transaction
     added_transaction = finance_tracker.get_transaction(new_transaction_id)
@@ -262,21 +252,16 @@ def test_transaction_addition_retrieval(finance_tracker):
     assert len(groceries_transactions) >= 3  # At least 3 (2 from fixture + 1 added)
     
     # Find the new transaction in category-filtered results
-    new_transaction_in_category = False
-    for transaction in groceries_transactions:
-        if transaction[0] == new_transaction_id:
-            new_transaction_in_category = True
-            break
-    
-    assert new_transaction_in_category
+    assert new_transaction_id in {transaction[0] for transaction in groceries_transactions}
 
 #Test 4: Spending Trend Analysis
-def test_spending_trend_analysis(finance_tracker):
+def test_spending_trend_analysis(finance_tracker, test_dates):
     """
     Test that spending trends are correctly calculated over multiple months.
     
     Args:
         finance_tracker: The finance tracker fixture.
+        test_dates: The dates of the sample data.
     """
     # Get spending trend for the last 3 months
     trend_data = finance_tracker.get_spending_trend(3)
@@ -284,16 +269,10 @@ def test_spending_trend_analysis(finance_tracker):
     # Check that we have data for 3 months
     assert len(trend_data) == 3
     
-    # Extract month strings for easier comparison
-    this_month = datetime.now().strftime("%b %Y")
-    
-    # Get previous month
-    last_month_date = datetime.now().replace(day=1) - timedelta(days=1)
-    last_month = last_month_date.strftime("%b %Y")
-    
-    # Get two months ago
-    two_months_ago_date = last_month_date.replace(day=1) - timedelta(days=1)
-    two_months_ago = two_months_ago_date.strftime("%b %Y")
+    # Month labels of the sample data
+    this_month = test_dates["this_month_label"]
+    last_month = test_dates["last_month_label"]
+    two_months_ago = test_dates["two_months_ago_label"]
     
     # Check that all months are in the trend data
     assert this_month in trend_data
@@ -306,16 +285,17 @@ def test_spending_trend_analysis(finance_tracker):
     assert trend_data[two_months_ago] == pytest.approx(33.45 + 22.50)  # Sum of two months ago transactions
 
 #Test 5: Transaction Update and Deletion
-def test_transaction_update_deletion(finance_tracker):
+def test_transaction_update_deletion(finance_tracker, test_dates):
     """
     Test updating and deleting transactions.
     
     Args:
         finance_tracker: The finance tracker fixture.
+        test_dates: The dates of the sample data.
     """
     # Add a test transaction
     test_transaction_id = finance_tracker.add_transaction(
-        datetime.now().strftime("%Y-%m-%d"),
+        test_dates["today"],
         50.00,
         "Groceries",
         "Transaction to Update",
@@ -332,7 +312,7 @@ def test_transaction_update_deletion(finance_tracker):
     # Update the transaction
     update_success = finance_tracker.update_transaction(
         test_transaction_id,
-        datetime.now().strftime("%Y-%m-%d"),
+        test_dates["today"],
         75.00,  # New amount
         "Dining",  # New category
         "Updated Transaction",  # New description
@@ -410,11 +390,14 @@ def test_csv_import(finance_tracker, database, temp_csv_dir):
     """
     # Create a test CSV file
     csv_file = os.path.join(temp_csv_dir, "test_transactions.csv")
-    with open(csv_file, 'w') as f:
-        f.write("transaction_id,date,amount,category,description,account_type,payment_method\n")
-        f.write("2001,2025-05-01,22.99,Groceries,CSV Import Test 1,Checking,Debit Card\n")
-        f.write("2002,2025-05-02,15.50,Entertainment,CSV Import Test 2,Credit,Credit Card\n")
-        f.write("2003,2025-05-03,45.75,Dining,CSV Import Test 3,Credit,Credit Card\n")
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["transaction_id", "date", "amount", "category", "description", "account_type", "payment_method"])
+        writer.writerows([
+            (2001, "2025-05-01", 22.99, "Groceries", "CSV Import Test 1", "Checking", "Debit Card"),
+            (2002, "2025-05-02", 15.50, "Entertainment", "CSV Import Test 2", "Credit", "Credit Card"),
+            (2003, "2025-05-03", 45.75, "Dining", "CSV Import Test 3", "Credit", "Credit Card")
+        ])
     
     # Get initial transaction count
     database.cursor.execute("SELECT COUNT(*) FROM transactions")
@@ -426,25 +409,465 @@ def test_csv_import(finance_tracker, database, temp_csv_dir):
     # Verify correct number of transactions were imported
     assert import_count == 3
     
-    # Get updated transaction count
-    database.cursor.execute("SELECT COUNT(*) FROM transactions")
-    updated_count = database.cursor.fetchone()[0]
+    # Fetch the new count, the imported rows and one imported transaction in one query
+    database.cursor.execute('''
+    SELECT (SELECT COUNT(*) FROM transactions),
+           (SELECT COUNT(*) FROM transactions WHERE description LIKE 'CSV Import Test%'),
+           amount, category, account_type, payment_method
+    FROM transactions
+    WHERE description = 'CSV Import Test 2'
+    ''')
+    test_transaction = database.cursor.fetchone()
+    assert test_transaction is not None
+    updated_count, imported_count, amount, category, account_type, payment_method = test_transaction
     
     # Verify the transaction count increased by the number of imported transactions
     assert updated_count == initial_count + 3
     
     # Verify the imported transactions are in the database
-    database.cursor.execute("SELECT * FROM transactions WHERE description LIKE 'CSV Import Test%'")
-    imported_transactions = database.cursor.fetchall()
-    
-    assert len(imported_transactions) == 3
+    assert imported_count == 3
     
     # Verify details of one of the imported transactions
-    database.cursor.execute("SELECT * FROM transactions WHERE description = 'CSV Import Test 2'")
-    test_transaction = database.cursor.fetchone()
+    assert amount == 15.50
+    assert category == "Entertainment"
+    assert account_type == "Credit"
+    assert payment_method == "Credit Card"
+
+#Test 8: Bulk Transaction Addition
+def test_bulk_transaction_addition(finance_tracker, database):
+    """
+    Test adding several transactions in one call, committed only when requested.
     
-    assert test_transaction is not None
-    assert test_transaction[2] == 15.50  # Amount
-    assert test_transaction[3] == "Entertainment"  # Category
-    assert test_transaction[5] == "Credit"  # Account type
-    assert test_transaction[6] == "Credit Card"  # Payment method
\ No newline at end of file
+    Args:
+        finance_tracker: The finance tracker fixture.
+        database: The database fixture.
+    """
+    transactions = [
+        ("2025-05-10", 11.00, "Groceries", "Bulk Test 1", "Checking", "Debit Card"),
+        ("2025-05-11", 22.00, "Dining", "Bulk Test 2", "Credit", "Credit Card"),
+        ("2025-05-12", 33.00, "Utilities", "Bulk Test 3", "Checking", "Bank Transfer"),
+    ]
+    
+    # Insert without committing and roll back
+    assert finance_tracker.add_transactions(transactions, commit=False) == 3
+    database.conn.rollback()
+    database.cursor.execute("SELECT COUNT(*) FROM transactions WHERE description LIKE 'Bulk Test%'")
+    assert database.cursor.fetchone()[0] == 0
+    
+    # Insert and commit
+    assert finance_tracker.add_transactions(transactions) == 3
+    database.cursor.execute("SELECT amount FROM transactions WHERE description LIKE 'Bulk Test%' ORDER BY date")
+    assert [row[0] for row in database.cursor.fetchall()] == [11.00, 22.00, 33.00]
+
+#Test 9: Monthly Spending Totals
+def test_monthly_totals(finance_tracker, database):
+    """
+    Test that the spending of each month is totalled by a single query.
+    
+    Args:
+        finance_tracker: The finance tracker fixture.
+        database: The database fixture.
+    """
+    today = datetime.now()
+    two_months_ago = (today.replace(day=1) - timedelta(days=32)).replace(day=1)
+    last_day = calendar.monthrange(today.year, today.month)[1]
+    
+    totals = database.get_monthly_totals(two_months_ago.strftime("%Y-%m-%d"), today.replace(day=last_day).strftime("%Y-%m-%d"))
+    
+    # The sample data has transactions in the last three months
+    assert len(totals) == 3
+    assert round(totals[today.strftime("%Y-%m")], 2) == round(45.67 + 35.50 + 25.99, 2)
+    assert round(totals[two_months_ago.strftime("%Y-%m")], 2) == round(33.45 + 22.50, 2)
+    
+    # Months outside the range are not included
+    assert database.get_monthly_totals("2000-01-01", "2000-12-31") == {}
+
+#Test 10: Budget Comparison Query
+def test_budget_comparison(database):
+    """
+    Test that the budget and the spending of every category are returned together.
+    
+    Args:
+        database: The database fixture.
+    """
+    today = datetime.now()
+    start_date = today.replace(day=1).strftime("%Y-%m-%d")
+    end_date = today.replace(day=calendar.monthrange(today.year, today.month)[1]).strftime("%Y-%m-%d")
+    
+    comparison = {category: (budget, spent) for category, budget, spent in database.get_budget_comparison(start_date, end_date)}
+    
+    # Every category has a budget, so all of them are included
+    assert len(comparison) == 5
+    assert comparison["Groceries"] == (500.00, 45.67)
+    assert comparison["Dining"] == (300.00, 35.50)
+    
+    # Categories without spending in the current month report zero
+    assert comparison["Utilities"] == (350.00, 0)
+
+#Test 11: Monthly Spending Rollup
+def test_monthly_spending_rollup(finance_tracker, database):
+    """
+    Test that spending stays correct for whole and partial months as transactions change.
+    
+    Args:
+        finance_tracker: The finance tracker fixture.
+        database: The database fixture.
+    """
+    database.cursor.execute("DELETE FROM transactions")
+    database.conn.commit()
+    
+    first_id = finance_tracker.add_transaction("2025-03-10", 10.25, "Groceries", "Rollup 1", "Checking", "Debit Card")
+    finance_tracker.add_transaction("2025-03-31", 5.50, "Groceries", "Rollup 2", "Checking", "Debit Card")
+    finance_tracker.add_transaction("2025-04-15", 20.00, "Groceries", "Rollup 3", "Checking", "Debit Card")
+    finance_tracker.add_transaction("2025-05-02", 7.00, "Dining", "Rollup 4", "Credit", "Credit Card")
+    
+    # Whole months, partial months and a range within a single month
+    assert database.get_spending_by_category("2025-03-01", "2025-04-30") == [("Groceries", 35.75)]
+    assert database.get_spending_by_category("2025-03-15", "2025-05-01") == [("Groceries", 25.50)]
+    assert database.get_spending_by_category("2025-03-05", "2025-03-20") == [("Groceries", 10.25)]
+    assert dict(database.get_spending_by_category()) == {"Groceries": 35.75, "Dining": 7.00}
+    
+    # Moving and deleting transactions updates the monthly totals
+    finance_tracker.update_transaction(first_id, "2025-05-20", 10.25, "Dining", "Rollup 1", "Credit", "Credit Card")
+    assert dict(database.get_spending_by_category("2025-05-01", "2025-05-31")) == {"Dining": 17.25}
+    finance_tracker.delete_transaction(first_id)
+    assert database.get_spending_by_category("2025-03-01", "2025-05-31") == [("Groceries", 25.50), ("Dining", 7.00)]
+
+#Test 12: Database Context Manager
+def test_database_context_manager(cleanup_test_db):
+    """
+    Test that the database connects once inside a with block and closes after it.
+    
+    Args:
+        cleanup_test_db: Fixture removing the test database file.
+    """
+    with Database(TEST_DB) as db:
+        assert db.create_tables()
+        conn = db.conn
+        
+        # Connecting again keeps the same connection
+        assert db.connect()
+        assert db.conn is conn
+        
+    assert db.conn is None
+    assert db.readers is None
+
+#Test 13: Amount Input Parsing
+def test_parse_amount_text():
+    """
+    Test that typed amounts accept currency formatting and reject invalid values.
+    """
+    assert parse_amount_text("12.5") == 12.5
+    assert parse_amount_text(" $1,234.50 ") == 1234.50
+    
+    for text in ("", "abc", "0", "-5", "nan", "inf", "$"):
+        assert parse_amount_text(text) is None
+
+#Test 14: Meta Flags
+def test_meta_flags(database):
+    """
+    Test that application flags are stored and replaced in the meta table.
+    
+    Args:
+        database: The database fixture.
+    """
+    assert database.get_meta("data_files_imported") is None
+    
+    assert database.set_meta("data_files_imported", "1")
+    assert database.get_meta("data_files_imported") == "1"
+    
+    assert database.set_meta("data_files_imported", "2")
+    assert database.get_meta("data_files_imported") == "2"
+
+#Test 15: CSV Re-import and Monthly Rollup
+def test_csv_reimport_rollup(database, temp_csv_dir):
+    """
+    Test that re-importing existing transaction IDs keeps the monthly rollup correct.
+    
+    Args:
+        database: The database fixture.
+        temp_csv_dir: Temporary directory for CSV files.
+    """
+    header = ["transaction_id", "date", "amount", "category", "description", "account_type", "payment_method"]
+    rows = [
+        [3001, "2025-06-01", "12.25", "Groceries", "Re-import Test 1", "Checking", "Debit Card"],
+        [3002, "2025-06-15", "40.00", "Dining", "Re-import Test 2", "Credit", "Credit Card"],
+        [3003, "2025-07-02", "9.99", "Utilities", "Re-import Test 3", "Checking", "Bank Transfer"]
+    ]
+    csv_file = os.path.join(temp_csv_dir, "reimport_transactions.csv")
+    
+    def write_csv():
+        with open(csv_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+            
+    def rollup_matches_transactions():
+        database.cursor.execute('''
+        SELECT category, substr(date, 1, 7), SUM(CAST(ROUND(amount * 100) AS INTEGER))
+        FROM transactions GROUP BY 1, 2
+        ''')
+        expected = {(category, month): cents for category, month, cents in database.cursor.fetchall() if cents}
+        database.cursor.execute("SELECT category, month, total_cents FROM category_month_totals WHERE total_cents != 0")
+        return {(category, month): cents for category, month, cents in database.cursor.fetchall()} == expected
+    
+    # Importing the same file twice replaces the rows instead of counting them again
+    write_csv()
+    assert database.import_transactions_from_csv(csv_file) == 3
+    assert database.import_transactions_from_csv(csv_file) == 3
+    database.cursor.execute("SELECT COUNT(*) FROM transactions WHERE description LIKE 'Re-import Test%'")
+    assert database.cursor.fetchone()[0] == 3
+    assert rollup_matches_transactions()
+    assert dict(database.get_spending_by_category("2025-06-01", "2025-06-30")) == {"Dining": 40.00, "Groceries": 12.25}
+    
+    # Re-importing changed amounts, categories and dates moves the spending with them
+    rows[0][2] = "20.00"
+    rows[1][3] = "Entertainment"
+    rows[2][1] = "2025-06-20"
+    write_csv()
+    assert database.import_transactions_from_csv(csv_file) == 3
+    assert rollup_matches_transactions()
+    assert dict(database.get_spending_by_category("2025-06-01", "2025-06-30")) == {
+        "Entertainment": 40.00, "Groceries": 20.00, "Utilities": 9.99}
+
+#Test 16: CSV Import of Malformed Amounts
+def test_csv_import_malformed_amount(database, temp_csv_dir):
+    """
+    Test that a malformed amount after the sample rows only skips its own row.
+    
+    Args:
+        database: The database fixture.
+        temp_csv_dir: Temporary directory for CSV files.
+    """
+    csv_file = os.path.join(temp_csv_dir, "malformed_transactions.csv")
+    rows = [(4000 + i, "2025-08-01", 1.50, "Groceries", f"Malformed Test {i}", "Checking", "Debit Card")
+            for i in range(15)]
+    rows.append((4100, "2025-08-02", "abc", "Groceries", "Malformed Test bad", "Checking", "Debit Card"))
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["transaction_id", "date", "amount", "category", "description", "account_type", "payment_method"])
+        writer.writerows(rows)
+        
+    # Every valid row is imported and stored as a number
+    assert database.import_transactions_from_csv(csv_file) == 15
+    database.cursor.execute("SELECT COUNT(*), SUM(typeof(amount) = 'real') FROM transactions WHERE description LIKE 'Malformed Test%'")
+    assert database.cursor.fetchone() == (15, 15)
+
+#Test 17: Database Without Reader Pool
+def test_database_without_reader_pool(cleanup_test_db):
+    """
+    Test that a database connected with readers=0 reads through its main connection.
+    
+    Args:
+        cleanup_test_db: Fixture removing the test database file.
+    """
+    db = Database(TEST_DB)
+    assert db.connect(readers=0)
+    assert db.create_tables()
+    assert db.readers is None
+    
+    # Reads go through the main connection
+    assert db.get_meta("data_files_imported") is None
+    assert db.set_meta("data_files_imported", "1")
+    assert db.get_meta("data_files_imported") == "1"
+    
+    db.close()
+    assert db.conn is None
+
+#Test 18: Spending With Refunds
+def test_spending_with_refunds(finance_tracker, database):
+    """
+    Test that refunds are kept unless only positive spending is asked for.
+    
+    Args:
+        finance_tracker: The finance tracker fixture.
+        database: The database fixture.
+    """
+    finance_tracker.add_transactions([
+        ("2025-09-10", 30.00, "Groceries", "Refund Test 1", "Checking", "Debit Card"),
+        ("2025-09-12", -12.50, "Dining", "Refund Test 2", "Credit", "Credit Card"),
+        ("2025-09-14", 8.00, "Utilities", "Refund Test 3", "Checking", "Bank Transfer"),
+        ("2025-09-15", -8.00, "Utilities", "Refund Test 4", "Checking", "Bank Transfer")
+    ])
+    
+    # Refunds are kept; categories summing to zero are left out
+    assert database.get_spending_by_category("2025-09-01", "2025-09-30") == [("Groceries", 30.00), ("Dining", -12.50)]
+    assert database.get_spending_by_category("2025-09-05", "2025-09-20") == [("Groceries", 30.00), ("Dining", -12.50)]
+    assert database.get_spending_by_month(2025, 9) == [("Groceries", 30.00), ("Dining", -12.50)]
+    
+    # The pie chart only asks for positive spending
+    assert database.get_spending_by_category("2025-09-01", "2025-09-30", positive_only=True) == [("Groceries", 30.00)]
+
+#Test 19: Top Budget Usage and Its Cache
+def test_budget_usage_top_k_and_cache(finance_tracker, test_dates):
+    """
+    Test the top_k budget usage and that its cache is refreshed after an insert.
+    
+    Args:
+        finance_tracker: The finance tracker fixture.
+        test_dates: The dates of the sample data.
+    """
+    # Entertainment (13.0%) and Dining (11.8%) used the most of their budgets this month
+    top_categories = finance_tracker.calculate_budget_usage("month", top_k=2)
+    assert [row[0] for row in top_categories] == ["Entertainment", "Dining"]
+    
+    # The full usage is sorted the same way, and the cached copy returned again
+    usage = finance_tracker.calculate_budget_usage("month")
+    assert [row[0] for row in usage][:3] == ["Entertainment", "Dining", "Groceries"]
+    usage.clear()
+    assert finance_tracker.calculate_budget_usage("month")[:2] == top_categories
+    assert finance_tracker.calculate_budget_usage("month", top_k=2) == top_categories
+    
+    # Adding a transaction invalidates the cached usage
+    finance_tracker.add_transaction(test_dates["today"], 450.00, "Groceries", "Cache Test", "Checking", "Debit Card")
+    assert finance_tracker.calculate_budget_usage("month", top_k=1)[0] == (
+        "Groceries", pytest.approx(495.67), 500.00, pytest.approx(495.67 / 500.00 * 100))
+    
+    # Spending passed in by the caller is used instead of querying it
+    usage = finance_tracker.calculate_budget_usage("prev_month", spending=[("Utilities", 35.00)])
+    assert usage[0] == ("Utilities", 35.00, 350.00, pytest.approx(10.0))
+
+#Test 20: Category CSV Import
+def test_category_csv_import(finance_tracker, database, temp_csv_dir):
+    """
+    Test importing categories from a CSV file, updating existing ones and skipping malformed rows.
+    
+    Args:
+        finance_tracker: The finance tracker fixture.
+        database: The database fixture.
+        temp_csv_dir: Temporary directory for CSV files.
+    """
+    csv_file = os.path.join(temp_csv_dir, "test_categories.csv")
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["category_id", "category_name", "monthly_budget", "priority_level", "icon"])
+        writer.writerows([
+            (2, "Dining", 20.00, "Medium", "food"),
+            (6, "Healthcare", 150.00, "High", "health"),
+            ("x", "Broken", "abc", "Low", "none")
+        ])
+        
+    # The malformed row is skipped
+    assert database.import_categories_from_csv(csv_file) == 2
+    
+    # New categories are added and existing ones take the new budget
+    categories = {category[1]: category[2] for category in finance_tracker.get_all_categories()}
+    assert len(categories) == 6
+    assert categories["Healthcare"] == 150.00
+    assert categories["Dining"] == 20.00
+    assert "Broken" not in categories
+    
+    # The transactions of the updated category are kept and count against the new budget
+    assert [row[0] for row in finance_tracker.get_over_budget_categories()] == ["Dining"]
+
+#Test 21: Failed Bulk Transaction Addition
+def test_failed_bulk_transaction_addition(finance_tracker, database):
+    """
+    Test that a batch with an invalid row leaves none of its rows behind, and keeps earlier batches.
+    
+    Args:
+        finance_tracker: The finance tracker fixture.
+        database: The database fixture.
+    """
+    first_batch = [("2025-05-10", 11.00, "Groceries", "Batch Test 1", "Checking", "Debit Card")]
+    failing_batch = [
+        ("2025-05-11", 22.00, "Dining", "Batch Test 2", "Credit", "Credit Card"),
+        ("2025-05-12", 33.00, "Unknown", "Batch Test 3", "Checking", "Bank Transfer"),
+    ]
+    
+    # The failed batch is undone in the open transaction, the earlier one is kept
+    assert finance_tracker.add_transactions(first_batch, commit=False) == 1
+    assert finance_tracker.add_transactions(failing_batch, commit=False) == -1
+    database.conn.commit()
+    database.cursor.execute("SELECT description FROM transactions WHERE description LIKE 'Batch Test%'")
+    assert [row[0] for row in database.cursor.fetchall()] == ["Batch Test 1"]
+    
+    # A committed call that fails keeps nothing and leaves no transaction open
+    assert finance_tracker.add_transactions(failing_batch) == -1
+    assert not database.conn.in_transaction
+    database.cursor.execute("SELECT COUNT(*) FROM transactions WHERE description LIKE 'Batch Test%'")
+    assert database.cursor.fetchone()[0] == 1
+
+#Test 22: Data File Import on Startup
+def test_data_import_startup_decision():
+    """
+    Test that the data files stay due for import until there are transactions.
+    
+    Categories alone (here the defaults) don't mark the import as done, so a
+    transactions file added on a later launch is still imported.
+    """
+    db = Database(":memory:")
+    db.connect(readers=0)
+    db.create_tables()
+    
+    # A first launch without data files only adds the default categories
+    assert needs_data_import(db)
+    add_default_categories(db)
+    assert not mark_data_imported(db)
+    assert needs_data_import(db)
+    
+    # Once transactions are imported, later launches skip the data files
+    assert db.add_transactions([("2025-05-10", 11.00, "Groceries", "Startup Test", "Checking", "Debit Card")]) == 1
+    assert mark_data_imported(db)
+    assert not needs_data_import(db)
+    db.close()
+
+#Test 23: Category CSV Import of Renamed Categories
+def test_category_csv_import_rename(finance_tracker, database, temp_csv_dir):
+    """
+    Test that a CSV row renaming a category used by transactions is skipped, keeping the other rows.
+    
+    Args:
+        finance_tracker: The finance tracker fixture.
+        database: The database fixture.
+        temp_csv_dir: Temporary directory for CSV files.
+    """
+    csv_file = os.path.join(temp_csv_dir, "test_renamed_categories.csv")
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["category_id", "category_name", "monthly_budget", "priority_level", "icon"])
+        writer.writerows([
+            (1, "Food", 500.00, "High", "grocery"),
+            (6, "Healthcare", 150.00, "High", "health"),
+            (3, "Entertainment", 250.00, "Low", "movie")
+        ])
+        
+    # Only the rename is skipped
+    assert database.import_categories_from_csv(csv_file) == 2
+    
+    categories = {category[0]: (category[1], category[2]) for category in finance_tracker.get_all_categories()}
+    assert categories[1] == ("Groceries", 500.00)
+    assert categories[3] == ("Entertainment", 250.00)
+    assert categories[6] == ("Healthcare", 150.00)
+    assert "Food" not in [name for name, _ in categories.values()]
+    
+    # The transactions of the category keep pointing at it
+    database.cursor.execute("SELECT COUNT(*) FROM transactions WHERE category = 'Groceries'")
+    assert database.cursor.fetchone()[0] == 2
+
+#Test 24: Account Types and Payment Methods
+def test_account_types_and_payment_methods(finance_tracker, database):
+    """
+    Test that the account types and payment methods match the transactions, and refresh once they change.
+    
+    Args:
+        finance_tracker: The finance tracker fixture.
+        database: The database fixture.
+    """
+    def distinct_values(column):
+        database.cursor.execute(f"SELECT DISTINCT {column} FROM transactions")
+        return sorted(row[0] for row in database.cursor.fetchall())
+        
+    assert sorted(finance_tracker.get_account_types()) == distinct_values("account_type") == ["Checking", "Credit"]
+    assert sorted(finance_tracker.get_payment_methods()) == distinct_values("payment_method")
+    
+    # The lists are kept while the database is unchanged
+    cached = finance_tracker.get_account_types_and_payment_methods()
+    assert finance_tracker.get_account_types_and_payment_methods() is cached
+    
+    # A transaction with a new account type and payment method shows in both lists
+    assert finance_tracker.add_transactions([("2025-05-10", 11.00, "Groceries", "Account Test", "Savings", "Cash")]) == 1
+    assert sorted(finance_tracker.get_account_types()) == distinct_values("account_type")
+    assert sorted(finance_tracker.get_payment_methods()) == distinct_values("payment_method")
+    assert "Savings" in finance_tracker.get_account_types()
+    assert "Cash" in finance_tracker.get_payment_methods()
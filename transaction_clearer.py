@@ -5,12 +5,11 @@
 
 #This module provides dialogs for clearing transactions by date range or all at once.
 
-import sys
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, 
                            QPushButton, QMessageBox, QDateEdit,
-                           QGroupBox, QFormLayout, QDialogButtonBox)
+                           QGroupBox, QFormLayout, QDialogButtonBox,
+                           QCheckBox)
 from PyQt5.QtCore import Qt, QDate
-from datetime import datetime
 
 class ClearTransactionsDialog(QDialog):
     """
@@ -49,15 +48,17 @@ class ClearTransactionsDialog(QDialog):
         date_group = QGroupBox("Clear Transactions by Date Range")
         date_layout = QFormLayout(date_group)
         
+        today = QDate.currentDate()
+        
         # Start date
         self.start_date_edit = QDateEdit()
-        self.start_date_edit.setDate(QDate.currentDate().addMonths(-1))  # Default to 1 month ago
+        self.start_date_edit.setDate(today.addMonths(-1))  # Default to 1 month ago
         self.start_date_edit.setCalendarPopup(True)
         date_layout.addRow("Start Date:", self.start_date_edit)
         
         # End date
         self.end_date_edit = QDateEdit()
-        self.end_date_edit.setDate(QDate.currentDate())  # Default to today
+        self.end_date_edit.setDate(today)  # Default to today
         self.end_date_edit.setCalendarPopup(True)
         date_layout.addRow("End Date:", self.end_date_edit)
         
@@ -98,8 +99,8 @@ class ClearTransactionsDialog(QDialog):
         Clear transactions between the specified start and end dates.
         """
         # Get date range
-        start_date = self.start_date_edit.date().toString("yyyy-MM-dd")
-        end_date = self.end_date_edit.date().toString("yyyy-MM-dd")
+        start_date = self.start_date_edit.date().toString(Qt.ISODate)
+        end_date = self.end_date_edit.date().toString(Qt.ISODate)
         
         # Confirm action
         confirmation = QMessageBox.question(
@@ -132,38 +133,37 @@ class ClearTransactionsDialog(QDialog):
         """
         Clear all transactions from the database.
         """
-        # Double confirmation for destructive action
-        confirmation1 = QMessageBox.warning(
-            self,
+        # Confirmation for destructive action; Yes is only enabled once the
+        # user ticks the checkbox
+        confirmation = QMessageBox(
+            QMessageBox.Warning,
             "Confirm Clear All Transactions",
-            "Are you sure you want to clear ALL transactions from the database?\n\nThis action cannot be undone!",
+            "Are you sure you want to clear ALL transactions from the database?\n\nALL TRANSACTIONS WILL BE PERMANENTLY DELETED!",
             QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
+            self
         )
+        confirmation.setDefaultButton(QMessageBox.No)
+        
+        understood_checkbox = QCheckBox("I understand this action cannot be undone")
+        confirmation.setCheckBox(understood_checkbox)
+        yes_button = confirmation.button(QMessageBox.Yes)
+        yes_button.setEnabled(False)
+        understood_checkbox.toggled.connect(yes_button.setEnabled)
         
-        if confirmation1 == QMessageBox.Yes:
-            confirmation2 = QMessageBox.warning(
-                self,
-                "Final Confirmation",
-                "ALL TRANSACTIONS WILL BE PERMANENTLY DELETED!\n\nAre you absolutely sure you want to proceed?",
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.No
-            )
+        if confirmation.exec_() == QMessageBox.Yes and understood_checkbox.isChecked():
+            # Clear all transactions
+            count = self.finance_tracker.clear_all_transactions()
             
-            if confirmation2 == QMessageBox.Yes:
-                # Clear all transactions
-                count = self.finance_tracker.clear_all_transactions()
-                
-                if count > 0:
-                    QMessageBox.information(
-                        self,
-                        "All Transactions Cleared",
-                        f"Successfully cleared all {count} transactions from the database."
-                    )
-                    self.accept()
-                else:
-                    QMessageBox.information(
-                        self,
-                        "No Transactions Cleared",
-                        "No transactions found in the database."
-                    )
\ No newline at end of file
+            if count > 0:
+                QMessageBox.information(
+                    self,
+                    "All Transactions Cleared",
+                    f"Successfully cleared all {count} transactions from the database."
+                )
+                self.accept()
+            else:
+                QMessageBox.information(
+                    self,
+                    "No Transactions Cleared",
+                    "No transactions found in the database."
+                )
\ No newline at end of file